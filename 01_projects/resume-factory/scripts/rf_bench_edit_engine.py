@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-proposal paragraph scans (legacy resume-approve-edits) vs the
+indexed batch engine in rf_edit_engine.
+
+  python3 rf_bench_edit_engine.py                          # 2000 paragraphs, 400 proposals
+  python3 rf_bench_edit_engine.py --paragraphs 5000 --proposals 1000
+  python3 rf_bench_edit_engine.py --no-refs                # resolve by text only
+
+Builds a synthetic resume docx (bold-label SKILLS rows, long EXPERIENCE bullet
+lists) plus a proposal batch mixing REPLACE_LINE / ADD_LINE / DELETE_LINE /
+REPLACE_PHRASE, applies it both ways to fresh copies of the document, and
+reports time per batch and whether the resulting documents are identical.
+Also times open + save of the same docx via docx.Document vs rf_ooxml_patch.
+
+The parity reference is the baseline REPLACE_LINE as it shipped, including its
+Case-3 slip: the normalized-containment fallback ran after the paragraph loop and
+so only ever looked at the last paragraph. rf_edit_engine checks every short
+paragraph, so the batch includes a few such proposals (lowercased fragments, no
+before_ref) and that difference is reported on its own line: the engine must
+match the baseline with only Case 3 corrected, and nothing else may differ.
+"""
+import argparse
+import io
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+
+from rf_edit_engine import (_add_after, _delete, _replace_contained, _replace_substring, _replace_whole,
+                            norm, plan_edits)
+from rf_ooxml_patch import open_docx
+
+
+# --- legacy matching: what resume-approve-edits did before (one scan per proposal) ---
+
+def legacy_replace_line(doc, before_line, after_line, case3_fixed: bool = False) -> bool:
+    b_raw = (before_line or "").strip()
+    a_raw = (after_line or "").strip()
+    if not b_raw:
+        return False
+    b_n = norm(b_raw)
+    para = t = tn = None
+    for para in doc.paragraphs:
+        t = para.text or ""
+        tn = norm(t)
+        if not tn:
+            continue
+        if tn == b_n:
+            _replace_whole(para, b_raw, a_raw)
+            return True
+        if b_raw in t:
+            _replace_substring(para, b_raw, a_raw)
+            return True
+    if not case3_fixed:
+        # baseline: Case 3 sat after the loop, so it saw only the last paragraph
+        if para is not None and b_n in tn and len(t) <= 200:
+            _replace_contained(para, a_raw)
+            return True
+        return False
+    for para in doc.paragraphs:
+        t = para.text or ""
+        if b_n in norm(t) and len(t) <= 200 and norm(t):
+            _replace_contained(para, a_raw)
+            return True
+    return False
+
+def legacy_replace_phrase(doc, b, a) -> bool:
+    if not b:
+        return False
+    for para in doc.paragraphs:
+        if b in (para.text or ""):
+            _replace_substring(para, b, a)
+            return True
+    return False
+
+def legacy_add_line(doc, anchor, new_line) -> bool:
+    anchor, new_line = (anchor or "").strip(), (new_line or "").strip()
+    if not anchor or not new_line:
+        return False
+    for para in list(doc.paragraphs):
+        if (para.text or "").strip() == anchor:
+            _add_after(para, new_line)
+            return True
+    return False
+
+def legacy_delete_line(doc, target) -> bool:
+    target = (target or "").strip()
+    if not target:
+        return False
+    for para in list(doc.paragraphs):
+        if (para.text or "").strip() == target:
+            _delete(para)
+            return True
+    return False
+
+def legacy_apply(doc, proposals, case3_fixed: bool = False) -> int:
+    ok_n = 0
+    for pr in proposals:
+        op = pr.get("op")
+        b = (pr.get("before") or [""])[0]
+        a = (pr.get("after") or [""])[0]
+        if op == "REPLACE_LINE":
+            ok = legacy_replace_line(doc, b, a, case3_fixed) or legacy_replace_phrase(doc, b, a)
+        elif op == "ADD_LINE":
+            ok = legacy_add_line(doc, b, a)
+        elif op == "DELETE_LINE":
+            ok = legacy_delete_line(doc, b)
+        elif op == "REPLACE_PHRASE":
+            ok = legacy_replace_phrase(doc, b, a)
+        else:
+            ok = False
+        ok_n += bool(ok)
+    return ok_n
+
+
+# --- synthetic inputs -------------------------------------------------------------
+
+TOOLS = ["Selenium", "Playwright", "Cypress", "Java", "Python", "TypeScript", "REST Assured", "Postman",
+         "Jenkins", "GitHub Actions", "JUnit", "TestNG", "pytest", "Docker", "Kubernetes", "SQL", "Jira"]
+
+def synthetic_docx(n_paragraphs: int, seed: int = 7) -> bytes:
+    rnd = random.Random(seed)
+    doc = Document()
+    doc.add_paragraph("Jane Doe")
+    doc.add_paragraph("QA Automation Engineer | jane@example.com")
+    doc.add_paragraph("PROFESSIONAL SUMMARY:")
+    doc.add_paragraph("Automation engineer with 8 years building UI and API test frameworks.")
+    doc.add_paragraph("TECHNICAL SKILL:")
+    for k in range(max(8, n_paragraphs // 50)):
+        p = doc.add_paragraph()
+        r0 = p.add_run(f"Category {k}:")
+        r0.bold = True
+        p.add_run(" " + ", ".join(rnd.sample(TOOLS, 5)))
+    doc.add_paragraph("PROFESSIONAL EXPERIENCE:")
+    i = 0
+    while len(doc.paragraphs) < n_paragraphs:
+        doc.add_paragraph(f"Company {i} | Senior QA Engineer | Jan 2020 – Present")
+        doc.add_paragraph("Roles & Responsibilities:")
+        for j in range(12):
+            doc.add_paragraph(
+                f"Built {rnd.choice(TOOLS)} suites for service {i}.{j} covering {rnd.randint(10, 900)} "
+                f"scenarios with {rnd.choice(TOOLS)} in CI.",
+                style="List Bullet",
+            )
+        doc.add_paragraph("")
+        i += 1
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+def synthetic_proposals(doc, n: int, with_refs: bool, seed: int = 11):
+    rnd = random.Random(seed)
+    texts = [p.text for p in doc.paragraphs]
+    cands = [i for i, t in enumerate(texts) if t.strip() and not t.endswith(":")]
+    picks = rnd.sample(cands, min(n, len(cands)))
+    # refs as the template IR numbers them (non-blank lines); exact section split is irrelevant here
+    ref_of = {}
+    k = 0
+    for i, t in enumerate(texts):
+        if t.strip():
+            k += 1
+            ref_of[i] = f"E{k:03d}"
+    refs = {ref_of[i]: {"section": "EXPERIENCE", "text": texts[i].rstrip()} for i in ref_of}
+
+    out = []
+    for m, i in enumerate(picks):
+        t = texts[i]
+        kind = m % 10
+        pr = {"section": "EXPERIENCE", "before": [t], "rationale": "bench"}
+        if with_refs:
+            pr["before_ref"] = ref_of[i]
+        if kind == 5 and t.startswith("Built"):
+            # Case 3: normalized containment only (lowercased fragment, no ref)
+            pr.update(op="REPLACE_LINE", before=[t[:40].lower()], after=[t.replace("Built", "Led", 1)])
+            pr.pop("before_ref", None)
+        elif kind < 6:
+            if ":" in t and not t.startswith("Built"):
+                label = t.split(":", 1)[0]
+                pr.update(op="REPLACE_LINE", after=[f"{label}: {', '.join(rnd.sample(TOOLS, 6))}"])
+            else:
+                pr.update(op="REPLACE_LINE", after=[t.replace("Built", "Designed", 1) + f" (rev {m})"])
+        elif kind < 8:
+            pr.update(op="ADD_LINE", after=[f"Added bullet {m}: coverage for {rnd.choice(TOOLS)}"])
+        elif kind < 9:
+            pr.update(op="DELETE_LINE", after=[""])
+        else:
+            word = "suites" if "suites" in t else t.split()[0]
+            pr.update(op="REPLACE_PHRASE", before=[word], after=[word.upper()])
+            pr.pop("before_ref", None)
+        out.append(pr)
+    return out, (refs if with_refs else None)
+
+
+def snapshot(doc):
+    return [(p.text, tuple((r.text, r.bold) for r in p.runs)) for p in doc.paragraphs]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark resume-approve-edits edit application.")
+    ap.add_argument("--paragraphs", type=int, default=2000, help="Synthetic resume size (default 2000)")
+    ap.add_argument("--proposals", type=int, default=400, help="Proposals per batch (default 400)")
+    ap.add_argument("--no-refs", action="store_true", help="Omit before_ref (text resolution only)")
+    ap.add_argument("--repeat", type=int, default=1, help="Runs per path, best kept (default 1)")
+    args = ap.parse_args()
+
+    blob = synthetic_docx(args.paragraphs)
+    proposals, refs = synthetic_proposals(Document(io.BytesIO(blob)), args.proposals, not args.no_refs)
+
+    def run_legacy(case3_fixed=False):
+        d = Document(io.BytesIO(blob))
+        t0 = time.perf_counter()
+        ok = legacy_apply(d, proposals, case3_fixed)
+        return time.perf_counter() - t0, ok, d
+
+    def run_engine():
+        d = Document(io.BytesIO(blob))
+        t0 = time.perf_counter()
+        plan = plan_edits(d, proposals, refs=refs)
+        plan.apply()
+        return time.perf_counter() - t0, sum(e.ok for e in plan.edits), d
+
+    results = {}
+    for name, fn in (("legacy", run_legacy), ("indexed", run_engine)):
+        times = []
+        for _ in range(max(1, args.repeat)):
+            dt, ok, d = fn()
+            times.append(dt)
+        results[name] = (min(times), ok, snapshot(d))
+
+    n_par = len(Document(io.BytesIO(blob)).paragraphs)
+    print(f"DOC: {n_par} paragraphs  PROPOSALS: {len(proposals)}  refs={'no' if args.no_refs else 'yes'}")
+    base = results["legacy"][0]
+    for name, (dt, ok, _) in results.items():
+        print(f"- {name:8} {1000 * dt:9.1f} ms/batch  applied={ok}  x{base / dt if dt else 0:.1f}")
+    base_snap, eng_snap = results["legacy"][2], results["indexed"][2]
+    _dt, fixed_ok, d = run_legacy(case3_fixed=True)
+    fixed_snap = snapshot(d)
+    same = eng_snap == fixed_snap
+    case3 = sum(1 for x, y in zip(base_snap, fixed_snap) if x != y) + abs(len(base_snap) - len(fixed_snap))
+    if eng_snap == base_snap:
+        print("PARITY: OK (identical to baseline)")
+    else:
+        print(f"PARITY: {'OK' if same else 'MISMATCH'} (baseline with only the Case-3 fix)")
+    print(f"CASE-3: {case3} paragraphs differ from baseline (normalized-containment REPLACE_LINE "
+          f"now checks every short paragraph; applied {results['legacy'][1]} -> {fixed_ok})")
+
+    with tempfile.TemporaryDirectory() as td:
+        src, out = Path(td) / "in.docx", Path(td) / "out.docx"
+        src.write_bytes(blob)
+        t0 = time.perf_counter()
+        Document(str(src)).save(str(out))
+        t_full = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        open_docx(src).save(out)
+        t_patch = time.perf_counter() - t0
+    print(f"OPEN+SAVE: python-docx {1000 * t_full:.1f} ms  ooxml-patch {1000 * t_patch:.1f} ms")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
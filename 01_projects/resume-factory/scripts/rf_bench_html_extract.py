@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: legacy double BeautifulSoup parse vs single-pass extract_page().
+
+  python3 rf_bench_html_extract.py                     # saved ATS pages (rf_bench_html_fixtures/)
+  python3 rf_bench_html_extract.py --fixtures DIR      # every *.html in DIR
+  python3 rf_bench_html_extract.py --http-cache        # bodies from the HTTP cache
+  python3 rf_bench_html_extract.py --synthetic         # one large generated page
+
+The saved pages are a Greenhouse board page, a Lever posting, and a Workday
+career-site shell whose content is only in its JSON-LD JobPosting.
+
+Reports per-page mean time for each path, whether text/title match the legacy
+output, and how many pages yielded a JSON-LD JobPosting.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from rf_html_extract import available_backends, extract_page
+from rf_http_cache import cache_dir
+
+FIXTURES = Path(__file__).resolve().parent / "rf_bench_html_fixtures"
+
+def legacy_extract(html: str):
+    # exactly what rf_job_intake_batch_core did before: two full parses
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.string.strip() if soup.title and soup.title.string else None
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    text = soup.get_text("\n")
+    lines = [ln.strip() for ln in text.splitlines()]
+    return title, "\n".join(ln for ln in lines if ln)
+
+
+def synthetic_page(n_sections: int = 120) -> str:
+    # Large inline state blobs + nested markup, the shape Greenhouse/Workday pages have.
+    state = json.dumps({"jobs": [{"id": i, "blob": "x" * 400} for i in range(200)]})
+    ld = json.dumps({
+        "@context": "https://schema.org",
+        "@type": "JobPosting",
+        "title": "Senior QA Automation Engineer",
+        "hiringOrganization": {"@type": "Organization", "name": "Acme"},
+        "jobLocation": {"@type": "Place", "address": {"addressLocality": "Austin", "addressRegion": "TX"}},
+    })
+    body = []
+    for i in range(n_sections):
+        body.append(
+            f"<section><h2>Section {i}</h2><ul>"
+            + "".join(f"<li>Build <b>Playwright</b> &amp; Selenium suites #{i}.{j}</li>" for j in range(8))
+            + "</ul><p>Work with CI/CD <a href='#'>pipelines</a> and <em>API</em> testing.</p></section>"
+        )
+    return (
+        "<!doctype html><html><head><title>Senior QA Automation Engineer - Acme</title>"
+        "<style>body{font:12px sans-serif}</style>"
+        f"<script type='application/ld+json'>{ld}</script>"
+        f"<script>window.__STATE__ = {state};</script></head><body>"
+        + "".join(body)
+        + "<noscript>enable js</noscript></body></html>"
+    )
+
+
+def load_pages(args):
+    if args.synthetic:
+        return [("synthetic", synthetic_page())]
+    if args.http_cache:
+        out = []
+        for p in sorted(cache_dir().glob("*.json"))[: args.limit]:
+            try:
+                d = json.loads(p.read_text(encoding="utf-8"))
+                out.append((d.get("url") or p.name, d["body"]))
+            except Exception:
+                continue
+        return out
+    d = Path(args.fixtures).expanduser() if args.fixtures else FIXTURES
+    return [(p.name, p.read_text(encoding="utf-8", errors="ignore")) for p in sorted(d.glob("*.html"))]
+
+
+def bench(fn, html: str, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(html)
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark HTML extraction paths used by job intake.")
+    ap.add_argument("--fixtures", default=None, help=f"Directory of *.html files (default {FIXTURES.name}/)")
+    ap.add_argument("--http-cache", action="store_true", help="Use bodies from the HTTP cache")
+    ap.add_argument("--synthetic", action="store_true", help="Use one generated ATS-like page")
+    ap.add_argument("--limit", type=int, default=50, help="Max pages from --http-cache (default 50)")
+    ap.add_argument("--repeat", type=int, default=5, help="Runs per page per path (default 5)")
+    args = ap.parse_args()
+
+    pages = load_pages(args)
+    if not pages:
+        print("ERROR: no pages to benchmark", file=sys.stderr)
+        raise SystemExit(2)
+
+    backends = available_backends()
+    totals = {"legacy": 0.0, **{b: 0.0 for b in backends}}
+    mismatches = 0
+    postings = 0
+
+    for name, html in pages:
+        ref_title, ref_text = legacy_extract(html)
+        totals["legacy"] += bench(legacy_extract, html, args.repeat)
+        postings += extract_page(html)["job_posting"] is not None
+        for b in backends:
+            r = extract_page(html, backend=b)
+            if (r["title"], r["text"]) != (ref_title, ref_text):
+                mismatches += 1
+                print(f"MISMATCH [{b}]: {name}")
+            totals[b] += bench(lambda h: extract_page(h, backend=b), html, args.repeat)
+
+    n = len(pages)
+    print(f"PAGES: {n}  (avg {sum(len(h) for _, h in pages) // n} chars)")
+    for k, v in totals.items():
+        speedup = totals["legacy"] / v if v else 0.0
+        print(f"- {k:7} {1000 * v / n:8.2f} ms/page  x{speedup:.1f}")
+    print(f"JSON-LD: {postings}/{n} page(s) with a JobPosting")
+    print(f"PARITY: {'OK' if mismatches == 0 else f'{mismatches} mismatch(es)'}")
+
+
+if __name__ == "__main__":
+    main()
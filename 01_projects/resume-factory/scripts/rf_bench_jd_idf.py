@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark + consistency check for the incremental JD document-frequency index
+(rf_jd_idf) on a synthetic jobs tree.
+
+  python3 rf_bench_jd_idf.py                  # 2000 synthetic JDs, 20 edited between refreshes
+  python3 rf_bench_jd_idf.py --jobs 10000 --edit 100
+
+Times a cold build, a no-op refresh and a refresh after editing / adding /
+removing a few JDs, and checks that the incrementally maintained df table equals
+a from-scratch rebuild of the same tree. Then prints, for the real JDs under
+01_projects/jobs, the prompt term list with frequency vs BM25 ranking.
+"""
+import argparse
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import rf_jd_idf as idx
+from rf_bench_jd_terms import synthetic_jds
+from rf_jd_terms import extract_jd_terms
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def make_tree(root: Path, texts) -> list:
+    apps = []
+    for i, text in enumerate(texts):
+        app = root / "01_projects/jobs/qa_automation_engineer" / f"company_{i // 3:05d}" / f"2026-01-01_role-{i:05d}"
+        (app / "jd").mkdir(parents=True)
+        (app / "jd" / "jd-raw.txt").write_text(text)
+        apps.append(app)
+    return apps
+
+def df_table(root: Path) -> dict:
+    conn = idx.open_index(root)
+    try:
+        return dict(conn.execute("SELECT term, n FROM df"))
+    finally:
+        conn.close()
+
+def timed_refresh(root: Path):
+    conn = idx.open_index(root)
+    try:
+        t0 = time.perf_counter()
+        st = idx.refresh(conn, root)
+        return time.perf_counter() - t0, st
+    finally:
+        conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark rf_jd_idf incremental refresh.")
+    ap.add_argument("--jobs", type=int, default=2000, help="Synthetic JDs (default 2000)")
+    ap.add_argument("--edit", type=int, default=20, help="JDs edited / added / removed between refreshes (default 20)")
+    args = ap.parse_args()
+
+    ok = True
+    rnd = random.Random(11)
+    texts = synthetic_jds(args.jobs + args.edit, seed=29)
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        apps = make_tree(root, texts[: args.jobs])
+
+        dt, st = timed_refresh(root)
+        print(f"- cold build     {1000 * dt:9.1f} ms  {json.dumps(st)}")
+        dt, st = timed_refresh(root)
+        print(f"- no-op refresh  {1000 * dt:9.1f} ms  {json.dumps(st)}")
+
+        for app in rnd.sample(apps, args.edit):
+            p = app / "jd" / "jd-raw.txt"
+            p.write_text(p.read_text() + " Kubernetes, Gatling and Pact contract testing. ")
+        for app in rnd.sample(apps, args.edit):
+            shutil.rmtree(app)
+        for i, text in enumerate(texts[args.jobs:]):
+            app = root / "01_projects/jobs/qa_automation_engineer/new_company" / f"2026-02-01_role-{i:05d}"
+            (app / "jd").mkdir(parents=True)
+            (app / "jd" / "jd-raw.txt").write_text(text)
+        dt, st = timed_refresh(root)
+        print(f"- incremental    {1000 * dt:9.1f} ms  {json.dumps(st)}")
+
+        incremental = df_table(root)
+        idx.index_path(root).unlink()
+        timed_refresh(root)
+        same = incremental == df_table(root)
+        ok &= same
+        print(f"CONSISTENT: {'OK' if same else 'MISMATCH'} ({len(incremental)} terms)")
+
+    real = sorted((REPO_ROOT / "01_projects/jobs").rglob("jd/jd-raw.txt"))
+    if real:
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            make_tree(root, [p.read_text(errors="ignore") for p in real])
+            conn = idx.open_index(root)
+            idx.refresh(conn, root)
+            corpus = idx.CorpusIdf.from_index(conn)
+            conn.close()
+        print(f"\nREAL JDs (N={corpus.n_docs}): prompt terms, frequency vs BM25")
+        n_tf = n_bm = 0
+        for p in real:
+            text = p.read_text(errors="ignore")
+            tf, bm = extract_jd_terms(text), extract_jd_terms(text, idf=corpus)
+            n_tf, n_bm = n_tf + len(tf), n_bm + len(bm)
+            print(f"- {p.parents[1].name}\n    tf:   {', '.join(tf)}\n    bm25: {', '.join(bm)}")
+        print(f"terms per prompt: {n_tf / len(real):.1f} -> {n_bm / len(real):.1f}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Golden-output check + benchmark: legacy rf_jd_terms.extract_jd_terms (per-token
+regex chain, JD rescanned per term, hard-coded PHRASES / SKILL_WORDS) vs the
+current one (single tokenization pass, compiled filters, memoized verdicts,
+skill taxonomy) and extract_jd_terms_many.
+
+  python3 rf_bench_jd_terms.py                      # real JDs under 01_projects/jobs + 2000 synthetic
+  python3 rf_bench_jd_terms.py --jobs 5000 --workers 4
+  python3 rf_bench_jd_terms.py --max-terms 30
+  python3 rf_bench_jd_terms.py --scale 0,5000,20000 # extra synthetic skills in the taxonomy
+
+Golden rule: run with a taxonomy holding exactly the legacy knowledge (PHRASES and
+SKILL_WORDS below, the phrases marked promote), every JD must yield the same terms
+as legacy, ranked by the same counts. Legacy ordered promoted phrases by list
+position and broke count ties by length alone, in set-iteration order (varies per
+process); the current code puts taxonomy terms first within a count. Lists are
+therefore compared uncapped: same term set, promoted terms as one group, the rest
+count group by count group.
+
+Scaling: extraction time per JD with the shipped taxonomy plus N generated
+skills (half single-token, half multi-word) should stay flat as N grows.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+import time
+from itertools import groupby
+from pathlib import Path
+
+import rf_jd_terms as cur
+from rf_jd_terms import (ALLOW_SHORT, GENERIC, JUNK_WORDS, RE_DATEISH, RE_DOMAINISH, RE_EEO,
+                         RE_EEO_SLASH, RE_LOCATION_BASED, RE_MONEY, RE_NUM_ONLY, RE_SALARY_K, RE_TIME, RE_URL,
+                         RE_URLISH, STOPWORDS, SUPPRESS_IF_SOLO, TIMEZONES, _norm_text)
+from rf_skill_taxonomy import SCHEMA, Taxonomy, from_dict, load_taxonomy, taxonomy_path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def bench_taxonomy_path() -> Path:
+    """RF_SKILL_TAXONOMY when set, else this checkout's skills.json (not ~/secondbrain's)."""
+    return taxonomy_path() if os.environ.get("RF_SKILL_TAXONOMY") else REPO_ROOT / "03_assets/taxonomy/skills.json"
+
+
+# --- legacy implementation (what rf_jd_terms did before) ------------------------
+
+PHRASES = [
+    ("hp alm", {"hp", "alm"}),
+    ("micro focus alm", {"alm"}),
+    ("vbscript", {"vb"}),
+    ("vb script", {"vb"}),
+]
+
+SKILL_WORDS = {
+    "selenium","playwright","cypress","appium","restassured","postman","jmeter","locust",
+    "jenkins","github","bitbucket","jira","confluence","testng","junit","cucumber",
+    "python","java","typescript","javascript","sql","api","rest","soap","svn","svn",
+    "aws","azure","gcp","docker","kubernetes","ci","cd","cicd","devops",
+    "agile","scrum","kanban","safe","safe",
+    "graphql","restful","microservices",
+    "testrail","alm","hp alm","vbscript"
+}
+
+def legacy_is_junk(term: str) -> bool:
+    t = (term or "").strip().lower()
+    if not t:
+        return True
+    if t in JUNK_WORDS or t in STOPWORDS or t in GENERIC:
+        return True
+    if RE_NUM_ONLY.match(t):
+        return True
+    if RE_MONEY.search(t) or RE_TIME.search(t) or RE_DATEISH.search(t):
+        return True
+    if RE_URL.search(t):
+        return True
+    if RE_EEO.search(t):
+        return True
+    if RE_URLISH.search(t) or RE_DOMAINISH.search(t):
+        return True
+    if RE_EEO_SLASH.search(t):
+        return True
+    if any(x in t for x in ["equal opportunity", "eeo", "accommodation", "veteran", "veterans", "disability", "disabled"]):
+        return True
+    if len(t) <= 2 and t not in ALLOW_SHORT:
+        return True
+    if t in SUPPRESS_IF_SOLO:
+        return True
+    if re.fullmatch(r"[a-z0-9_-]{9,}", t) and any(ch.isdigit() for ch in t):
+        return True
+    if RE_SALARY_K.match(t):
+        return True
+    if RE_LOCATION_BASED.match(t):
+        return True
+    if t in TIMEZONES or t.endswith("/mst") or t.endswith("/pst") or t.endswith("/est") or t.endswith("/cst"):
+        return True
+    return False
+
+def legacy_looks_like_skill(t: str) -> bool:
+    if t in ALLOW_SHORT:
+        return True
+    if t in SKILL_WORDS:
+        return True
+    if re.search(r"[^a-z]", t):
+        return True
+    return False
+
+def legacy_extract(text: str, max_terms: int = 18):
+    low = _norm_text(text)
+    suppress = set()
+    promoted = []
+    for phrase, to_suppress in PHRASES:
+        if phrase in low:
+            if phrase == "vb script":
+                if "vbscript" not in promoted:
+                    promoted.append("vbscript")
+            else:
+                if phrase not in promoted:
+                    promoted.append(phrase)
+            suppress |= set(to_suppress)
+
+    raw_tokens = re.findall(r"[a-z0-9][a-z0-9\+#\.\-/]{0,38}", low)
+    candidates = []
+    for tok in raw_tokens:
+        t = tok.strip(" .,-/").lower()
+        if not t:
+            continue
+        if t in suppress:
+            continue
+        if len(t) <= 2 and t not in ALLOW_SHORT:
+            continue
+        if t in {"vbscript", "vb-script"}:
+            t = "vbscript"
+        if legacy_is_junk(t):
+            continue
+        if not legacy_looks_like_skill(t):
+            continue
+        candidates.append(t)
+
+    uniq, seen = [], set()
+
+    def add(x):
+        x = x.strip().lower()
+        if not x or x in seen:
+            return
+        if legacy_is_junk(x):
+            return
+        seen.add(x)
+        uniq.append(x)
+
+    for p in promoted:
+        add(p)
+
+    def score(term):
+        return (low.count(term), len(term))
+
+    for c in sorted(set(candidates), key=score, reverse=True):
+        add(c)
+    return uniq[:max_terms]
+
+
+# --- parity ---------------------------------------------------------------------
+
+def legacy_taxonomy() -> Taxonomy:
+    """The legacy PHRASES / SKILL_WORDS knowledge as a taxonomy (terms kept as legacy emitted them)."""
+    skills = [{"canonical": "hp alm", "promote": True}, {"canonical": "micro focus alm", "promote": True},
+              {"canonical": "vbscript", "aliases": ["vb script", "vb-script"], "promote": True}]
+    # SKILL_WORDS entries legacy's junk filter always dropped ("ci", "cd", "alm") stay out
+    skills += [{"canonical": w} for w in sorted(SKILL_WORDS) if " " not in w and w != "vbscript" and not legacy_is_junk(w)]
+    return from_dict({"schema": SCHEMA, "skills": skills})
+
+def _promoted(low: str, tax: Taxonomy) -> set:
+    legacy = {("vbscript" if p == "vb script" else p) for p, _ in PHRASES if p in low}
+    return legacy | {c for _s, _e, _a, c in tax.scan(low) if c in tax.promote}
+
+def _groups(low: str, terms, promoted: set):
+    """[(key, {terms})]: promoted terms as one leading group, the rest by count."""
+    out = [("promoted", {t for t in terms if t in promoted})]
+    rest = [t for t in terms if t not in promoted]
+    for key, g in groupby(rest, key=low.count):
+        out.append((key, set(g)))
+    return out
+
+def same_output(text: str, tax: Taxonomy) -> bool:
+    full_old, full_new = legacy_extract(text, 10 ** 6), cur.extract_jd_terms(text, 10 ** 6, tax)
+    low = _norm_text(text)
+    promoted = _promoted(low, tax)
+    return _groups(low, full_old, promoted) == _groups(low, full_new, promoted)
+
+
+# --- synthetic inputs -----------------------------------------------------------
+
+VOCAB = ["Selenium", "Playwright", "Cypress", "Java", "JavaScript", "TypeScript", "Python", "REST", "API", "APIs",
+         "CI/CD", "Jenkins", "GitHub Actions", "JIRA", "TestNG", "JUnit", "pytest", "C#", ".NET", "node.js",
+         "HP ALM", "Micro Focus ALM", "VB Script", "vbscript", "SQL", "AWS", "Docker", "k8s", "Agile", "Scrum",
+         "$120k", "115k", "9am-5pm", "8:30 am", "EEO", "M/F/Disability/Veterans", "www.example.com",
+         "phoenix-based", "AZ/MST", "req-2026-00412", "401k", "PTO", "hands-on", "full-stack", "qa", "ui", "ux"]
+FILLER = ("we are looking for a senior quality engineer to join our team and drive automation across "
+          "services the ideal candidate has strong experience with testing frameworks and ci pipelines "
+          "benefits include health dental vision and paid time off").split()
+
+def synthetic_jds(n: int, seed: int = 17):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        words = [rnd.choice(FILLER) for _ in range(rnd.randint(150, 700))]
+        for _ in range(rnd.randint(10, 60)):
+            words.insert(rnd.randrange(len(words)), rnd.choice(VOCAB))
+        out.append(" ".join(words) + ".")
+    return out
+
+
+def scaled_taxonomy(extra: int, seed: int = 23) -> Taxonomy:
+    """The shipped taxonomy plus `extra` generated skills (alternating one-token / multi-word)."""
+    doc = json.loads(bench_taxonomy_path().read_text(encoding="utf-8"))
+    rnd = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    for i in range(extra):
+        name = "".join(rnd.choice(letters) for _ in range(rnd.randint(5, 10))) + str(i)
+        if i % 2:
+            name = name[:3] + " " + name[3:]
+        doc["skills"].append({"canonical": name, "category": "synthetic"})
+    return from_dict(doc)
+
+def timed(fn) -> float:
+    cur._is_junk.cache_clear()
+    cur._keep_token.cache_clear()
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Golden check + benchmark for rf_jd_terms.extract_jd_terms.")
+    ap.add_argument("--jobs", type=int, default=2000, help="Synthetic JDs (default 2000)")
+    ap.add_argument("--max-terms", type=int, default=18, help="max_terms (default 18)")
+    ap.add_argument("--workers", type=int, default=1, help="extract_jd_terms_many workers (default 1)")
+    ap.add_argument("--scale", default="0,2000,20000", help="Extra taxonomy skills to time (default 0,2000,20000)")
+    args = ap.parse_args()
+
+    real = [Path(p).read_text(errors="ignore") for p in sorted(glob.glob(str(REPO_ROOT / "01_projects/jobs/*/*/*/jd/jd-raw.txt")))]
+    texts = real + synthetic_jds(args.jobs)
+
+    compat = legacy_taxonomy()
+    bad = [i for i, t in enumerate(texts) if not same_output(t, compat)]
+    print(f"GOLDEN: {len(texts) - len(bad)}/{len(texts)} JDs match legacy ({len(real)} real, {args.jobs} synthetic)")
+    for i in bad[:5]:
+        print(f"- JD #{i}\n    legacy: {legacy_extract(texts[i], args.max_terms)}\n"
+              f"    new:    {cur.extract_jd_terms(texts[i], args.max_terms, compat)}")
+
+    tax = load_taxonomy(bench_taxonomy_path())
+    n = len(texts)
+    t_old = timed(lambda: [legacy_extract(t, args.max_terms) for t in texts])
+    t_compat = timed(lambda: [cur.extract_jd_terms(t, args.max_terms, compat) for t in texts])
+    t_new = timed(lambda: [cur.extract_jd_terms(t, args.max_terms, tax) for t in texts])
+    t_many = timed(lambda: cur.extract_jd_terms_many(texts, args.max_terms, workers=args.workers, taxonomy=tax))
+
+    def row(label, dt):
+        print(f"- {label:24} {1000 * dt:9.1f} ms  ({1e6 * dt / n:7.1f} us/JD)  x{t_old / dt if dt else 0:.1f}")
+
+    row("legacy", t_old)
+    row("current (legacy terms)", t_compat)
+    row(f"current ({len(tax.canonical)} aliases)", t_new)
+    row(f"many(w={args.workers})", t_many)
+
+    print("SCALING (shipped taxonomy + N generated skills):")
+    for extra in [int(x) for x in args.scale.split(",") if x.strip()]:
+        big = scaled_taxonomy(extra)
+        dt = timed(lambda: [cur.extract_jd_terms(t, args.max_terms, big) for t in texts])
+        print(f"- +{extra:<6} {len(big.canonical):6} aliases  {1e6 * dt / n:7.1f} us/JD")
+    if bad:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
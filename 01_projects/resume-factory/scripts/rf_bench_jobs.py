@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark + regression budget for the jobs CLIs and the intake dedup
+path, on synthetic jobs trees (rf_jobs_synth).
+
+  python3 rf_bench_jobs.py                          # 1k apps, 3 runs per case
+  python3 rf_bench_jobs.py --apps 1000,10000,100000 --dir /tmp/rf-bench-jobs
+  python3 rf_bench_jobs.py --update-budget          # re-baseline rf_bench_jobs.budget.json
+  python3 rf_bench_jobs.py --out ~/rf-bench-jobs.jsonl   # append results (history)
+
+Each size gets its own HOME with secondbrain/01_projects/jobs = the synthetic tree
+and secondbrain/01_projects/resume-factory = this checkout, so the tools in
+07_system/bin run unmodified against it. Cases:
+
+  - every jobs CLI that reads the tree (jobs-find with metadata filters, with
+    --text and with --no-index; jobs-list-unapplied; jobs-open-unapplied --dry-run;
+    jobs-queue-show / jobs-queue-prune / jobs-batch-mark-applied on a 100-entry
+    queue, all read-only), end to end as subprocesses;
+  - "cold" cases delete the jobs index first (the first run after a clone or a
+    schema bump), the rest run against a current index (the steady state);
+  - the jobs-find / jobs-list-unapplied cases again with jobs-daemon running
+    (the others run with RF_JOBS_DAEMON=off); their output must be identical;
+  - rf_job_folder_writer.find_existing_by_url in-process: index build, first
+    call of a process (refresh) and a single lookup (hits and misses).
+
+--dir keeps the trees (DIR/<apps>/, reused while the generator parameters
+match), which matters at 100k where writing the tree takes about a minute.
+
+Reported per case: min / median wall ms. Fails (exit 1) when a case exits
+non-zero, a daemon case prints something else than without the daemon, or
+its min exceeds the budget (rf_bench_jobs.budget.json, per tree
+size); --update-budget writes the measured numbers with headroom
+(x1.5 + 25 ms), as rf_bench_startup does.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import rf_job_folder_writer
+import rf_jobs_index
+from rf_jobs_synth import generate
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "07_system" / "bin"
+BUDGET_PATH = Path(__file__).with_name("rf_bench_jobs.budget.json")
+
+SEED = 7
+HEADROOM, SLACK_MS = 1.5, 25.0
+QUEUE_LEN = 100
+# (daemon case, the CLI case it repeats)
+DAEMON_CASES = [("jobs-find --status (daemon)", "jobs-find --status"),
+                ("jobs-find --text (daemon)", "jobs-find --text"),
+                ("jobs-list-unapplied (daemon)", "jobs-list-unapplied")]
+
+
+def tree(base: Path, n_apps: int) -> Path:
+    """HOME holding a synthetic secondbrain with n_apps apps (reused when already generated)."""
+    home = base / str(n_apps)
+    sb = home / "secondbrain"
+    stamp = home / "synth.json"
+    want = {"apps": n_apps, "seed": SEED}
+    try:
+        if json.loads(stamp.read_text()) == want:
+            return home
+    except (OSError, ValueError):
+        pass
+    if home.exists():
+        shutil.rmtree(home)
+    (sb / "01_projects").mkdir(parents=True)
+    (sb / "01_projects" / "resume-factory").symlink_to(REPO_ROOT / "01_projects" / "resume-factory")
+    t0 = time.perf_counter()
+    generate(sb, n_apps, seed=SEED)
+    print(f"GENERATED: {n_apps} apps in {time.perf_counter() - t0:.1f} s ({home})")
+    stamp.write_text(json.dumps(want) + "\n")
+    return home
+
+
+def sample(home: Path) -> dict:
+    """Inputs for the cases, drawn from the tree itself (not timed)."""
+    rnd = random.Random(SEED)
+    apps = []
+    for _rel, _fam, app in rf_jobs_index.iter_app_dirs(home / "secondbrain/01_projects/jobs"):
+        try:
+            apps.append((app, json.loads((app / "tracking/job-meta.json").read_text())))
+        except (OSError, ValueError):
+            continue
+    todo = [a for a, m in apps if m.get("status") == "not_applied"]
+    picked = rnd.sample(apps, min(QUEUE_LEN - 2, len(apps)))
+    queue = [str(a) for a, _m in picked] + [str(home / "secondbrain/01_projects/jobs/gone/app")] * 2
+    (home / "queue.txt").write_text("\n".join(queue) + "\n")
+    (home / "mark.txt").write_text("\n".join(str(a) for a in rnd.sample(todo, min(QUEUE_LEN, len(todo)))) + "\n")
+    hits = [(m.get("role_family", ""), m.get("source", "")) for _a, m in rnd.sample(apps, min(100, len(apps)))]
+    return {
+        "company": picked[0][1].get("company", "")[:5],
+        "urls": hits + [("qa_automation_engineer", f"https://example.com/jobs/{i}") for i in range(len(hits))],
+    }
+
+
+def cases(home: Path, inp: dict) -> list:
+    """[(name, argv, cold)] for the CLI cases; cold = delete the index before each run."""
+    q, mark = str(home / "queue.txt"), str(home / "mark.txt")
+    text = "playwright AND (java OR python) NOT cypress"
+    return [
+        ("jobs-find (cold)", ["jobs-find", "--status", "not_applied"], True),
+        ("jobs-find --text (cold)", ["jobs-find", "--text", text], True),
+        ("jobs-find --status", ["jobs-find", "--status", "not_applied"], False),
+        ("jobs-find --company --role", ["jobs-find", "--company", inp["company"], "--role", "engineer"], False),
+        ("jobs-find --text", ["jobs-find", "--text", text], False),
+        ("jobs-find --no-index", ["jobs-find", "--status", "not_applied", "--no-index"], False),
+        ("jobs-list-unapplied", ["jobs-list-unapplied"], False),
+        ("jobs-list-unapplied --no-index", ["jobs-list-unapplied", "--no-index"], False),
+        ("jobs-open-unapplied --dry-run", ["jobs-open-unapplied", "--dry-run", "--queue", str(home / "open.txt")], False),
+        ("jobs-queue-show", ["jobs-queue-show", q], False),
+        ("jobs-queue-prune (dry run)", ["jobs-queue-prune", q], False),
+        ("jobs-batch-mark-applied (dry run)", ["jobs-batch-mark-applied", "--date", "2026-07-01", "--paths-file", mark], False),
+    ]
+
+
+def drop_index(home: Path) -> None:
+    p = rf_jobs_index.index_path(home / "secondbrain")
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        Path(f"{p}{suffix}").unlink(missing_ok=True)
+
+def run_cli(home: Path, argv: list, runs: int, cold: bool, daemon: bool = False) -> dict:
+    env = dict(os.environ, HOME=str(home), RF_JOBS_DAEMON="on" if daemon else "off")
+    walls, rc, err, out = [], 0, [], None
+    for _ in range(runs):
+        if cold:
+            drop_index(home)
+        t0 = time.perf_counter()
+        r = subprocess.run([str(BIN_DIR / argv[0]), *argv[1:]], env=env, stdin=subprocess.DEVNULL,
+                           stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        walls.append(1000 * (time.perf_counter() - t0))
+        out = hashlib.sha1(r.stdout).hexdigest()
+        if r.returncode and not rc:
+            rc, err = r.returncode, r.stderr.decode(errors="replace").strip().splitlines()[-1:]
+    return {"rc": rc, "err": err, "out": out, "min_ms": min(walls), "med_ms": statistics.median(walls)}
+
+def run_daemon(home: Path, cli: list, res: dict, runs: int) -> dict:
+    """DAEMON_CASES with jobs-daemon started for this HOME (stopped again after)."""
+    env = dict(os.environ, HOME=str(home))
+    daemon = [str(BIN_DIR / "jobs-daemon")]
+    r = subprocess.run(daemon + ["start"], env=env, capture_output=True, text=True)
+    if r.returncode:
+        return {name: {"rc": r.returncode, "err": r.stderr.strip().splitlines()[-1:], "min_ms": 0.0, "med_ms": 0.0}
+                for name, _base in DAEMON_CASES}
+    argvs = {name: argv for name, argv, _cold in cli}
+    out = {}
+    try:
+        for name, base in DAEMON_CASES:
+            m = run_cli(home, argvs[base], runs, False, daemon=True)
+            m["same_as"] = None if m["out"] == res[base]["out"] else base
+            out[name] = m
+    finally:
+        subprocess.run(daemon + ["stop"], env=env, capture_output=True)
+    return out
+
+
+def _reset_dedup() -> None:
+    for conn in rf_job_folder_writer._INDEX_CONNS.values():
+        conn.close()
+    rf_job_folder_writer._INDEX_CONNS.clear()
+
+def run_dedup(home: Path, urls: list, runs: int) -> dict:
+    """find_existing_by_url: cold (builds the index), first call of a process, one lookup."""
+    root = home / "secondbrain"
+    family, url = urls[0]
+    out = {"cold": [], "first": [], "lookup": []}
+    for _ in range(runs):
+        for key in ("cold", "first"):
+            _reset_dedup()
+            if key == "cold":
+                drop_index(home)
+            t0 = time.perf_counter()
+            rf_job_folder_writer.find_existing_by_url(root, family, url)
+            out[key].append(1000 * (time.perf_counter() - t0))
+        t0 = time.perf_counter()
+        for fam, u in urls:
+            rf_job_folder_writer.find_existing_by_url(root, fam, u)
+        out["lookup"].append(1000 * (time.perf_counter() - t0) / len(urls))
+    _reset_dedup()
+    names = {"cold": "find_existing_by_url (cold)", "first": "find_existing_by_url (first call)",
+             "lookup": "find_existing_by_url (lookup)"}
+    return {names[k]: {"rc": 0, "min_ms": min(v), "med_ms": statistics.median(v)} for k, v in out.items()}
+
+
+def load_budget() -> dict:
+    try:
+        return json.loads(BUDGET_PATH.read_text()).get("sizes", {})
+    except (OSError, ValueError):
+        return {}
+
+def write_budget(results: dict) -> None:
+    sizes = load_budget()
+    for n, res in results.items():
+        sizes[str(n)] = {case: round(m["min_ms"] * HEADROOM + SLACK_MS) for case, m in res.items()}
+    doc = {"schema": "rf_bench_jobs_budget_v1", "sizes": dict(sorted(sizes.items(), key=lambda kv: int(kv[0])))}
+    tmp = BUDGET_PATH.with_name(f".{BUDGET_PATH.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, BUDGET_PATH)
+
+def append_history(path: Path, results: dict) -> None:
+    r = subprocess.run(["git", "-C", str(REPO_ROOT), "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    line = {"at": datetime.now().isoformat(timespec="seconds"), "rev": r.stdout.strip() or None,
+            "results": {str(n): {case: {"min_ms": round(m["min_ms"], 2), "med_ms": round(m["med_ms"], 2)}
+                                 for case, m in res.items()} for n, res in results.items()}}
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(line) + "\n")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Scaling benchmark for the jobs CLIs on synthetic trees.")
+    ap.add_argument("--apps", default="1000", help="Comma-separated tree sizes (default 1000; e.g. 1000,10000,100000)")
+    ap.add_argument("--runs", type=int, default=3, help="Runs per case (default 3)")
+    ap.add_argument("--dir", default=None, help="Keep / reuse the generated trees here (default: temp dir, removed)")
+    ap.add_argument("--update-budget", action="store_true", help=f"Write measured numbers (with headroom) to {BUDGET_PATH.name}")
+    ap.add_argument("--out", default=None, help="Append this run's results to a JSON-lines history file")
+    args = ap.parse_args()
+
+    sizes = [int(x) for x in args.apps.split(",") if x.strip()]
+    runs = max(1, args.runs)
+    budget = load_budget()
+    results, failures = {}, []
+    tmp = None if args.dir else tempfile.mkdtemp(prefix="rf-bench-jobs-")
+    base = Path(args.dir).expanduser() if args.dir else Path(tmp)
+    try:
+        for n in sizes:
+            home = tree(base, n)
+            inp = sample(home)
+            b = budget.get(str(n), {})
+            res = {}
+            print(f"\nAPPS: {n}")
+            print(f"{'CASE':36} {'min/med ms':>18} {'BUDGET':>8}")
+            cli = cases(home, inp)
+            for name, argv, cold in cli:
+                res[name] = run_cli(home, argv, runs, cold)
+            res.update(run_daemon(home, cli, res, runs))
+            res.update(run_dedup(home, inp["urls"], runs))
+            for name, m in res.items():
+                lim = b.get(name)
+                print(f"{name:36} {m['min_ms']:9.2f}/{m['med_ms']:<8.2f} {lim if lim is not None else '-':>8}")
+                if m["rc"]:
+                    failures.append(f"{n}: {name} exited {m['rc']} {' '.join(m.get('err') or [])}".rstrip())
+                if m.get("same_as"):
+                    failures.append(f"{n}: {name} output differs from {m['same_as']}")
+                if lim is not None and not args.update_budget and m["min_ms"] > lim:
+                    failures.append(f"{n}: {name} {m['min_ms']:.0f} ms > budget {lim} ms")
+            results[n] = res
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.update_budget:
+        write_budget(results)
+        print(f"WROTE: {BUDGET_PATH}")
+    if args.out:
+        append_history(Path(args.out).expanduser(), results)
+        print(f"APPENDED: {args.out}")
+    missing = [str(n) for n in sizes if str(n) not in budget]
+    if missing and not args.update_budget:
+        print(f"NO BUDGET: {', '.join(missing)} apps (run with --update-budget)")
+    for f in failures:
+        print(f"REGRESSION: {f}")
+    print("JOBS: OK" if not failures else f"JOBS: {len(failures)} regression(s)")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark + regression budget for the Python CLIs in 07_system/bin.
+
+  python3 rf_bench_startup.py                    # every tool, `<tool> --help`, 5 runs each
+  python3 rf_bench_startup.py --runs 10 resume-approve-edits job-intake-batch
+  python3 rf_bench_startup.py --update-budget    # re-baseline rf_bench_startup.budget.json
+
+Each tool is run as `python3 -X importtime <tool> --help`. Reported per tool:
+wall time (min / median over the runs) and the import time the tool adds on top
+of a bare interpreter (top-level cumulative `-X importtime` entries of modules a
+`python3 -c pass` run does not already load), plus its heaviest imports.
+
+Fails (exit 1) when a tool exceeds its budget (rf_bench_startup.budget.json,
+import_ms and wall_ms per tool) or when --help loads any of the heavy
+dependencies that only the working paths need (FORBIDDEN: docx, openai,
+requests, bs4, lxml, playwright). --update-budget writes the measured numbers
+with headroom (x1.5 + 25 ms) so machine noise does not trip it.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+BIN_DIR = REPO_ROOT / "07_system" / "bin"
+BUDGET_PATH = Path(__file__).with_name("rf_bench_startup.budget.json")
+
+FORBIDDEN = ("docx", "openai", "requests", "bs4", "lxml", "playwright")
+HEADROOM, SLACK_MS = 1.5, 25.0
+
+
+def python_tools(bin_dir: Path = BIN_DIR) -> list:
+    """Names of the Python entry points (python shebang; backups skipped)."""
+    out = []
+    for p in sorted(bin_dir.iterdir()):
+        if not p.is_file() or p.name.endswith(".bak"):
+            continue
+        try:
+            with p.open("rb") as f:
+                first = f.readline()
+        except OSError:
+            continue
+        if first.startswith(b"#!") and b"python" in first:
+            out.append(p.name)
+    return out
+
+
+def parse_importtime(stderr: str) -> list:
+    """[(module, self_us, cumulative_us, depth)] from `-X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+            depth = (len(name) - len(name.lstrip())) // 2
+            rows.append((name.strip(), int(self_us), int(cum_us), depth))
+        except ValueError:
+            continue
+    return rows
+
+
+def run_once(argv: list) -> tuple:
+    t0 = time.perf_counter()
+    r = subprocess.run([sys.executable, "-X", "importtime", *argv], capture_output=True, text=True)
+    return time.perf_counter() - t0, r.returncode, parse_importtime(r.stderr)
+
+
+def baseline_modules() -> set:
+    _dt, _rc, rows = run_once(["-c", "pass"])
+    return {name for name, _s, _c, _d in rows}
+
+
+def measure(tool: str, runs: int, baseline: set) -> dict:
+    walls, rc, rows = [], 0, []
+    for _ in range(runs):
+        dt, rc, rows = run_once([str(BIN_DIR / tool), "--help"])
+        walls.append(1000 * dt)
+    # the last run's import tree (imports are deterministic; timings are not)
+    top = [(name, cum) for name, _s, cum, depth in rows if depth == 0 and name not in baseline]
+    loaded = {name for name, _s, _c, _d in rows}
+    return {
+        "rc": rc,
+        "wall_min_ms": min(walls),
+        "wall_med_ms": statistics.median(walls),
+        "import_ms": sum(cum for _n, cum in top) / 1000,
+        "heaviest": sorted(top, key=lambda x: -x[1])[:3],
+        "forbidden": sorted({m.split(".")[0] for m in loaded if m.split(".")[0] in FORBIDDEN}),
+    }
+
+
+def load_budget() -> dict:
+    try:
+        return json.loads(BUDGET_PATH.read_text()).get("tools", {})
+    except (OSError, ValueError):
+        return {}
+
+def write_budget(results: dict) -> None:
+    tools = load_budget()
+    for tool, m in results.items():
+        tools[tool] = {
+            "import_ms": round(m["import_ms"] * HEADROOM + SLACK_MS),
+            "wall_ms": round(m["wall_min_ms"] * HEADROOM + SLACK_MS),
+        }
+    doc = {"schema": "rf_bench_startup_budget_v1", "tools": dict(sorted(tools.items()))}
+    tmp = BUDGET_PATH.with_name(f".{BUDGET_PATH.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, BUDGET_PATH)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cold-start benchmark for the 07_system/bin Python CLIs.")
+    ap.add_argument("tools", nargs="*", help="Tool names (default: every Python tool in 07_system/bin)")
+    ap.add_argument("--runs", type=int, default=5, help="Runs per tool (default 5)")
+    ap.add_argument("--update-budget", action="store_true", help=f"Write measured numbers (with headroom) to {BUDGET_PATH.name}")
+    args = ap.parse_args()
+
+    tools = args.tools or python_tools()
+    baseline = baseline_modules()
+    budget = load_budget()
+    results, failures = {}, []
+
+    print(f"{'TOOL':26} {'WALL min/med ms':>16} {'IMPORT ms':>10} {'BUDGET imp/wall':>16}  HEAVIEST")
+    for tool in tools:
+        m = measure(tool, max(1, args.runs), baseline)
+        results[tool] = m
+        b = budget.get(tool)
+        heavy = ", ".join(f"{n} {c / 1000:.0f}" for n, c in m["heaviest"])
+        bud = f"{b['import_ms']}/{b['wall_ms']}" if b else "-"
+        print(f"{tool:26} {m['wall_min_ms']:7.0f}/{m['wall_med_ms']:<8.0f} {m['import_ms']:10.1f} {bud:>16}  {heavy}")
+        if m["rc"] not in (0, 2):  # 2: tools without argparse print usage and exit 2
+            failures.append(f"{tool}: --help exited {m['rc']}")
+        if m["forbidden"]:
+            failures.append(f"{tool}: --help imports {', '.join(m['forbidden'])}")
+        if b and not args.update_budget:
+            if m["import_ms"] > b["import_ms"]:
+                failures.append(f"{tool}: import {m['import_ms']:.1f} ms > budget {b['import_ms']} ms")
+            if m["wall_min_ms"] > b["wall_ms"]:
+                failures.append(f"{tool}: wall {m['wall_min_ms']:.0f} ms > budget {b['wall_ms']} ms")
+
+    if args.update_budget:
+        write_budget(results)
+        print(f"WROTE: {BUDGET_PATH}")
+    missing = [t for t in tools if t not in budget]
+    if missing and not args.update_budget:
+        print(f"NO BUDGET: {', '.join(missing)} (run with --update-budget)")
+    for f in failures:
+        print(f"REGRESSION: {f}")
+    print("STARTUP: OK" if not failures else f"STARTUP: {len(failures)} regression(s)")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
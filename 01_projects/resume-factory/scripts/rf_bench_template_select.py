@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-template substring scoring (legacy resume-select) vs the
+compiled single-scan engine in rf_template_select.
+
+  python3 rf_bench_template_select.py                       # real JDs under 01_projects/jobs + synthetic
+  python3 rf_bench_template_select.py --jobs 2000 --templates 40
+  python3 rf_bench_template_select.py --family qa_automation_engineer
+
+Scores every JD against every template both ways (legacy re-reads signals.json
+per JD, as one resume-select process per app did), checks that the full rows
+(score, order, hit lists) are identical, and reports time per batch.
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rf_template_select import load_family, norm, templates_root
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+# --- legacy scoring: what resume-select did before (substring test per keyword per template) ---
+
+def has(text: str, kw: str) -> bool:
+    kw = (kw or "").strip().lower()
+    if not kw:
+        return False
+    return kw in text
+
+def legacy_score(sig: dict, text: str):
+    pref = [k for k in sig.get("preferred_keywords", []) if isinstance(k, str)]
+    neut = [k for k in sig.get("neutral_keywords", []) if isinstance(k, str)]
+    anti = [k for k in sig.get("anti_signals", []) if isinstance(k, str)]
+    hits_pref = [k for k in pref if has(text, k)]
+    hits_neut = [k for k in neut if has(text, k)]
+    hits_anti = [k for k in anti if has(text, k)]
+    sc = 10 * len(hits_pref) + 2 * len(hits_neut) - 12 * len(hits_anti)
+    ps = sig.get("primary_stack", {}) or {}
+    lang = (ps.get("language") or "").lower()
+    tool = (ps.get("automation_tool") or "").lower()
+    if lang and has(text, lang): sc += 6
+    if tool and has(text, tool): sc += 8
+    if has(text, "cypress") and sig.get("template_id") == "04":
+        sc += 10
+    return sc, hits_pref, hits_neut, hits_anti, lang, tool
+
+def legacy_rank(root: Path, text: str):
+    rows = []
+    for sig_p in root.rglob("signals.json"):
+        sig = json.loads(sig_p.read_text())
+        tid = sig.get("template_id", "??")
+        slug = sig.get("template_slug", sig_p.parent.name)
+        sc, hp, hn, ha, lang, tool = legacy_score(sig, text)
+        rows.append((sc, tid, slug, sig_p.parent, hp, hn, ha, lang, tool, sig))
+    rows.sort(key=lambda r: r[0], reverse=True)
+    return rows
+
+
+# --- synthetic inputs -------------------------------------------------------------
+
+WORDS = ["java", "javascript", "typescript", "python", "playwright", "selenium", "cypress", "pytest",
+         "testng", "junit", "api testing", "rest assured", "postman", "ci/cd", "jenkins", "docker",
+         "kubernetes", "aws", "azure", "sql", "allure", "fixtures", "requests", "cucumber", "bdd",
+         "java (only)", "typescript (only)", "mobile", "appium", "performance", "jmeter", "k6"]
+FILLER = ("we are looking for an engineer to own quality across our platform and partner with "
+          "developers on release readiness, triage and automation strategy").split()
+
+def synthetic_templates(dst: Path, n: int, seed: int = 3) -> Path:
+    rnd = random.Random(seed)
+    langs = ["java", "python", "typescript", "javascript"]
+    tools = ["selenium", "playwright", "cypress", "appium"]
+    for i in range(1, n + 1):
+        d = dst / f"{i:02d}_synthetic"
+        d.mkdir(parents=True)
+        sig = {
+            "template_id": f"{i:02d}",
+            "template_slug": d.name,
+            "primary_stack": {"language": rnd.choice(langs), "automation_tool": rnd.choice(tools)},
+            "preferred_keywords": rnd.sample(WORDS, 8),
+            "neutral_keywords": rnd.sample(WORDS, 7),
+            "anti_signals": rnd.sample(WORDS, 2),
+        }
+        (d / "signals.json").write_text(json.dumps(sig))
+    return dst
+
+def synthetic_jds(n: int, seed: int = 5):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        toks = [rnd.choice(FILLER) for _ in range(400)]
+        for _ in range(rnd.randint(3, 15)):
+            toks.insert(rnd.randrange(len(toks)), rnd.choice(WORDS).title())
+        out.append(norm(" ".join(toks)))
+    return out
+
+
+def run(label: str, root: Path, texts, repeat: int) -> bool:
+    def legacy():
+        return [legacy_rank(root, t) for t in texts]
+
+    def engine():
+        ts = load_family(root=root)
+        return [ts.rank(t) for t in texts]
+
+    results = {}
+    for name, fn in (("legacy", legacy), ("compiled", engine)):
+        times = []
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            rows = fn()
+            times.append(time.perf_counter() - t0)
+        results[name] = (min(times), rows)
+
+    n_tpl = len(list(root.rglob("signals.json")))
+    print(f"{label}: {len(texts)} JDs x {n_tpl} templates")
+    base = results["legacy"][0]
+    for name, (dt, _) in results.items():
+        print(f"- {name:9} {1000 * dt:9.1f} ms/batch  x{base / dt if dt else 0:.1f}")
+    same = results["legacy"][1] == results["compiled"][1]
+    print(f"PARITY: {'OK' if same else 'MISMATCH'}")
+    return same
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark resume-select template scoring.")
+    ap.add_argument("--family", default="qa_automation_engineer", help="Real template family (default qa_automation_engineer)")
+    ap.add_argument("--jobs", type=int, default=1000, help="Synthetic JDs (default 1000)")
+    ap.add_argument("--templates", type=int, default=25, help="Synthetic templates (default 25)")
+    ap.add_argument("--repeat", type=int, default=1, help="Runs per path, best kept (default 1)")
+    args = ap.parse_args()
+
+    ok = True
+    real_root = REPO_ROOT / "03_assets/templates/resumes" / args.family
+    if not real_root.is_dir():
+        real_root = templates_root(args.family)
+    jds = [norm(p.read_text(errors="ignore")) for p in sorted((REPO_ROOT / "01_projects/jobs").rglob("jd/jd-raw.txt"))]
+    jds = [t for t in jds if t.strip()]
+    if real_root.is_dir() and jds:
+        ok &= run("REAL", real_root, jds, args.repeat)
+
+    with tempfile.TemporaryDirectory() as td:
+        root = synthetic_templates(Path(td), args.templates)
+        ok &= run("SYNTHETIC", root, synthetic_jds(args.jobs), args.repeat)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
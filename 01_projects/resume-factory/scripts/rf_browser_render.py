@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import sys
+import threading
+from typing import Dict, Optional
+
+# -----------------------------------------------------------------------------
+# Headless rendering fallback for JS-rendered job pages (Playwright, optional)
+# -----------------------------------------------------------------------------
+#
+# One Chromium per process, driven from a private asyncio loop thread. A fixed pool
+# of browser contexts is reused across renders (new page per URL, closed after), so
+# N URLs cost one browser launch and at most RF_RENDER_PAGES concurrent pages.
+# Images, fonts and media are aborted at the network layer.
+#
+# Callers are ordinary threads (the intake worker pool): render_html() blocks the
+# caller until its page is done, while other callers render in parallel.
+#
+# There is one pool per verify_ssl setting (contexts differ in ignore_https_errors).
+# A launch that fails (Playwright importable but Chromium not installed) tears down
+# what it started and is remembered, so later renders fail fast instead of
+# relaunching per URL.
+#
+# Env:
+#   RF_RENDER_PAGES       concurrent pages / pooled contexts (default 4)
+#   RF_RENDER_TIMEOUT_MS  navigation timeout (default 30000)
+#   RF_RENDER_SETTLE_MS   extra wait after DOMContentLoaded for XHR-filled JDs (default 1500)
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    v = os.environ.get(name)
+    return v if (v is not None and v != "") else default
+
+def _pages() -> int:
+    return max(1, int(_env("RF_RENDER_PAGES", "4")))
+
+def _timeout_ms() -> int:
+    return int(_env("RF_RENDER_TIMEOUT_MS", "30000"))
+
+def _settle_ms() -> int:
+    return int(_env("RF_RENDER_SETTLE_MS", "1500"))
+
+
+def available() -> bool:
+    try:
+        import playwright.async_api  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+class BrowserPool:
+    """
+    Process-wide Chromium + reusable contexts. Use get_pool(); do not construct per URL.
+    """
+
+    def __init__(self, pages: int, verify_ssl: bool = True):
+        self.pages = pages
+        self.verify_ssl = verify_ssl
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="rf-browser", daemon=True)
+        self._thread.start()
+        self._pw = None
+        self._browser = None
+        self._contexts: Optional[asyncio.Queue] = None
+        try:
+            self._call(self._start())
+        except Exception:
+            # the driver process (and maybe a browser) is already up: stop it with the loop
+            self.close()
+            raise
+
+    def _call(self, coro, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    @staticmethod
+    async def _block_heavy(route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _start(self):
+        from playwright.async_api import async_playwright
+
+        self._pw = await async_playwright().start()
+        self._browser = await self._pw.chromium.launch(headless=True)
+        self._contexts = asyncio.Queue()
+        for _ in range(self.pages):
+            ctx = await self._browser.new_context(
+                user_agent=USER_AGENT,
+                ignore_https_errors=not self.verify_ssl,
+                java_script_enabled=True,
+            )
+            await ctx.route("**/*", self._block_heavy)
+            self._contexts.put_nowait(ctx)
+
+    async def _render(self, url: str) -> str:
+        ctx = await self._contexts.get()
+        page = None
+        try:
+            page = await ctx.new_page()
+            await page.goto(url, wait_until="domcontentloaded", timeout=_timeout_ms())
+            try:
+                # most ATS boards fill the JD via XHR right after DOMContentLoaded
+                await page.wait_for_load_state("networkidle", timeout=_settle_ms())
+            except Exception:
+                pass
+            return await page.content()
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            self._contexts.put_nowait(ctx)
+
+    def render(self, url: str) -> str:
+        # generous outer bound: navigation + settle + queueing behind other pages
+        return self._call(self._render(url), timeout=(_timeout_ms() + _settle_ms()) / 1000 * 4)
+
+    async def _stop(self):
+        while self._contexts is not None and not self._contexts.empty():
+            try:
+                await self._contexts.get_nowait().close()
+            except Exception:
+                pass
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+
+    def close(self):
+        try:
+            self._call(self._stop(), timeout=30)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+_pools: Dict[bool, BrowserPool] = {}  # verify_ssl -> pool
+_pool_error: Optional[str] = None
+_pool_lock = threading.Lock()
+_atexit_registered = False
+
+def get_pool(verify_ssl: bool = True) -> BrowserPool:
+    """
+    Lazily launch the shared browser for this verify_ssl setting on first use
+    (closed at interpreter exit). Raises RuntimeError if Playwright / Chromium is
+    not installed; after one failed launch every later call raises at once.
+    """
+    global _pool_error, _atexit_registered
+    with _pool_lock:
+        pool = _pools.get(verify_ssl)
+        if pool is not None:
+            return pool
+        if _pool_error is not None:
+            raise RuntimeError(_pool_error)
+        if not available():
+            _pool_error = "JS rendering needs Playwright: pip install playwright && python -m playwright install chromium"
+            raise RuntimeError(_pool_error)
+        try:
+            pool = BrowserPool(_pages(), verify_ssl=verify_ssl)
+        except Exception as e:
+            first = (str(e).strip().splitlines() or [""])[0]
+            _pool_error = (f"browser launch failed ({e.__class__.__name__}: {first}); "
+                           "is Chromium installed? python -m playwright install chromium")
+            raise RuntimeError(_pool_error) from e
+        _pools[verify_ssl] = pool
+        if not _atexit_registered:
+            atexit.register(close_pool)
+            _atexit_registered = True
+        return pool
+
+def close_pool() -> None:
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for p in pools:
+        p.close()
+
+
+def render_html(url: str, verify_ssl: bool = True) -> str:
+    """
+    Fully rendered DOM (page.content()) for url, via the shared browser pool.
+    """
+    return get_pool(verify_ssl=verify_ssl).render(url)
+
+
+if __name__ == "__main__":
+    # CLI for shell tools: print rendered HTML for one URL
+    if len(sys.argv) != 2:
+        print("usage: rf_browser_render.py <url>", file=sys.stderr)
+        raise SystemExit(2)
+    try:
+        sys.stdout.write(render_html(sys.argv[1]))
+    except Exception as e:
+        print(f"ERROR: render failed: {e}", file=sys.stderr)
+        raise SystemExit(1)
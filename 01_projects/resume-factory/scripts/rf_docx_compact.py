@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from docx.oxml.ns import qn
+
+# -----------------------------------------------------------------------------
+# Blank-paragraph compaction for generated DOCX bodies (single pass)
+# -----------------------------------------------------------------------------
+#
+# Edits (DELETE_LINE especially) leave runs of empty paragraphs behind. This
+# walks the body's child elements ONCE, decides what to drop, then unlinks those
+# elements: O(body) regardless of how many are removed (the old loop rebuilt
+# doc.paragraphs after every removal).
+#
+#   - leading blank paragraphs are removed
+#   - trailing blank paragraphs are removed, except one directly after a final
+#     table (Word requires a paragraph between a table and the section end)
+#   - consecutive blank paragraphs collapse to one
+#
+# Structure is respected: tables and other block content end a blank run; a
+# paragraph carrying a section break (w:pPr/w:sectPr), a drawing/picture/object
+# or a page/column break is never "blank"; the body's final w:sectPr is left alone.
+#
+# Works on a docx.Document, an rf_ooxml_patch.DocxPatch, or a w:body element.
+
+_CONTENT_MARKERS = (
+    qn("w:drawing"), qn("w:pict"), qn("w:object"), qn("w:sym"),
+    qn("w:fldSimple"), qn("w:fldChar"), qn("w:footnoteReference"), qn("w:endnoteReference"),
+)
+# body-level elements that neither hold content nor separate blank runs
+_NEUTRAL = {
+    qn("w:bookmarkStart"), qn("w:bookmarkEnd"), qn("w:commentRangeStart"), qn("w:commentRangeEnd"),
+    qn("w:proofErr"), qn("w:permStart"), qn("w:permEnd"),
+}
+_P, _TBL, _SECTPR, _T, _BR = qn("w:p"), qn("w:tbl"), qn("w:sectPr"), qn("w:t"), qn("w:br")
+
+def _body_of(doc_or_body):
+    if getattr(doc_or_body, "tag", None) == qn("w:body"):
+        return doc_or_body
+    el = getattr(doc_or_body, "element", doc_or_body)
+    return el.body
+
+def is_blank_paragraph(p) -> bool:
+    """No visible text and nothing structural (section break, drawing, page break ...)."""
+    ppr = p.pPr
+    if ppr is not None and ppr.find(_SECTPR) is not None:
+        return False
+    for el in p.iter():
+        tag = el.tag
+        if tag == _T:
+            if (el.text or "").strip():
+                return False
+        elif tag == _BR:
+            if el.get(qn("w:type")) in ("page", "column"):
+                return False
+        elif tag in _CONTENT_MARKERS:
+            return False
+    return True
+
+def compact_blank_paragraphs(doc_or_body) -> Dict[str, Any]:
+    """
+    Remove leading/trailing blank paragraphs and collapse consecutive ones.
+    Returns {"removed", "leading", "trailing", "collapsed", "removed_at"}; removed_at
+    holds the body child indexes (before removal) of the dropped paragraphs.
+    """
+    body = _body_of(doc_or_body)
+    kids = [el for el in body if el.tag != _SECTPR]
+
+    # classify: "b" blank paragraph, "c" content, "n" neutral
+    kinds: List[str] = []
+    for el in kids:
+        if el.tag == _P:
+            kinds.append("b" if is_blank_paragraph(el) else "c")
+        elif el.tag in _NEUTRAL:
+            kinds.append("n")
+        else:
+            kinds.append("c")
+
+    content = [i for i, k in enumerate(kinds) if k == "c"]
+    drop: Dict[int, str] = {}
+    if not content:
+        for i, k in enumerate(kinds):
+            if k == "b":
+                drop[i] = "leading"
+    else:
+        first, last = content[0], content[-1]
+        keep_after_table = kids[last].tag == _TBL
+        prev_blank = False
+        for i, k in enumerate(kinds):
+            if k == "n":
+                continue
+            if k == "c":
+                prev_blank = False
+                continue
+            if i < first:
+                drop[i] = "leading"
+            elif i > last:
+                if keep_after_table and not prev_blank:
+                    prev_blank = True  # the one paragraph a trailing table needs
+                else:
+                    drop[i] = "trailing"
+            elif prev_blank:
+                drop[i] = "collapsed"
+            else:
+                prev_blank = True
+
+    for i in drop:
+        body.remove(kids[i])
+
+    report = {"removed": len(drop), "leading": 0, "trailing": 0, "collapsed": 0, "removed_at": sorted(drop)}
+    for why in drop.values():
+        report[why] += 1
+    return report
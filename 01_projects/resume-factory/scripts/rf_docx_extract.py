@@ -4,30 +4,17 @@ import re
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-from docx import Document
-
 def norm(s: str) -> str:
     s = (s or "").lower()
     s = s.replace("\u2019", "'")
     s = re.sub(r"\s+", " ", s)
     return s.strip()
 
-def read_docx_lines(docx_path: Path) -> List[str]:
-    if not docx_path.exists():
-        raise FileNotFoundError(f"missing resume-master.docx: {docx_path}")
-    doc = Document(str(docx_path))
-    out: List[str] = []
-    for p in doc.paragraphs:
-        t = (p.text or "").rstrip()
-        if not t.strip():
-            out.append("")
-            continue
-        out.append(t)
-
+def collapse_blank_lines(lines: List[str]) -> List[str]:
     # collapse excessive blank runs
     cleaned: List[str] = []
     prev_blank = False
-    for t in out:
+    for t in lines:
         blank = (t.strip() == "")
         if blank and prev_blank:
             continue
@@ -35,6 +22,16 @@ def read_docx_lines(docx_path: Path) -> List[str]:
         prev_blank = blank
     return cleaned
 
+def read_docx_lines(docx_path: Path) -> List[str]:
+    """
+    Paragraph lines of the docx (blank runs collapsed). Served from the compiled
+    template IR (rf_template_ir), so python-docx only runs when the docx changed.
+    """
+    if not docx_path.exists():
+        raise FileNotFoundError(f"missing resume-master.docx: {docx_path}")
+    from rf_template_ir import load_template
+    return load_template(docx_path).lines
+
 def locate_sections(lines: List[str]) -> Tuple[List[str], List[str], List[str], List[str]]:
     """
     Deterministic locator aligned to templates:
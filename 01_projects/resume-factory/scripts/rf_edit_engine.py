@@ -0,0 +1,507 @@
+from __future__ import annotations
+
+import copy
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# -----------------------------------------------------------------------------
+# Indexed batch edit engine (resume-approve-edits)
+# -----------------------------------------------------------------------------
+#
+# The old apply_* helpers scanned every paragraph (recomputing norm() on each)
+# for every proposal: O(proposals x paragraphs x text). Here the document is
+# read ONCE into an index (text, normalized text -> paragraph ids), every
+# proposal is resolved against that index up front, and the edits are then
+# applied in one pass over the resolved paragraphs.
+#
+# Resolution is sequential in proposal order and keeps the index current with
+# the text each edit will produce, so it matches what applying the proposals
+# one by one did: a line already replaced/deleted by an earlier proposal is no
+# longer found by its old text (reported as a conflict with that proposal),
+# later proposals may target text written by earlier ones, and several ADD_LINEs
+# on one anchor stack exactly as before. Proposals carrying a before_ref
+# (H/S/K/E, from the template IR) go straight to that paragraph when its text
+# still matches `before`.
+#
+# Match order for REPLACE_LINE (as before): first paragraph that either equals
+# `before` (normalized) or contains it verbatim; then a short paragraph that
+# contains it after normalization; then the REPLACE_PHRASE fallback.
+
+OPS = ("REPLACE_LINE", "REPLACE_PHRASE", "ADD_LINE", "DELETE_LINE")
+
+NOT_FOUND = "Target line not found in DOCX paragraphs"
+
+def norm(s: str) -> str:
+    return re.sub(r"\s+", " ", (s or "").strip()).lower()
+
+
+@dataclass
+class Edit:
+    n: int                          # 1-based position among the chosen proposals
+    proposal: Dict[str, Any]
+    op: str
+    before: str
+    after: str
+    target: Optional[int] = None    # paragraph id (see ParagraphIndex)
+    how: str = ""                   # exact | ref | substring | contained | phrase | anchor
+    new_id: Optional[int] = None    # ADD_LINE: id given to the inserted paragraph
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# --- index -------------------------------------------------------------------
+
+def _order_key_after(key: Tuple[int, ...], counter: int) -> Tuple[int, ...]:
+    # (5,) < (5, -2) < (5, -1) < (6,): a paragraph inserted later right after the
+    # same anchor sorts before the ones inserted earlier, like addnext() does.
+    return key + (-counter,)
+
+class _Haystack:
+    """
+    Strings joined with NUL in document order: one C-level str.find() locates the
+    first paragraph containing a needle instead of a Python loop over paragraphs.
+    """
+
+    def __init__(self, ids: List[int], strings: List[str]):
+        self.ids = ids
+        self.blob = "\x00".join(strings)
+        self.starts: List[int] = []
+        pos = 0
+        for st in strings:
+            self.starts.append(pos)
+            pos += len(st) + 1
+
+    def first(self, needle: str, accept=None) -> Optional[int]:
+        if not needle or "\x00" in needle:
+            return None
+        at = 0
+        while True:
+            hit = self.blob.find(needle, at)
+            if hit < 0:
+                return None
+            k = bisect_right(self.starts, hit) - 1
+            i = self.ids[k]
+            if accept is None or accept(i):
+                return i
+            at = self.starts[k + 1] if k + 1 < len(self.starts) else len(self.blob)
+
+class ParagraphIndex:
+    """
+    Document paragraphs keyed by id (original position; inserted ones get new ids)
+    with their current text, normalized text, and norm -> ids / strip -> ids maps.
+    """
+
+    def __init__(self, paragraphs):
+        self.paras: Dict[int, Any] = dict(enumerate(paragraphs))
+        self.text: Dict[int, str] = {i: (p.text or "") for i, p in self.paras.items()}
+        self.key: Dict[int, Tuple[int, ...]] = {i: (i,) for i in self.paras}
+        self.order: List[int] = list(self.paras)
+        self.alive = set(self.paras)
+        self.by_norm: Dict[str, List[int]] = {}
+        self.by_strip: Dict[str, List[int]] = {}
+        self._norm: Dict[int, str] = {}
+        self._next_id = len(self.order)
+        self._inserts = 0
+        self._hay: Optional[Tuple[_Haystack, _Haystack]] = None
+        for i in self.order:
+            self._add_keys(i)
+
+    def _add_keys(self, i: int) -> None:
+        t = self.text[i]
+        n = norm(t)
+        self._norm[i] = n
+        self._insert_sorted(self.by_norm.setdefault(n, []), i)
+        self._insert_sorted(self.by_strip.setdefault(t.strip(), []), i)
+
+    def _drop_keys(self, i: int) -> None:
+        self.by_norm[self._norm[i]].remove(i)
+        self.by_strip[self.text[i].strip()].remove(i)
+
+    def _insert_sorted(self, ids: List[int], i: int) -> None:
+        k = self.key[i]
+        pos = len(ids)
+        while pos and self.key[ids[pos - 1]] > k:
+            pos -= 1
+        ids.insert(pos, i)
+
+    def norm_of(self, i: int) -> str:
+        return self._norm[i]
+
+    def first_norm(self, n: str) -> Optional[int]:
+        ids = self.by_norm.get(n)
+        return ids[0] if ids else None
+
+    def first_strip(self, s: str) -> Optional[int]:
+        ids = self.by_strip.get(s)
+        return ids[0] if ids else None
+
+    def _haystacks(self) -> Tuple[_Haystack, _Haystack]:
+        # rebuilt lazily after an edit: one join, no per-paragraph Python work per lookup
+        if self._hay is None:
+            live = [i for i in self.order if i in self.alive]
+            self._hay = (_Haystack(live, [self.text[i] for i in live]),
+                         _Haystack(live, [self._norm[i] for i in live]))
+        return self._hay
+
+    def first_containing(self, s: str) -> Optional[int]:
+        """First live paragraph whose text contains s verbatim."""
+        return self._haystacks()[0].first(s)
+
+    def first_norm_containing(self, n: str, max_len: int) -> Optional[int]:
+        """First live paragraph (text length <= max_len) whose normalized text contains n."""
+        return self._haystacks()[1].first(n, lambda i: len(self.text[i]) <= max_len)
+
+    def before(self, i: int, j: Optional[int]) -> bool:
+        return j is None or self.key[i] < self.key[j]
+
+    # simulated edits (keep the index equal to what the document will contain)
+    def set_text(self, i: int, text: str) -> None:
+        self._hay = None
+        self._drop_keys(i)
+        self.text[i] = text
+        self._add_keys(i)
+
+    def delete(self, i: int) -> None:
+        self._hay = None
+        self._drop_keys(i)
+        self.alive.discard(i)
+
+    def insert_after(self, anchor: int, text: str) -> int:
+        self._hay = None
+        i = self._next_id
+        self._next_id += 1
+        self._inserts += 1
+        self.key[i] = _order_key_after(self.key[anchor], self._inserts)
+        self.text[i] = text
+        self.alive.add(i)
+        pos = self.order.index(anchor) + 1
+        while pos < len(self.order) and self.key[self.order[pos]] < self.key[i]:
+            pos += 1
+        self.order.insert(pos, i)
+        self._add_keys(i)
+        return i
+
+
+def ref_targets(paragraph_texts: List[str], refs: Dict[str, Dict[str, str]]) -> Dict[str, int]:
+    """
+    Map template refs (H001.., S001.., K001.., E001..) to paragraph positions.
+    Refs number the non-blank lines section by section, so the k-th ref carrying
+    text T is the k-th paragraph whose text (rstripped) is T.
+    """
+    positions: Dict[str, List[int]] = {}
+    for i, t in enumerate(paragraph_texts):
+        t = t.rstrip()
+        if t.strip():
+            positions.setdefault(t, []).append(i)
+    seen: Dict[str, int] = {}
+    out: Dict[str, int] = {}
+    for ref in sorted(refs, key=lambda r: ("HSKE".find(r[:1]), r)):
+        t = (refs[ref] or {}).get("text", "")
+        k = seen.get(t, 0)
+        seen[t] = k + 1
+        cand = positions.get(t) or []
+        if k < len(cand):
+            out[ref] = cand[k]
+    return out
+
+
+# --- resolution ----------------------------------------------------------------
+
+def _labeled(a_raw: str) -> str:
+    label, rest = a_raw.split(":", 1)
+    return f"{label.strip()}: {rest.strip()}"
+
+def _whole_line_text(before_raw: str, after_raw: str, first_run_bold: Optional[bool], how: str) -> str:
+    # text the paragraph will hold after _replace_whole / _replace_contained
+    if ":" in after_raw and (
+        (how == "exact" and ":" in before_raw)
+        or (how == "contained" and first_run_bold is True)
+    ):
+        return _labeled(after_raw)
+    return after_raw
+
+def _first_run_bold(idx: ParagraphIndex, i: int) -> Optional[bool]:
+    p = idx.paras.get(i)
+    runs = getattr(p, "runs", None) if p is not None else None
+    return runs[0].bold if runs else None
+
+class EditPlan:
+    def __init__(self, doc, refs: Optional[Dict[str, Dict[str, str]]] = None):
+        self.doc = doc
+        paragraphs = list(getattr(doc, "paragraphs", []))
+        self.index = ParagraphIndex(paragraphs)
+        self.edits: List[Edit] = []
+        self.ref_map = ref_targets([self.index.text[i] for i in range(len(paragraphs))], refs) if refs else {}
+        self._orig_norm = {i: self.index.norm_of(i) for i in self.index.order}
+        self._orig_strip = {i: self.index.text[i].strip() for i in self.index.order}
+        self._edited_by: Dict[int, int] = {}   # paragraph id -> proposal n that changed/deleted it
+
+    # -- helpers
+    def _conflict(self, n_text: Optional[str] = None, strip_text: Optional[str] = None) -> str:
+        for i, by in sorted(self._edited_by.items()):
+            if (n_text is not None and self._orig_norm.get(i) == n_text) or \
+               (strip_text is not None and self._orig_strip.get(i) == strip_text):
+                return f"Conflict: target paragraph already edited by proposal {by}"
+        return NOT_FOUND
+
+    def _touch(self, e: Edit, i: int) -> None:
+        self._edited_by.setdefault(i, e.n)
+
+    def _resolve_phrase(self, e: Edit, b: str, a: str) -> bool:
+        if not b:
+            return False
+        i = self.index.first_containing(b)
+        if i is None:
+            return False
+        e.target, e.how = i, "phrase"
+        self.index.set_text(i, self.index.text[i].replace(b, a, 1))
+        self._touch(e, i)
+        return True
+
+    def _resolve_replace_line(self, e: Edit) -> bool:
+        idx = self.index
+        b_raw, a_raw = e.before.strip(), e.after.strip()
+        if not b_raw:
+            return False
+        b_n = norm(b_raw)
+
+        target, how = None, ""
+        ref = e.proposal.get("before_ref")
+        if isinstance(ref, str) and ref in self.ref_map:
+            i = self.ref_map[ref]
+            if i in idx.alive and idx.norm_of(i) == b_n:
+                target, how = i, "ref"
+
+        if target is None:
+            exact = idx.first_norm(b_n) if b_n else None
+            # a verbatim containment in an earlier paragraph wins, as in the linear scan
+            sub = idx.first_containing(b_raw)
+            if sub is not None and sub != exact and idx.before(sub, exact):
+                target, how = sub, "substring"
+            elif exact is not None:
+                target, how = exact, "exact"
+
+        if target is None:
+            i = idx.first_norm_containing(b_n, 200)
+            if i is not None:
+                target, how = i, "contained"
+
+        if target is None:
+            return self._resolve_phrase(e, e.before, e.after)
+
+        e.target, e.how = target, how
+        t = idx.text[target]
+        if how == "substring":
+            new_text = t.replace(b_raw, a_raw, 1)
+        else:
+            new_text = _whole_line_text(b_raw, a_raw, _first_run_bold(idx, target), "exact" if how == "ref" else how)
+        idx.set_text(target, new_text)
+        self._touch(e, target)
+        return True
+
+    def _resolve_add_line(self, e: Edit) -> bool:
+        anchor, new_line = e.before.strip(), e.after.strip()
+        if not anchor or not new_line:
+            return False
+        i = self.index.first_strip(anchor)
+        if i is None:
+            return False
+        e.target, e.how = i, "anchor"
+        e.new_id = self.index.insert_after(i, _labeled(new_line) if ":" in new_line else new_line)
+        return True
+
+    def _resolve_delete_line(self, e: Edit) -> bool:
+        t = e.before.strip()
+        if not t:
+            return False
+        i = self.index.first_strip(t)
+        if i is None:
+            return False
+        e.target, e.how = i, "exact"
+        self.index.delete(i)
+        self._touch(e, i)
+        return True
+
+    # -- public
+    def add(self, n: int, proposal: Dict[str, Any]) -> Edit:
+        op = proposal.get("op", "?")
+        before = proposal.get("before", [])
+        after = proposal.get("after", [])
+        b = before[0] if isinstance(before, list) and before else ""
+        a = after[0] if isinstance(after, list) and after else ""
+        e = Edit(n=n, proposal=proposal, op=op, before=b or "", after=a or "")
+
+        if op == "REPLACE_LINE":
+            ok = self._resolve_replace_line(e)
+            miss = lambda: self._conflict(n_text=norm(e.before))
+        elif op == "ADD_LINE":
+            ok = self._resolve_add_line(e)
+            miss = lambda: self._conflict(strip_text=e.before.strip())
+        elif op == "DELETE_LINE":
+            ok = self._resolve_delete_line(e)
+            miss = lambda: self._conflict(strip_text=e.before.strip())
+        elif op == "REPLACE_PHRASE":
+            ok = self._resolve_phrase(e, e.before, e.after)
+            miss = lambda: NOT_FOUND
+        else:
+            e.error = f"Unsupported op: {op}"
+            self.edits.append(e)
+            return e
+        if not ok:
+            e.error = miss()
+        self.edits.append(e)
+        return e
+
+    def apply(self) -> int:
+        """Apply every resolved edit to the document, in proposal order. Returns count."""
+        paras = dict(self.index.paras)
+        applied = 0
+        for e in self.edits:
+            if not e.ok:
+                continue
+            p = paras[e.target]
+            if e.op == "ADD_LINE":
+                paras[e.new_id] = _add_after(p, e.after.strip())
+            elif e.op == "DELETE_LINE":
+                _delete(p)
+            elif e.how == "phrase":
+                _replace_substring(p, e.before, e.after)
+            elif e.how == "substring":
+                _replace_substring(p, e.before.strip(), e.after.strip())
+            elif e.how == "contained":
+                _replace_contained(p, e.after.strip())
+            else:
+                _replace_whole(p, e.before.strip(), e.after.strip())
+            applied += 1
+        return applied
+
+
+def plan_edits(doc, proposals: List[Dict[str, Any]], refs: Optional[Dict[str, Dict[str, str]]] = None) -> EditPlan:
+    plan = EditPlan(doc, refs)
+    for n, pr in enumerate(proposals, start=1):
+        plan.add(n, pr)
+    return plan
+
+
+# --- paragraph mutations (formatting-preserving) --------------------------------
+
+def _copy_fmt(tpl, run) -> None:
+    run.bold = tpl.bold
+    run.italic = tpl.italic
+    run.underline = tpl.underline
+    if tpl.font is not None:
+        run.font.name = tpl.font.name
+        run.font.size = tpl.font.size
+
+def _clear_runs(para):
+    tpl = para.runs[0] if para.runs else None
+    for r in list(para.runs):
+        r.text = ""
+    return tpl
+
+def _add_label_runs(para, a_raw: str, tpl) -> None:
+    label, rest = a_raw.split(":", 1)
+    r0 = para.add_run(label.strip() + ":")
+    r0.bold = True
+    r1 = para.add_run(" " + rest.strip())
+    r1.bold = False
+    # Preserve template font for both runs to avoid style drift
+    if tpl is not None and tpl.font is not None:
+        for rr in (r0, r1):
+            rr.font.name = tpl.font.name
+            rr.font.size = tpl.font.size
+
+def _replace_whole(para, b_raw: str, a_raw: str) -> None:
+    """Paragraph equals `before` (normalized): replace its whole text."""
+    # SKILLS lines often use 2 runs (bold label + normal values); keep that structure.
+    if len(para.runs) == 2:
+        r0, r1 = para.runs[0], para.runs[1]
+        r0_text = (r0.text or "").strip()
+        if (r0.bold is True) and ((r1.bold is False) or (r1.bold is None)) and r0_text.endswith(":") and (":" in a_raw):
+            label, rest = a_raw.split(":", 1)
+            r0.text = label.strip() + ":"
+            r1.text = " " + rest.strip()
+            return
+    tpl = _clear_runs(para)
+    # labeled before + labeled after -> bold label run + plain values run
+    if ":" in b_raw and ":" in a_raw:
+        _add_label_runs(para, a_raw, tpl)
+        return
+    r_new = para.add_run(a_raw)
+    if tpl is not None:
+        _copy_fmt(tpl, r_new)
+
+def _replace_substring(para, b: str, a: str) -> None:
+    """`before` occurs verbatim in the paragraph: per-run replace, else rebuild."""
+    for r in para.runs:
+        if b in r.text:
+            r.text = r.text.replace(b, a, 1)
+            return
+    # spans runs -> rebuild paragraph using first run formatting
+    new_text = (para.text or "").replace(b, a, 1)
+    tpl = _clear_runs(para)
+    r2 = para.add_run(new_text)
+    if tpl is not None:
+        _copy_fmt(tpl, r2)
+
+def _replace_contained(para, a_raw: str) -> None:
+    """Short paragraph containing `before` after normalization: replace whole text."""
+    tpl = _clear_runs(para)
+    if tpl is not None and (tpl.bold is True) and (":" in a_raw):
+        _add_label_runs(para, a_raw, tpl)
+        return
+    r3 = para.add_run(a_raw)
+    if tpl is not None:
+        _copy_fmt(tpl, r3)
+
+def _add_after(para, new_line: str):
+    """
+    Insert new_line after `para` by CLONING its XML, preserving all formatting
+    (indent/tab stops/table cell context/run styles). Returns the new Paragraph.
+    """
+    from docx.text.paragraph import Paragraph
+
+    new_p = copy.deepcopy(para._p)
+    para._p.addnext(new_p)
+    new_para = Paragraph(new_p, para._parent)
+
+    for r in list(new_para.runs):
+        r.text = ""
+
+    # Refill using the template's common 2-run pattern: bold label + normal values
+    if ":" in new_line:
+        label, rest = new_line.split(":", 1)
+        label = label.strip() + ":"
+        rest = " " + rest.strip()
+        if len(new_para.runs) >= 2:
+            r0, r1 = new_para.runs[0], new_para.runs[1]
+            r0.text = label
+            r0.bold = True  # force label bold (matches SKILLS rows)
+            r1.text = rest
+            if r1.bold is True:
+                r1.bold = False
+            if r0.font is not None:
+                r1.font.name = r0.font.name
+                r1.font.size = r0.font.size
+        else:
+            r0 = new_para.add_run(label)
+            r0.bold = True
+            r1 = new_para.add_run(rest)
+            r1.bold = False
+    else:
+        if new_para.runs:
+            new_para.runs[0].text = new_line
+        else:
+            new_para.add_run(new_line)
+    return new_para
+
+def _delete(para) -> None:
+    p_elm = para._p
+    parent = p_elm.getparent()
+    if parent is not None:
+        parent.remove(p_elm)
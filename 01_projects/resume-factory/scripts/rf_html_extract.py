@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+# -----------------------------------------------------------------------------
+# Single-pass HTML extraction (title + clean text + JSON-LD JobPosting)
+# -----------------------------------------------------------------------------
+#
+# Backends (first available wins; override with backend="bs4"):
+#   - lxml : C parser (libxml2), one iterative tree walk
+#   - bs4  : BeautifulSoup(html.parser), pure-Python fallback
+#
+# Text semantics match the original html_to_text(): script/style/noscript
+# contents dropped, every text node on its own line, lines stripped, blanks removed.
+
+SKIP_TAGS = {"script", "style", "noscript"}
+
+def _has_lxml() -> bool:
+    try:
+        import lxml.html  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+def available_backends() -> List[str]:
+    return (["lxml"] if _has_lxml() else []) + ["bs4"]
+
+
+def _clean_lines(parts: List[str]) -> str:
+    out = []
+    for chunk in parts:
+        for ln in chunk.splitlines():
+            ln = ln.strip()
+            if ln:
+                out.append(ln)
+    return "\n".join(out)
+
+
+def _find_job_posting(obj: Any) -> Optional[Dict[str, Any]]:
+    """
+    Depth-first search for the first JSON-LD node typed JobPosting
+    (handles top-level lists and @graph containers).
+    """
+    if isinstance(obj, list):
+        for it in obj:
+            jp = _find_job_posting(it)
+            if jp is not None:
+                return jp
+        return None
+    if not isinstance(obj, dict):
+        return None
+    t = obj.get("@type")
+    types = t if isinstance(t, list) else [t]
+    if "JobPosting" in types:
+        return obj
+    if "@graph" in obj:
+        return _find_job_posting(obj["@graph"])
+    return None
+
+def _parse_ld_blocks(blocks: List[str]) -> Optional[Dict[str, Any]]:
+    for raw in blocks:
+        raw = (raw or "").strip()
+        if not raw:
+            continue
+        try:
+            data = json.loads(raw)
+        except Exception:
+            # some boards wrap JSON-LD in HTML comments / CDATA
+            raw2 = raw.replace("<!--", "").replace("-->", "").replace("//<![CDATA[", "").replace("//]]>", "")
+            try:
+                data = json.loads(raw2)
+            except Exception:
+                continue
+        jp = _find_job_posting(data)
+        if jp is not None:
+            return jp
+    return None
+
+
+def _extract_lxml(html: str) -> Dict[str, Any]:
+    from lxml import html as lhtml
+
+    root = lhtml.document_fromstring(html)
+
+    title: Optional[str] = None
+    ld_blocks: List[str] = []
+    parts: List[str] = []
+
+    # Iterative DFS: (element, entering). Tails are emitted on exit so text order
+    # matches document order; skipped subtrees still contribute their tail.
+    stack = [(root, True)]
+    while stack:
+        el, entering = stack.pop()
+        if not entering:
+            if el.tail:
+                parts.append(el.tail)
+            continue
+
+        tag = el.tag
+        if not isinstance(tag, str):
+            # comment / processing instruction: ignore its text, keep its tail
+            if el.tail:
+                parts.append(el.tail)
+            continue
+
+        tag = tag.lower()
+        if tag in SKIP_TAGS:
+            if tag == "script" and (el.get("type") or "").strip().lower() == "application/ld+json":
+                ld_blocks.append(el.text or "")
+            stack.append((el, False))
+            continue
+
+        if tag == "title" and title is None and len(el) == 0 and el.text:
+            title = el.text.strip() or None
+
+        if el.text:
+            parts.append(el.text)
+        stack.append((el, False))
+        for ch in reversed(el):
+            stack.append((ch, True))
+
+    return {
+        "title": title,
+        "text": _clean_lines(parts),
+        "job_posting": _parse_ld_blocks(ld_blocks),
+        "backend": "lxml",
+    }
+
+
+def _extract_bs4(html: str) -> Dict[str, Any]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    title = None
+    if soup.title and soup.title.string:
+        title = soup.title.string.strip()
+
+    ld_blocks = [
+        s.string or s.get_text()
+        for s in soup.find_all("script", attrs={"type": lambda v: (v or "").strip().lower() == "application/ld+json"})
+    ]
+    for tag in soup(list(SKIP_TAGS)):
+        tag.decompose()
+    text = soup.get_text("\n")
+
+    return {
+        "title": title,
+        "text": _clean_lines([text]),
+        "job_posting": _parse_ld_blocks(ld_blocks),
+        "backend": "bs4",
+    }
+
+
+def extract_page(html: str, backend: str = "auto") -> Dict[str, Any]:
+    """
+    Parse html ONCE and return:
+      title        (str|None)  <title> text
+      text         (str)       cleaned visible text, one line per text node
+      job_posting  (dict|None) first JSON-LD JobPosting object, raw
+      backend      (str)       parser actually used
+    """
+    html = html or ""
+    if backend in ("auto", "lxml") and _has_lxml():
+        try:
+            return _extract_lxml(html)
+        except Exception:
+            # empty/garbled documents: libxml2 refuses, html.parser copes
+            if backend == "lxml":
+                raise
+    return _extract_bs4(html)
+
+
+def job_posting_fields(jp: Optional[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """
+    Flatten the JobPosting fields intake cares about: role_title, company, location.
+    """
+    if not isinstance(jp, dict):
+        return {"role_title": None, "company": None, "location": None}
+
+    def s(v) -> Optional[str]:
+        return v.strip() if isinstance(v, str) and v.strip() else None
+
+    org = jp.get("hiringOrganization")
+    if isinstance(org, list):
+        org = org[0] if org else None
+    company = s(org.get("name")) if isinstance(org, dict) else s(org)
+
+    loc = jp.get("jobLocation")
+    if isinstance(loc, list):
+        loc = loc[0] if loc else None
+    location = None
+    if isinstance(loc, dict):
+        addr = loc.get("address")
+        if isinstance(addr, dict):
+            bits = [s(addr.get(k)) for k in ("addressLocality", "addressRegion", "addressCountry")]
+            location = ", ".join(b for b in bits if b) or None
+        else:
+            location = s(addr)
+    if location is None and str(jp.get("jobLocationType") or "").upper() == "TELECOMMUTE":
+        location = "Remote"
+
+    return {"role_title": s(jp.get("title")), "company": company, "location": location}
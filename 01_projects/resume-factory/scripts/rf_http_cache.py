@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# -----------------------------------------------------------------------------
+# Shared HTTP session + on-disk response cache (conditional GETs)
+# -----------------------------------------------------------------------------
+#
+# Layout: <cache_dir>/<sha256(url)>.json, one entry per URL:
+#   { url, status, etag, last_modified, encoding, fetched_at, validated_at, body }
+#
+# Policy:
+#   - validated within TTL        -> served from disk, no network
+#   - older than TTL              -> conditional GET (If-None-Match / If-Modified-Since);
+#                                    304 refreshes validated_at and serves the cached body
+#   - older than MAX_AGE_DAYS     -> evicted
+#   - cache larger than MAX_MB    -> least-recently-used entries evicted (mtime = last use)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    v = os.environ.get(name)
+    return v if (v is not None and v != "") else default
+
+def cache_dir() -> Path:
+    d = _env("RF_HTTP_CACHE_DIR", os.path.expanduser("~/secondbrain/07_system/cache/http"))
+    return Path(d)
+
+def _ttl_s() -> float:
+    return float(_env("RF_HTTP_CACHE_TTL_S", str(24 * 3600)))
+
+def _max_age_s() -> float:
+    return float(_env("RF_HTTP_CACHE_MAX_AGE_DAYS", "30")) * 86400
+
+def _max_bytes() -> int:
+    return int(float(_env("RF_HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_pruned = False
+
+def get_session() -> requests.Session:
+    """
+    One pooled keep-alive session per process (safe to share across the intake worker threads).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            s.headers.update(DEFAULT_HEADERS)
+            _session = s
+        return _session
+
+
+def _key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+def _entry_path(url: str) -> Path:
+    return cache_dir() / f"{_key(url)}.json"
+
+def _read_entry(url: str) -> Optional[Dict[str, Any]]:
+    p = _entry_path(url)
+    try:
+        d = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(d, dict) or d.get("url") != url or not isinstance(d.get("body"), str):
+        return None
+    return d
+
+def _write_entry(url: str, entry: Dict[str, Any]) -> None:
+    p = _entry_path(url)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    # atomic replace: concurrent workers never see a half-written entry
+    tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, p)
+
+def _touch(url: str) -> None:
+    try:
+        os.utime(_entry_path(url))
+    except OSError:
+        pass
+
+
+def prune(max_age_s: Optional[float] = None, max_bytes: Optional[int] = None) -> Dict[str, int]:
+    """
+    Evict entries older than max_age_s, then LRU-evict until the cache fits max_bytes.
+    Returns {"kept": n, "evicted": n, "bytes": n}.
+    """
+    d = cache_dir()
+    if not d.is_dir():
+        return {"kept": 0, "evicted": 0, "bytes": 0}
+    max_age_s = _max_age_s() if max_age_s is None else max_age_s
+    max_bytes = _max_bytes() if max_bytes is None else max_bytes
+
+    now = time.time()
+    evicted = 0
+    live = []
+    for p in d.glob("*.json"):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if now - st.st_mtime > max_age_s:
+            p.unlink(missing_ok=True)
+            evicted += 1
+            continue
+        live.append((st.st_mtime, st.st_size, p))
+
+    total = sum(sz for _, sz, _ in live)
+    live.sort()  # oldest use first
+    while live and total > max_bytes:
+        _, sz, p = live.pop(0)
+        p.unlink(missing_ok=True)
+        total -= sz
+        evicted += 1
+    return {"kept": len(live), "evicted": evicted, "bytes": total}
+
+def _prune_once() -> None:
+    global _pruned
+    with _session_lock:
+        if _pruned:
+            return
+        _pruned = True
+    try:
+        prune()
+    except Exception:
+        # never break intake due to cache housekeeping
+        pass
+
+
+def cached_get_text(url: str, timeout: int = 30, verify_ssl: bool = True, use_cache: bool = True) -> str:
+    """
+    GET url through the shared session and return decoded text.
+    With use_cache, fresh entries cost no network and stale ones are revalidated
+    with a conditional GET. Raises requests.HTTPError on non-2xx (as raise_for_status()).
+    """
+    session = get_session()
+    if not use_cache:
+        r = session.get(url, timeout=timeout, verify=verify_ssl)
+        r.raise_for_status()
+        r.encoding = r.encoding or "utf-8"
+        return r.text
+
+    _prune_once()
+    entry = _read_entry(url)
+    now = time.time()
+
+    if entry is not None and now - float(entry.get("validated_at") or 0) < _ttl_s():
+        _touch(url)
+        return entry["body"]
+
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    r = session.get(url, headers=headers, timeout=timeout, verify=verify_ssl)
+
+    if r.status_code == 304 and entry is not None:
+        entry["validated_at"] = now
+        _write_entry(url, entry)
+        return entry["body"]
+
+    r.raise_for_status()
+    # requests will guess encoding; keep forgiving decode
+    r.encoding = r.encoding or "utf-8"
+    text = r.text
+    _write_entry(url, {
+        "url": url,
+        "status": r.status_code,
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "encoding": r.encoding,
+        "fetched_at": now,
+        "validated_at": now,
+        "body": text,
+    })
+    return text
@@ -3,11 +3,13 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
-from openai import OpenAI
 from openai import RateLimitError, AuthenticationError
 
+from rf_llm_cache import offline as _llm_offline, response_text, response_text_async
+from rf_openai_pool import get_async_client, get_client
+
 
 def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     v = os.environ.get(name)
@@ -21,16 +23,14 @@ def _require(name: str) -> str:
     return v
 
 
-def ideal_profile_openai(
+def _ideal_profile_request(
     *,
     jd_raw: str,
-    keyword_scout: Optional[Dict[str, Any]] = None,
-    model: Optional[str] = None,
-    timeout_s: int = 90,
-    extra_instructions: str = "",
+    keyword_scout: Optional[Dict[str, Any]],
+    model: Optional[str],
+    extra_instructions: str,
 ) -> Dict[str, Any]:
-    _require("OPENAI_API_KEY")
-    client = OpenAI(timeout=timeout_s)
+    """responses.create() kwargs for one ideal-profile call (shared by sync/async paths)."""
     model = model or _env("RF_IDEAL_PROFILE_MODEL", "gpt-4o-mini")
 
     system_prompt = """You are Resume Factory - Ideal Profile Generator.
@@ -73,67 +73,128 @@ EXTRA INSTRUCTIONS:
 TASK:
 Return the JSON contract only."""
 
-    def _repair_json_once(bad_text: str) -> str:
-        repair_system = """You are a JSON repair bot.
+    return {
+        "model": model,
+        "input": [
+            {"role": "system", "content": system_prompt.strip()},
+            {"role": "user", "content": user_prompt.strip()},
+        ],
+    }
+
+def _repair_request(model: str, bad_text: str) -> Dict[str, Any]:
+    repair_system = """You are a JSON repair bot.
 RULES:
 - Output STRICT JSON ONLY.
 - Do NOT add or remove items.
 - Do NOT change meaning.
 - Fix syntax only.
 """
-        repair_user = f"""Fix this into valid JSON (syntax repair only):
+    repair_user = f"""Fix this into valid JSON (syntax repair only):
 
 {bad_text}
 """
-        r = client.responses.create(
-            model=model,
-            input=[
-                {"role": "system", "content": repair_system.strip()},
-                {"role": "user", "content": repair_user.strip()},
-            ],
-        )
-        out = ""
-        for o in r.output:
-            for c in o.content:
-                if c.type == "output_text":
-                    out += c.text
-        out = out.strip()
-        m = re.match(r"^```(?:json)?\s*(.*?)\s*```$", out, flags=re.DOTALL | re.IGNORECASE)
-        return m.group(1).strip() if m else out
+    return {
+        "model": model,
+        "input": [
+            {"role": "system", "content": repair_system.strip()},
+            {"role": "user", "content": repair_user.strip()},
+        ],
+    }
+
+def _strip_fences(text: str) -> str:
+    t = (text or "").strip()
+    m = re.match(r"^```(?:json)?\s*(.*?)\s*```$", t, flags=re.DOTALL | re.IGNORECASE)
+    return m.group(1).strip() if m else t
 
+def _parse_or_none(text: str) -> Optional[Any]:
+    t = text.strip()
+    if not t:
+        raise RuntimeError("Empty OpenAI response")
     try:
-        resp = client.responses.create(
-            model=model,
-            input=[
-                {"role": "system", "content": system_prompt.strip()},
-                {"role": "user", "content": user_prompt.strip()},
-            ],
-        )
+        return json.loads(_strip_fences(t))
+    except json.JSONDecodeError:
+        return None
+
+def _finish(data: Any) -> Dict[str, Any]:
+    if not isinstance(data, dict):
+        raise RuntimeError("Top-level JSON must be an object")
+    return data
+
+
+def _cacheable(accept: Optional[Callable[[Dict[str, Any]], bool]]) -> Callable[[str], bool]:
+    """validate= for response_text: the text parses to an object and, if given, accept(data) holds."""
+    def ok(text: str) -> bool:
+        data = _parse_or_none(text)
+        return data is not None and (accept is None or bool(accept(_finish(data))))
+    return ok
+
+
+def ideal_profile_openai(
+    *,
+    jd_raw: str,
+    keyword_scout: Optional[Dict[str, Any]] = None,
+    model: Optional[str] = None,
+    timeout_s: int = 90,
+    extra_instructions: str = "",
+    accept: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Dict[str, Any]:
+    if not _llm_offline():
+        _require("OPENAI_API_KEY")
+
+    def _client():
+        return get_client(timeout_s)
+
+    req = _ideal_profile_request(
+        jd_raw=jd_raw, keyword_scout=keyword_scout, model=model, extra_instructions=extra_instructions,
+    )
+    try:
+        text = response_text(_client, label="ideal_profile", validate=_cacheable(accept), **req)
     except AuthenticationError as e:
         raise RuntimeError("OpenAI auth failed.") from e
     except RateLimitError as e:
         raise RuntimeError("OpenAI rate limit or quota error.") from e
 
-    text = ""
-    for o in resp.output:
-        for c in o.content:
-            if c.type == "output_text":
-                text += c.text
-    t = text.strip()
-    if not t:
-        raise RuntimeError("Empty OpenAI response")
+    data = _parse_or_none(text)
+    if data is None:
+        fixed = response_text(
+            _client, label="ideal_profile.repair", validate=_cacheable(accept), **_repair_request(req["model"], text)
+        )
+        data = json.loads(_strip_fences(fixed))
+    return _finish(data)
 
-    m = re.match(r"^```(?:json)?\s*(.*?)\s*```$", t, flags=re.DOTALL | re.IGNORECASE)
-    if m:
-        t = m.group(1).strip()
 
+async def ideal_profile_openai_async(
+    *,
+    jd_raw: str,
+    keyword_scout: Optional[Dict[str, Any]] = None,
+    model: Optional[str] = None,
+    timeout_s: int = 90,
+    extra_instructions: str = "",
+    accept: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Dict[str, Any]:
+    """
+    ideal_profile_openai() on the pooled AsyncOpenAI client (for asyncio.gather fan-out).
+    """
+    if not _llm_offline():
+        _require("OPENAI_API_KEY")
+
+    def _client():
+        return get_async_client(timeout_s)
+
+    req = _ideal_profile_request(
+        jd_raw=jd_raw, keyword_scout=keyword_scout, model=model, extra_instructions=extra_instructions,
+    )
     try:
-        data = json.loads(t)
-    except json.JSONDecodeError:
-        fixed = _repair_json_once(text)
-        data = json.loads(fixed)
-
-    if not isinstance(data, dict):
-        raise RuntimeError("Top-level JSON must be an object")
+        text = await response_text_async(_client, label="ideal_profile", validate=_cacheable(accept), **req)
+    except AuthenticationError as e:
+        raise RuntimeError("OpenAI auth failed.") from e
+    except RateLimitError as e:
+        raise RuntimeError("OpenAI rate limit or quota error.") from e
 
-    return data
+    data = _parse_or_none(text)
+    if data is None:
+        fixed = await response_text_async(
+            _client, label="ideal_profile.repair", validate=_cacheable(accept), **_repair_request(req["model"], text)
+        )
+        data = json.loads(_strip_fences(fixed))
+    return _finish(data)
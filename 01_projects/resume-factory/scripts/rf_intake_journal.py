@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# -----------------------------------------------------------------------------
+# Append-only NDJSON journal for job-intake-batch --urls-file
+# -----------------------------------------------------------------------------
+#
+# Lives next to the URL file: <urls-file>.journal.ndjson. One JSON object per line:
+#   {"ts": ..., "url": ..., "stage": "fetched|parsed|validated|written", "ok": bool,
+#    "detail": str|null, "data": {...}|null, "path": str|null}
+# plus {"ts": ..., "stage": "run", ...} markers at the start of each run.
+#
+# "parsed" records carry the scraped payload (page title, provisional fields,
+# description), so a resumed run re-uses it instead of re-fetching / re-paying the
+# AI parse. The latest record per URL wins; a torn last line (crash mid-write) is ignored.
+
+STAGES = ("fetched", "parsed", "validated", "written")
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def journal_path(urls_file: str) -> Path:
+    p = Path(urls_file).expanduser()
+    return p.with_name(p.name + ".journal.ndjson")
+
+
+class IntakeJournal:
+    """
+    Thread-safe appender (fetches are recorded from the scrape worker threads).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._fh = self.path.open("a", encoding="utf-8")
+        if self.path.stat().st_size > 0:
+            with self.path.open("rb") as fh:
+                fh.seek(-1, 2)
+                torn = fh.read(1) != b"\n"
+            if torn:
+                # previous run died mid-line; start ours on a fresh one
+                self._fh.write("\n")
+
+    def _append(self, rec: Dict[str, Any]) -> None:
+        line = json.dumps(rec, ensure_ascii=False)
+        with self._lock:
+            self._fh.write(line + "\n")
+            # flush per record: an interrupted run loses at most the in-flight URL
+            self._fh.flush()
+
+    def start_run(self, **fields: Any) -> None:
+        self._append({"ts": _utc_now_iso(), "stage": "run", **fields})
+
+    def record(self, url: str, stage: str, ok: bool = True, detail: Optional[str] = None,
+               data: Optional[Dict[str, Any]] = None, path: Optional[str] = None) -> None:
+        if stage not in STAGES:
+            raise ValueError(f"unknown journal stage: {stage}")
+        self._append({"ts": _utc_now_iso(), "url": url, "stage": stage, "ok": bool(ok),
+                      "detail": detail, "data": data, "path": path})
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+def load_states(path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Replay the journal into per-URL state:
+      { url: {"stage": last stage, "ok": bool, "detail": ..., "path": ..., "data": last parsed payload} }
+    """
+    states: Dict[str, Dict[str, Any]] = {}
+    path = Path(path)
+    if not path.exists():
+        return states
+    with path.open(encoding="utf-8", errors="ignore") as fh:
+        for line in fh:
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue
+            url = rec.get("url") if isinstance(rec, dict) else None
+            if not url or rec.get("stage") not in STAGES:
+                continue
+            st = states.setdefault(url, {"data": None})
+            st.update(stage=rec["stage"], ok=bool(rec.get("ok")), detail=rec.get("detail"), path=rec.get("path"))
+            if rec["stage"] == "parsed":
+                # a failed re-parse invalidates the earlier payload (never reuse stale data)
+                ok_data = rec.get("ok") and isinstance(rec.get("data"), dict)
+                st["data"] = rec["data"] if ok_data else None
+    return states
+
+
+def resume_action(state: Optional[Dict[str, Any]]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Decide what a resumed run does with one URL:
+      ("done",  None)  written successfully (CREATED / SKIPPED) -> nothing to do
+      ("reuse", data)  parsed payload on record -> validate + write only
+      ("redo",  None)  never parsed, failed to fetch/parse, or failed validation -> scrape again
+    """
+    if not state:
+        return "redo", None
+    if state.get("stage") == "written" and state.get("ok"):
+        return "done", None
+    if state.get("stage") == "validated" and not state.get("ok"):
+        # the page itself was unusable; fetch it fresh in case it changed
+        return "redo", None
+    if state.get("data") is not None:
+        return "reuse", state["data"]
+    return "redo", None
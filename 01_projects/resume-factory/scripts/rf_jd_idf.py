@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rf_jd_terms import TERMS_VERSION, extract_jd_terms, term_table
+from rf_jobs_index import iter_app_dirs, jobs_root
+from rf_skill_taxonomy import load_taxonomy, taxonomy_path
+
+# -----------------------------------------------------------------------------
+# Corpus document frequencies for JD terms (SQLite sidecar under 01_projects/jobs)
+# -----------------------------------------------------------------------------
+#
+# For every jd/jd-raw.txt under the jobs root the index keeps the terms
+# rf_jd_terms extracts (uncapped, with their in-JD counts) plus one running
+# document-frequency table. refresh() stats every JD and re-extracts only the
+# ones whose mtime/size changed (added, edited, removed JDs adjust df in place),
+# so keeping it current costs one stat per app folder.
+#
+# CorpusIdf turns the table into BM25 weights: extract_jd_terms(..., idf=...)
+# then ranks terms by how distinctive they are for this posting rather than by
+# raw frequency, and drops terms most postings carry ("agile", "api" ...).
+# Only taxonomy terms, or terms at least MIN_DF postings carry, get their idf:
+# a token seen in one posting ("klap6", a name, "functional/integration") would
+# otherwise get the highest weight of all, so it is scored with NEUTRAL_IDF.
+# distinctive_terms() is the entry point the prompt builders use.
+#
+# The index is a cache: deleting the file is always safe. It is rebuilt when the
+# skill taxonomy or the extraction (TERMS_VERSION) changes.
+#
+# Env:
+#   RF_JD_IDF           on (default) | off  -> off = plain frequency ranking
+#   RF_JD_IDF_MIN_DOCS  corpus size below which IDF is not used (default 10)
+#   RF_JD_IDF_MAX_DF    share of postings at which a term counts as boilerplate (default 0.8)
+
+INDEX_NAME = ".jd-idf.sqlite"
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key         TEXT PRIMARY KEY,
+    value       TEXT
+);
+CREATE TABLE IF NOT EXISTS docs (
+    rel         TEXT PRIMARY KEY,   -- <family>/<company>/<date>_<role>
+    jd_mtime    INTEGER NOT NULL,   -- jd/jd-raw.txt st_mtime_ns
+    jd_size     INTEGER NOT NULL,
+    length      INTEGER NOT NULL    -- tokens (BM25 document length)
+);
+CREATE TABLE IF NOT EXISTS doc_terms (
+    rel         TEXT NOT NULL,
+    term        TEXT NOT NULL,
+    tf          INTEGER NOT NULL,
+    PRIMARY KEY (rel, term)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS df (
+    term        TEXT PRIMARY KEY,
+    n           INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+K1, B = 1.2, 0.75
+MIN_DF = 2
+NEUTRAL_IDF = math.log(2.0)  # about the idf of a term half the postings carry
+
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    v = os.environ.get(name)
+    return v if (v is not None and v != "") else default
+
+def enabled() -> bool:
+    return (_env("RF_JD_IDF", "on") or "on").strip().lower() not in ("off", "0", "false", "no")
+
+def _min_docs() -> int:
+    return int(_env("RF_JD_IDF_MIN_DOCS", "10"))
+
+def _max_df() -> float:
+    return float(_env("RF_JD_IDF_MAX_DF", "0.8"))
+
+def default_root() -> Path:
+    return Path.home() / "secondbrain"
+
+def index_path(root: Path) -> Path:
+    return jobs_root(root) / INDEX_NAME
+
+
+def _fingerprint() -> str:
+    """What the stored terms depend on: extraction version + taxonomy file content."""
+    h = hashlib.sha256(f"{TERMS_VERSION}\n".encode())
+    h.update(taxonomy_path().read_bytes())
+    return h.hexdigest()
+
+def _stale(conn: sqlite3.Connection, fp: str) -> bool:
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        return True
+    row = conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+    return row is None or row[0] != fp
+
+def open_index(root: Path) -> sqlite3.Connection:
+    """
+    Open (creating if needed) the JD term index for a secondbrain root. A schema
+    version mismatch, or terms extracted with another taxonomy / TERMS_VERSION,
+    drops the tables (the next refresh rebuilds them).
+    """
+    p = index_path(root)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(p), timeout=30)
+    fp = _fingerprint()
+    if _stale(conn, fp):
+        with conn:
+            # two processes rebuilding at once take turns; the second finds it done
+            conn.execute("BEGIN IMMEDIATE")
+            if _stale(conn, fp):
+                for t in ("meta", "docs", "doc_terms", "df"):
+                    conn.execute(f"DROP TABLE IF EXISTS {t}")
+                # statement by statement: executescript() would commit the transaction
+                for stmt in _SCHEMA.split(";"):
+                    if stmt.strip():
+                        conn.execute(stmt)
+                conn.execute("INSERT INTO meta(key, value) VALUES ('fingerprint', ?)", (fp,))
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def _stat(p: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(p)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size) if st.st_size else None
+
+def _drop_doc(conn: sqlite3.Connection, rel: str) -> None:
+    conn.execute("UPDATE df SET n = n - 1 WHERE term IN (SELECT term FROM doc_terms WHERE rel = ?)", (rel,))
+    conn.execute("DELETE FROM doc_terms WHERE rel = ?", (rel,))
+    conn.execute("DELETE FROM docs WHERE rel = ?", (rel,))
+
+def refresh(conn: sqlite3.Connection, root: Path) -> Dict[str, int]:
+    """
+    Bring the index in line with the tree. Only JDs whose jd-raw.txt mtime/size
+    changed are re-extracted; vanished or emptied JDs are dropped.
+    Returns {"scanned": n, "updated": n, "removed": n}.
+    """
+    tax = load_taxonomy()
+    scanned = updated = 0
+    seen = set()
+    with conn:
+        # the read of docs and the writes share one write transaction, so a concurrent
+        # refresh (another process indexing the same new JD) waits and then sees it
+        conn.execute("BEGIN IMMEDIATE")
+        known: Dict[str, Tuple[int, int]] = {
+            rel: (mt, sz) for rel, mt, sz in conn.execute("SELECT rel, jd_mtime, jd_size FROM docs")
+        }
+        for rel, _fam, app in iter_app_dirs(jobs_root(root)):
+            jd_p = app / "jd" / "jd-raw.txt"
+            st = _stat(jd_p)
+            if st is None:
+                continue
+            scanned += 1
+            seen.add(rel)
+            if known.get(rel) == st:
+                continue
+            if rel in known:
+                _drop_doc(conn, rel)
+            try:
+                tt = term_table(jd_p.read_text(errors="ignore"), tax)
+            except OSError:
+                seen.discard(rel)
+                continue
+            terms = tt.promoted + tt.ranked
+            conn.execute("INSERT INTO docs(rel, jd_mtime, jd_size, length) VALUES (?,?,?,?)", (rel, *st, tt.length))
+            conn.executemany("INSERT INTO doc_terms(rel, term, tf) VALUES (?,?,?)", [(rel, t, tt.tf[t]) for t in terms])
+            conn.executemany("INSERT INTO df(term, n) VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET n = n + 1",
+                             [(t,) for t in terms])
+            updated += 1
+        gone = [rel for rel in known if rel not in seen]
+        for rel in gone:
+            _drop_doc(conn, rel)
+        conn.execute("DELETE FROM df WHERE n <= 0")
+    return {"scanned": scanned, "updated": updated, "removed": len(gone)}
+
+
+class CorpusIdf:
+    """Read-only snapshot of the corpus statistics, with TF-IDF / BM25 weights."""
+
+    def __init__(self, n_docs: int, avgdl: float, df: Dict[str, int],
+                 max_df: Optional[float] = None, min_docs: Optional[int] = None):
+        self.n_docs = n_docs
+        self.avgdl = avgdl or 1.0
+        self.df = df
+        self.max_df = _max_df() if max_df is None else max_df
+        self.min_docs = _min_docs() if min_docs is None else min_docs
+
+    @classmethod
+    def from_index(cls, conn: sqlite3.Connection) -> "CorpusIdf":
+        n, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+        df = dict(conn.execute("SELECT term, n FROM df"))
+        return cls(n, total / n if n else 1.0, df)
+
+    def idf(self, term: str) -> float:
+        """BM25 idf (always > 0; unseen terms get the highest weight)."""
+        n = self.df.get(term, 0)
+        return math.log(1.0 + (self.n_docs - n + 0.5) / (n + 0.5))
+
+    def tfidf(self, term: str, tf: int) -> float:
+        return tf * self.idf(term)
+
+    def bm25(self, term: str, tf: int, length: int, known: bool = True) -> float:
+        """BM25 weight; known=False (not a taxonomy term) uses NEUTRAL_IDF below MIN_DF postings."""
+        sat = tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / self.avgdl))
+        idf = self.idf(term) if known or self.df.get(term, 0) >= MIN_DF else NEUTRAL_IDF
+        return idf * sat
+
+    def is_common(self, term: str) -> bool:
+        """Boilerplate: carried by at least max_df of the postings (only once the corpus is big enough)."""
+        if self.n_docs < self.min_docs:
+            return False
+        return self.df.get(term, 0) >= self.max_df * self.n_docs
+
+
+_loaded: Dict[str, CorpusIdf] = {}
+_load_lock = threading.Lock()
+
+def load_corpus_idf(root: Optional[Path] = None) -> Optional[CorpusIdf]:
+    """
+    Corpus statistics for a secondbrain root, refreshed once per process.
+    None when RF_JD_IDF=off, the corpus is smaller than RF_JD_IDF_MIN_DOCS, or
+    the index cannot be built (callers fall back to frequency ranking).
+    """
+    if not enabled():
+        return None
+    root = Path(root) if root else default_root()
+    key = str(root)
+    with _load_lock:
+        if key not in _loaded:
+            try:
+                conn = open_index(root)
+                try:
+                    refresh(conn, root)
+                    _loaded[key] = CorpusIdf.from_index(conn)
+                finally:
+                    conn.close()
+            except (OSError, ValueError, sqlite3.Error):
+                return None
+        idf = _loaded[key]
+    return idf if idf.n_docs >= idf.min_docs else None
+
+def distinctive_terms(text: str, max_terms: int = 18, root: Optional[Path] = None) -> List[str]:
+    """JD terms for prompts: BM25-ranked against the JD corpus (frequency-ranked without one)."""
+    return extract_jd_terms(text, max_terms, idf=load_corpus_idf(root))
+
+
+def main(argv=None):
+    import argparse
+    ap = argparse.ArgumentParser(prog="rf_jd_idf.py", description="JD term document-frequency index.")
+    ap.add_argument("cmd", choices=["refresh", "top", "terms"],
+                    help="refresh the index | top: most common terms | terms: one JD's terms, tf vs BM25")
+    ap.add_argument("app", nargs="?", help="App folder (terms)")
+    ap.add_argument("--root", default=None, help="secondbrain root (default ~/secondbrain)")
+    ap.add_argument("-n", type=int, default=25, help="Rows / terms to show (default 25)")
+    args = ap.parse_args(argv)
+
+    root = Path(args.root).expanduser() if args.root else default_root()
+    conn = open_index(root)
+    st = refresh(conn, root)
+    idf = CorpusIdf.from_index(conn)
+    if args.cmd == "refresh":
+        print(f"INDEX: {index_path(root)}")
+        print(f"JDs: {st['scanned']}  updated: {st['updated']}  removed: {st['removed']}  terms: {len(idf.df)}")
+    elif args.cmd == "top":
+        print(f"{'TERM':32}  {'DF':>5}  {'IDF':>6}  (N={idf.n_docs})")
+        for term, n in sorted(idf.df.items(), key=lambda kv: (-kv[1], kv[0]))[: args.n]:
+            flag = "  common" if idf.is_common(term) else ""
+            print(f"{term:32}  {n:>5}  {idf.idf(term):>6.2f}{flag}")
+    else:
+        if not args.app:
+            ap.error("terms needs an app folder")
+        text = (Path(args.app).expanduser() / "jd" / "jd-raw.txt").read_text(errors="ignore")
+        print("TF:  ", ", ".join(extract_jd_terms(text, args.n)))
+        print("BM25:", ", ".join(extract_jd_terms(text, args.n, idf=idf)))
+    conn.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import List, Optional, Sequence, Tuple
+
+# -----------------------------------------------------------------------------
+# JD text query language (jobs-find --text)
+# -----------------------------------------------------------------------------
+#
+#   playwright python NOT cypress        implicit AND between terms
+#   "test automation" AND (java OR kotlin)
+#   selen* -"manual testing"             prefix match; -x is NOT x
+#
+# Operators AND / OR / NOT are case-insensitive (quote a term to search for the
+# word itself); NOT binds tighter than AND, AND tighter than OR. A bare term that
+# tokenizes to several tokens ("ci/cd", "node.js") is matched as a phrase.
+#
+# One parse tree, two evaluators: to_fts() renders it as an SQLite FTS5 MATCH
+# expression (every token quoted, so user input can never be FTS syntax), and
+# matches() evaluates it over tokenize()d text for the index-less scan. Both use
+# the same tokens as the FTS table (TOKENIZE: case- and accent-folded letters and
+# digits, plus '#' and '+' so c#, c++ stay tokens).
+#
+# FTS5's NOT is binary, so a NOT needs a positive term in its group; only the
+# top level may be purely negative ("NOT cypress"), which callers run as
+# "every JD except" (fts_parts()).
+
+TOKENIZE = "unicode61 tokenchars '#+'"
+
+_RE_TOKEN = re.compile(r"(?:[^\W_]|[#+])+")
+_RE_LEX = re.compile(r'\s*(?:(")((?:[^"])*)"?|([()])|(-)(?=\S)|([^\s()"]+))')
+
+Node = tuple  # ("term", tokens, prefix) | ("and", [nodes]) | ("or", [nodes]) | ("not", node)
+
+
+class QueryError(ValueError):
+    pass
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, accent-stripped tokens, as the FTS5 tokenizer (TOKENIZE) splits text."""
+    t = unicodedata.normalize("NFKD", (text or "").lower())
+    t = "".join(ch for ch in t if not unicodedata.combining(ch))
+    return _RE_TOKEN.findall(t)
+
+
+def _lex(q: str) -> List[Tuple[str, object]]:
+    out: List[Tuple[str, object]] = []
+    pos = 0
+    q = q or ""
+    while pos < len(q):
+        m = _RE_LEX.match(q, pos)
+        if not m or m.end() == pos:
+            break
+        pos = m.end()
+        if m.group(1):
+            out.append(("phrase", m.group(2)))
+        elif m.group(3):
+            out.append((m.group(3), None))
+        elif m.group(4):
+            out.append(("NOT", None))
+        elif m.group(5):
+            w = m.group(5)
+            out.append((w.upper(), None) if w.upper() in ("AND", "OR", "NOT") else ("word", w))
+    return out
+
+
+def parse(q: str) -> Node:
+    """Query string -> parse tree. Raises QueryError on empty / malformed queries."""
+    toks = _lex(q)
+    pos = 0
+
+    def peek():
+        return toks[pos][0] if pos < len(toks) else None
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return toks[pos - 1]
+
+    def p_or():
+        items = [p_and()]
+        while peek() == "OR":
+            take()
+            items.append(p_and())
+        return items[0] if len(items) == 1 else ("or", items)
+
+    def p_and():
+        items = [p_unary()]
+        while peek() not in (None, "OR", ")"):
+            if peek() == "AND":
+                take()
+            items.append(p_unary())
+        return items[0] if len(items) == 1 else ("and", items)
+
+    def p_unary():
+        if peek() == "NOT":
+            take()
+            return ("not", p_unary())
+        return p_primary()
+
+    def p_primary():
+        kind = peek()
+        if kind is None:
+            raise QueryError("query ends where a term was expected")
+        _k, val = take()
+        if kind == "(":
+            node = p_or()
+            if peek() != ")":
+                raise QueryError("missing ')'")
+            take()
+            return node
+        if kind in ("word", "phrase"):
+            text = str(val)
+            prefix = kind == "word" and text.endswith("*")
+            tokens = tokenize(text.rstrip("*") if prefix else text)
+            if not tokens:
+                raise QueryError(f"no searchable characters in {text!r}")
+            return ("term", tokens, prefix)
+        raise QueryError(f"unexpected {kind!r}")
+
+    if not toks:
+        raise QueryError("empty query")
+    node = p_or()
+    if pos != len(toks):
+        raise QueryError(f"unexpected {toks[pos][0]!r}")
+    return node
+
+
+def to_fts(node: Node) -> str:
+    """FTS5 MATCH expression. Raises QueryError for a NOT without a positive term beside it."""
+    kind = node[0]
+    if kind == "term":
+        return '"' + " ".join(node[1]) + '"' + (" *" if node[2] else "")
+    if kind == "or":
+        return "(" + " OR ".join(to_fts(n) for n in node[1]) + ")"
+    if kind == "and":
+        pos = [n for n in node[1] if n[0] != "not"]
+        neg = [n[1] for n in node[1] if n[0] == "not"]
+        if not pos:
+            raise QueryError("NOT needs a positive term in the same group")
+        expr = "(" + " AND ".join(to_fts(n) for n in pos) + ")"
+        for n in neg:
+            expr = f"{expr} NOT {to_fts(n)}"
+        return expr
+    raise QueryError("NOT needs a positive term in the same group")
+
+
+def fts_parts(node: Node) -> Tuple[Optional[str], List[str]]:
+    """
+    (match, exclude): rows must match `match` (None = every JD) and none of
+    `exclude`. Only a purely negative top level yields match=None.
+    """
+    if node[0] == "not":
+        return None, [to_fts(node[1])]
+    if node[0] == "and" and all(n[0] == "not" for n in node[1]):
+        return None, [to_fts(n[1]) for n in node[1]]
+    return to_fts(node), []
+
+
+def _has(tokens: Sequence[str], term: Sequence[str], prefix: bool) -> bool:
+    n = len(term)
+    last = n - 1
+    for i in range(len(tokens) - n + 1):
+        if all(tokens[i + j] == term[j] for j in range(last)):
+            t = tokens[i + last]
+            if t == term[last] or (prefix and t.startswith(term[last])):
+                return True
+    return False
+
+def matches(node: Node, tokens: Sequence[str]) -> bool:
+    """Evaluate the parse tree over tokenize()d text (the index-less path)."""
+    kind = node[0]
+    if kind == "term":
+        return _has(tokens, node[1], node[2])
+    if kind == "and":
+        return all(matches(n, tokens) for n in node[1])
+    if kind == "or":
+        return any(matches(n, tokens) for n in node[1])
+    return not matches(node[1], tokens)
@@ -1,26 +1,35 @@
 from __future__ import annotations
 
 import re
-from typing import List
+from collections import Counter
+from functools import lru_cache, partial
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from rf_skill_taxonomy import RE_TOKEN, Taxonomy, load_taxonomy
 
 # -----------------------------------------------------------------------------
 # JD Term Extraction (deterministic, conservative)
 # -----------------------------------------------------------------------------
+#
+# Known skills, their synonyms and canonical forms come from the skill taxonomy
+# (rf_skill_taxonomy, 03_assets/taxonomy/skills.json): aliases found in the JD
+# (phrases or single tokens) are canonicalized ("k8s" -> "kubernetes", "selenium
+# webdriver" -> "selenium") and kept unless they are stop/generic words; other
+# tokens must pass the junk filter and look like tech (see _looks_like_skill).
+# Known and other terms are ranked together by frequency; on a tie known terms
+# come first, single tokens (tools: "jira") before phrases ("test automation").
+# Only skills marked "promote" (aliases that resolve an ambiguous token: "hp alm",
+# "vb script") are placed ahead of the ranking.
+
+# Bump when the extracted terms change for the same input (rf_jd_idf rebuilds its index).
+TERMS_VERSION = 2
 
 # Known good short acronyms that are genuinely skills in QA/SDET JDs.
 ALLOW_SHORT = {"api", "qa", "sql", "rest", "soap", "svn"}
 
-# Tokens that are too ambiguous alone; only allow via phrase detection.
+# Tokens that are too ambiguous alone; only allow via taxonomy phrases.
 SUPPRESS_IF_SOLO = {"hp", "alm", "vb"}
 
-# Canonical phrases we want to promote if present in the JD (normalized text).
-PHRASES = [
-    ("hp alm", {"hp", "alm"}),
-    ("micro focus alm", {"alm"}),
-    ("vbscript", {"vb"}),
-    ("vb script", {"vb"}),
-]
-
 RE_MONEY = re.compile(r"\$\s*\d+|\b\d+(?:\.\d+)?\s*/\s*hr\b|\b\d+(?:\.\d+)?\s*per\s*hour\b", re.I)
 RE_TIME = re.compile(r"\b\d{1,2}(:\d{2})?\s*(am|pm)\b", re.I)
 RE_DATEISH = re.compile(r"\b\d{1,2}\s*-\s*\d{1,2}\b")
@@ -64,18 +73,6 @@ GENERIC = {
     "requirements","ensure","support","ability","skills"
 }
 
-
-# Allowlist of common QA/SDET skills/tools words that may appear as plain letters
-SKILL_WORDS = {
-    "selenium","playwright","cypress","appium","restassured","postman","jmeter","locust",
-    "jenkins","github","bitbucket","jira","confluence","testng","junit","cucumber",
-    "python","java","typescript","javascript","sql","api","rest","soap","svn","svn",
-    "aws","azure","gcp","docker","kubernetes","ci","cd","cicd","devops",
-    "agile","scrum","kanban","safe","safe",
-    "graphql","restful","microservices",
-    "testrail","alm","hp alm","vbscript"
-}
-
 def _norm_text(s: str) -> str:
     s = (s or "").lower()
     s = s.replace("\u00a0", " ")
@@ -84,142 +81,171 @@ def _norm_text(s: str) -> str:
     s = re.sub(r"\s+", " ", s)
     return s.strip()
 
-def _is_junk(term: str) -> bool:
-    t = (term or "").strip().lower()
-    if not t:
-        return True
-
-    if t in JUNK_WORDS or t in STOPWORDS or t in GENERIC:
-        return True
+# --- compiled junk filter ------------------------------------------------------
+#
+# _is_junk() used to run ~15 regexes / substring scans per token, twice per kept
+# term. The same checks are folded into one set lookup and two combined patterns
+# (search anywhere / whole token), and verdicts are memoized per distinct token,
+# so a token costs one dict hit after the first JD that contains it.
 
-    if RE_NUM_ONLY.match(t):
-        return True
-    if RE_MONEY.search(t) or RE_TIME.search(t) or RE_DATEISH.search(t):
-        return True
-    
-    if RE_URL.search(t):
-        return True
-    if RE_EEO.search(t):
-        return True
-    
-    # URLs/domains / recruiting boilerplate should never be JD terms
-    if RE_URLISH.search(t) or RE_DOMAINISH.search(t):
-        return True
+_DROP_WORDS = frozenset(JUNK_WORDS | STOPWORDS | GENERIC | SUPPRESS_IF_SOLO | TIMEZONES)
 
-    # EEO boilerplate patterns like m/f/disability/veterans
-    if RE_EEO_SLASH.search(t):
-        return True
+_EEO_SUBSTRINGS = ["equal opportunity", "eeo", "accommodation", "veteran", "veterans", "disability", "disabled"]
 
-    # Extra hard-drop for common EEO/legal tokens
-    if any(x in t for x in ["equal opportunity", "eeo", "accommodation", "veteran", "veterans", "disability", "disabled"]):
-        return True    
+# any of these anywhere in the token => junk
+RE_JUNK_ANYWHERE = re.compile("|".join(
+    f"(?:{rx.pattern})" for rx in (RE_MONEY, RE_TIME, RE_DATEISH, RE_URL, RE_EEO, RE_URLISH, RE_DOMAINISH, RE_EEO_SLASH)
+) + "|" + "|".join(re.escape(x) for x in _EEO_SUBSTRINGS) + r"|/(?:mst|pst|est|cst)$", re.I)
 
-    # too short + not explicitly allowed
-    if len(t) <= 2 and t not in ALLOW_SHORT:
-        return True
+# the whole token is one of these => junk (numbers, 115k, phoenix-based, digit-bearing IDs)
+RE_JUNK_WHOLE = re.compile(
+    r"\d+(?:\.\d+)?|\d{2,3}k|[a-z]+-based|(?=[a-z_-]*\d)[a-z0-9_-]{9,}", re.I
+)
 
-    # ambiguous solo tokens
-    if t in SUPPRESS_IF_SOLO:
-        return True
+RE_NON_ALPHA = re.compile(r"[^a-z]")
 
-    # drop weird ID-like strings
-    if re.fullmatch(r"[a-z0-9_-]{9,}", t) and any(ch.isdigit() for ch in t):
+@lru_cache(maxsize=1 << 16)
+def _is_junk(term: str) -> bool:
+    t = (term or "").strip().lower()
+    if not t:
         return True
-    
-    # Salary shorthand like "115k"
-    if RE_SALARY_K.match(t):
+    if t in _DROP_WORDS:
         return True
-
-    # Location-based posting artifacts like "phoenix-based"
-    if RE_LOCATION_BASED.match(t):
+    # too short + not explicitly allowed
+    if len(t) <= 2 and t not in ALLOW_SHORT:
         return True
-
-    # Timezone abbreviations and known location/timezone combos like "az/mst"
-    if t in TIMEZONES or t.endswith("/mst") or t.endswith("/pst") or t.endswith("/est") or t.endswith("/cst"):
+    if RE_JUNK_WHOLE.fullmatch(t):
         return True
-
-    return False
+    return RE_JUNK_ANYWHERE.search(t) is not None
 
 
 def _looks_like_skill(t: str) -> bool:
     # Keep known short acronyms
     if t in ALLOW_SHORT:
         return True
-    # Keep allowlisted skill words/phrases
-    if t in SKILL_WORDS:
-        return True
     # Keep things that look like tools/tech (c#, c++, node.js, ci/cd, etc.)
-    if re.search(r"[^a-z]", t):
+    if RE_NON_ALPHA.search(t):
         return True
     return False
 
-def extract_jd_terms(text: str, max_terms: int = 18) -> List[str]:
+@lru_cache(maxsize=1 << 16)
+def _keep_token(t: str) -> bool:
+    """Memoized candidate verdict for one stripped, normalized token."""
+    return not _is_junk(t) and _looks_like_skill(t)
+
+
+def term_counts(low: str) -> Counter:
+    """
+    One tokenization pass over normalized JD text: Counter of stripped tokens
+    (insertion order = first occurrence).
+    """
+    counts: Counter = Counter()
+    for tok in RE_TOKEN.findall(low):
+        t = tok.strip(" .,-/")
+        if t:
+            counts[t] += 1
+    return counts
+
+class TermTable(NamedTuple):
+    """Every term extract_jd_terms() considers for one JD, before the max_terms cap."""
+    promoted: List[str]   # skills marked "promote" in the taxonomy, most frequent first
+    ranked: List[str]     # other candidates by (count, known, one token, length), ties in first-occurrence order
+    tf: Dict[str, int]    # term -> occurrences (the count the ranking uses)
+    length: int           # JD length in tokens (BM25 document length)
+    known: Set[str]       # the terms the taxonomy knows
+
+def term_table(text: str, taxonomy: Optional[Taxonomy] = None) -> TermTable:
+    tax = taxonomy if taxonomy is not None else load_taxonomy()
     low = _norm_text(text)
 
-    # Promote known phrases first, and suppress their solo components
-    suppress = set()
-    promoted: List[str] = []
-    for phrase, to_suppress in PHRASES:
-        if phrase in low:
-            if phrase == "vb script":
-                if "vbscript" not in promoted:
-                    promoted.append("vbscript")
-            else:
-                if phrase not in promoted:
-                    promoted.append(phrase)
-            suppress |= set(to_suppress)
-
-    # Tokenize for potential tool/skill words
-    raw_tokens = re.findall(r"[a-z0-9][a-z0-9\+#\.\-/]{0,38}", low)
-
-    candidates: List[str] = []
-    for tok in raw_tokens:
-        t = tok.strip(" .,-/").lower()
-        if not t:
-            continue
-
-        # Suppress components if we already promoted a phrase
-        if t in suppress:
+    # Taxonomy phrases (canonical form); the tokens they cover ("hp", "alm" in
+    # "hp alm") do not count on their own
+    known_freq: Counter = Counter()
+    rest, pos, n_phrases = [], 0, 0
+    for start, end, _alias, canon in tax.scan(low):
+        known_freq[canon] += 1
+        n_phrases += 1
+        rest.append(low[pos:start])
+        pos = end
+    rest.append(low[pos:])
+
+    # Candidates in first-occurrence order (phrases, then tokens): taxonomy words
+    # (canonicalized), else tokens that pass the filter. Each distinct token is
+    # looked at once (verdicts memoized across JDs).
+    counts = term_counts(" ".join(rest))
+    candidates: Dict[str, None] = dict.fromkeys(known_freq)
+    for t, n in counts.items():
+        canon = tax.words.get(t)
+        if canon is not None:
+            known_freq[canon] += n
+            t = canon
+        elif not _keep_token(t):
             continue
+        candidates.setdefault(t)
 
-        # Allow known short skills, otherwise require length >= 3
-        if len(t) <= 2 and t not in ALLOW_SHORT:
-            continue
-
-        # Normalize vb script variants
-        if t in {"vbscript", "vb-script"}:
-            t = "vbscript"
-
-        if _is_junk(t):
-            continue
-        if not _looks_like_skill(t):
-            continue
-
-        candidates.append(t)
-
-    # Combine: promoted phrases first, then best tokens by frequency
-    uniq: List[str] = []
     seen = set()
 
-    def add(x: str):
-        x = x.strip().lower()
-        if not x or x in seen:
-            return
-        if _is_junk(x):
-            return
+    def keep(x: str) -> bool:
+        if x in seen:
+            return False
+        if x in tax.promote:
+            pass  # the alias resolved the ambiguity ("alm" via "hp alm")
+        elif x in known_freq:
+            # the taxonomy vouches for short / dotted names ("c#", "k6", "asp.net"),
+            # not for stop or generic words
+            if x in _DROP_WORDS:
+                return False
+        elif _is_junk(x):
+            return False
         seen.add(x)
-        uniq.append(x)
-
-    for p in promoted:
-        add(p)
-
-    def score(term: str):
-        return (low.count(term), len(term))
-
-    for c in sorted(set(candidates), key=score, reverse=True):
-        add(c)
+        return True
 
-    return uniq[:max_terms]
+    # Occurrences of the term anywhere in the JD (substring count, so "java" also
+    # counts inside "javascript"); a canonical only written via aliases, or one too
+    # ambiguous to match alone ("go"), counts its alias hits.
+    # Only the few surviving candidates are counted.
+    tf: Dict[str, int] = {}
+    for c in candidates:
+        tf[c] = (low.count(c) if c in tax.canonical or c not in known_freq else 0) or known_freq[c]
+
+    promoted = [p for p in sorted((c for c in candidates if c in tax.promote), key=tf.get, reverse=True) if keep(p)]
+    ranked = [c for c in sorted((c for c in candidates if c not in tax.promote),
+                                key=lambda term: (tf[term], term in known_freq, " " not in term, len(term)),
+                                reverse=True) if keep(c)]
+    tf = {t: tf[t] for t in promoted + ranked}
+    return TermTable(promoted, ranked, tf, sum(counts.values()) + n_phrases, known_freq.keys() & tf.keys())
+
+def extract_jd_terms(text: str, max_terms: int = 18, taxonomy: Optional[Taxonomy] = None,
+                     idf=None) -> List[str]:
+    """
+    Promoted taxonomy skills first, then the best other terms by frequency.
+    With idf (an rf_jd_idf.CorpusIdf) both groups are ordered by BM25 against the
+    JD corpus instead, and terms most postings carry (idf.is_common) are dropped.
+    """
+    tt = term_table(text, taxonomy)
+    if idf is None:
+        return (tt.promoted + tt.ranked)[:max_terms]
+
+    def by_bm25(terms: List[str]) -> List[str]:
+        kept = [t for t in terms if not idf.is_common(t)]
+        return sorted(kept, key=lambda t: idf.bm25(t, tt.tf[t], tt.length, t in tt.known), reverse=True)
+
+    return (by_bm25(tt.promoted) + by_bm25(tt.ranked))[:max_terms]
+
+def extract_jd_terms_many(texts: Iterable[str], max_terms: int = 18, workers: int = 1,
+                          taxonomy: Optional[Taxonomy] = None, idf=None) -> List[List[str]]:
+    """
+    extract_jd_terms() for many JDs (same output per JD). workers > 1 spreads the
+    batch over processes; the per-token verdict cache is per process either way.
+    """
+    texts = list(texts)
+    tax = taxonomy if taxonomy is not None else load_taxonomy()
+    if workers <= 1 or len(texts) < 2 * workers:
+        return [extract_jd_terms(t, max_terms, tax, idf) for t in texts]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(partial(extract_jd_terms, max_terms=max_terms, taxonomy=tax, idf=idf), texts,
+                             chunksize=max(1, len(texts) // (workers * 4))))
 
 def rationale_mentions_term(rationale: str, term: str) -> bool:
     r = _norm_text(rationale)
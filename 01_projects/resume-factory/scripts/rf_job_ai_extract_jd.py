@@ -1,7 +1,10 @@
 import os
 import re
 from typing import Optional, Dict
-from openai import OpenAI, AuthenticationError, RateLimitError
+from openai import AuthenticationError, RateLimitError
+
+from rf_llm_cache import offline as _llm_offline, response_text
+from rf_openai_pool import get_client
 
 def _require(name: str) -> str:
     v = os.environ.get(name)
@@ -14,8 +17,12 @@ def extract_jd_openai(page_text: str, model: Optional[str] = None, timeout_s: in
     Uses an LLM to extract only the job description from noisy scraped text.
     Returns plain text description.
     """
-    _require("OPENAI_API_KEY")
-    client = OpenAI(timeout=timeout_s)
+    if not _llm_offline():
+        _require("OPENAI_API_KEY")
+
+    def _client():
+        return get_client(timeout_s)
+
     model = model or os.environ.get("RF_OPENAI_MODEL", "gpt-4o-mini")
 
     # truncate if very long
@@ -38,7 +45,9 @@ Return only the job description.
 """
 
     try:
-        resp = client.responses.create(
+        text_out = response_text(
+            _client,
+            label="extract_jd",
             model=model,
             input=[
                 {"role": "system", "content": system_prompt.strip()},
@@ -53,12 +62,6 @@ Return only the job description.
             raise RuntimeError("OpenAI quota/billing blocked this request (insufficient_quota).") from e
         raise
 
-    text_out = ""
-    for out in resp.output:
-        for c in out.content:
-            if c.type == "output_text":
-                text_out += c.text
-
     text_out = (text_out or "").strip()
     if not text_out:
         raise RuntimeError("JD extraction LLM returned empty text")
@@ -3,9 +3,11 @@ import os
 import re
 from typing import Any, Dict, Optional
 
-from openai import OpenAI
 from openai import RateLimitError, AuthenticationError
 
+from rf_llm_cache import offline as _llm_offline, response_text
+from rf_openai_pool import get_client
+
 
 def _strip_code_fences(text: str) -> str:
     t = (text or "").strip()
@@ -26,6 +28,36 @@ def _require(name: str) -> str:
         raise RuntimeError(f"missing required env var: {name}")
     return v
 
+def _parse_job(text_out: str, source_url: str) -> Dict[str, Any]:
+    text_out = (text_out or "").strip()
+    if not text_out:
+        raise RuntimeError("OpenAI returned empty response")
+
+    text_out = _strip_code_fences(text_out)
+
+    try:
+        data = json.loads(text_out)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"OpenAI response was not valid JSON:\n{text_out}") from e
+
+    if not isinstance(data, dict):
+        raise RuntimeError(f"Invalid response type: {type(data)}")
+
+    # validate required fields
+    for k in ["company", "role_title", "description", "source"]:
+        if k not in data or not isinstance(data[k], str) or not data[k].strip():
+            raise RuntimeError(f"Missing/invalid required field: {k}")
+
+    if data["source"].strip() != source_url:
+        raise RuntimeError("Invalid source: must exactly match SOURCE_URL")
+
+    # normalize optional
+    loc = data.get("location", None)
+    if loc is not None and not (isinstance(loc, str) and loc.strip()):
+        data["location"] = None
+
+    return data
+
 def ai_parse_job_openai(
     *,
     page_title: Optional[str],
@@ -42,9 +74,12 @@ def ai_parse_job_openai(
       location (string|null)
       source (string, required)
     """
-    _require("OPENAI_API_KEY")
+    if not _llm_offline():
+        _require("OPENAI_API_KEY")
+
+    def _client():
+        return get_client(timeout_s)
 
-    client = OpenAI(timeout=timeout_s)
     model = model or _env("JOB_INTAKE_OPENAI_MODEL", _env("RF_OPENAI_MODEL", "gpt-4o-mini"))
 
     # keep prompt bounded (avoid huge pages)
@@ -85,7 +120,10 @@ Return JSON with: company, role_title, description, location, source.
 """
 
     try:
-        resp = client.responses.create(
+        text_out = response_text(
+            _client,
+            label="job_ai_parse",
+            validate=lambda t: _parse_job(t, source_url),
             model=model,
             input=[
                 {"role": "system", "content": system_prompt.strip()},
@@ -100,37 +138,4 @@ Return JSON with: company, role_title, description, location, source.
             raise RuntimeError("OpenAI quota/billing blocked this request (insufficient_quota).") from e
         raise
 
-    text_out = ""
-    for out in resp.output:
-        for c in out.content:
-            if c.type == "output_text":
-                text_out += c.text
-
-    text_out = (text_out or "").strip()
-    if not text_out:
-        raise RuntimeError("OpenAI returned empty response")
-
-    text_out = _strip_code_fences(text_out)
-
-    try:
-        data = json.loads(text_out)
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"OpenAI response was not valid JSON:\n{text_out}") from e
-
-    if not isinstance(data, dict):
-        raise RuntimeError(f"Invalid response type: {type(data)}")
-
-    # validate required fields
-    for k in ["company", "role_title", "description", "source"]:
-        if k not in data or not isinstance(data[k], str) or not data[k].strip():
-            raise RuntimeError(f"Missing/invalid required field: {k}")
-
-    if data["source"].strip() != source_url:
-        raise RuntimeError("Invalid source: must exactly match SOURCE_URL")
-
-    # normalize optional
-    loc = data.get("location", None)
-    if loc is not None and not (isinstance(loc, str) and loc.strip()):
-        data["location"] = None
-
-    return data
+    return _parse_job(text_out, source_url)
@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from typing import Optional
 from datetime import date
 
+import rf_jobs_index
+
 def die(msg, code=2):
     print(f"ERROR: {msg}", file=sys.stderr)
     sys.exit(code)
@@ -34,33 +36,46 @@ def build_app_dir(root: pathlib.Path, ji: JobIntake) -> pathlib.Path:
     return root / "01_projects" / "jobs" / ji.family / ji.company_slug / f"{ji.date_found}_{ji.role_slug}"
 
 
-def find_existing_by_url(root: pathlib.Path, family: str, url: str) -> Optional[pathlib.Path]:
+_INDEX_CONNS = {}
+
+def _url_index(root: pathlib.Path, persist: bool = True):
     """
-    Return the app_dir of an existing job whose tracking/job-meta.json has source==url
-    or whose jd/job-post-url.txt matches url. Scans only within the same family.
+    Process-wide jobs index connection for root, refreshed (incrementally, by mtime)
+    on first use. write_job_folder() keeps it current afterwards.
+
+    persist=False (dry runs) uses an in-memory copy, so .jobs-index.sqlite is
+    neither created nor refreshed.
     """
-    base = root / "01_projects" / "jobs" / family
-    if not base.exists():
-        return None
+    key = (str(pathlib.Path(root).resolve()), persist)
+    conn = _INDEX_CONNS.get(key)
+    if conn is None:
+        conn = rf_jobs_index.open_index(root) if persist else rf_jobs_index.open_scratch(root)
+        rf_jobs_index.refresh(conn, root)
+        _INDEX_CONNS[key] = conn
+    return conn
+
 
-    # First: check job-meta.json source fields
-    for jm in base.glob("**/tracking/job-meta.json"):
-        try:
-            d = json.loads(jm.read_text())
-            if (d.get("source") or "").strip() == url:
-                return jm.parent.parent
-        except Exception:
-            continue
+def find_existing_by_url(root: pathlib.Path, family: str, url: str,
+                         dry_run: bool = False) -> Optional[pathlib.Path]:
+    """
+    Return the app_dir of an existing job whose tracking/job-meta.json has source==url
+    or whose jd/job-post-url.txt matches url.
 
-    # Second: check mirror file
-    for up in base.glob("**/jd/job-post-url.txt"):
-        try:
-            if up.read_text().strip() == url:
-                return up.parent.parent
-        except Exception:
-            continue
+    Backed by the jobs index (01_projects/jobs/.jobs-index.sqlite), so this is an
+    indexed lookup rather than a tree scan. Covers all families; a match in the
+    requested family is preferred when the URL exists in several. dry_run=True
+    leaves the index file untouched (see _url_index).
+    """
+    if not rf_jobs_index.jobs_root(root).exists():
+        return None
 
-    return None
+    hits = rf_jobs_index.lookup_url(_url_index(root, persist=not dry_run), root, url)
+    if not hits:
+        return None
+    for h in hits:
+        if h.parent.parent.name == family:
+            return h
+    return hits[0]
 
 
 def write_job_folder(root: pathlib.Path, ji: JobIntake, jd_text: str, dry_run: bool, force: bool):
@@ -85,9 +100,9 @@ def write_job_folder(root: pathlib.Path, ji: JobIntake, jd_text: str, dry_run: b
     jd_url  = jd_dir / "job-post-url.txt"
 
 
-    # duplicate-url guard (family-wide)
+    # duplicate-url guard (all families; a same-family match is preferred)
     if not force:
-        existing = find_existing_by_url(root, ji.family, ji.source_url)
+        existing = find_existing_by_url(root, ji.family, ji.source_url, dry_run=dry_run)
         if existing is not None and existing != app_dir:
             return ("SKIPPED", existing, "duplicate_url")
 
@@ -144,4 +159,7 @@ def write_job_folder(root: pathlib.Path, ji: JobIntake, jd_text: str, dry_run: b
     # always write JD
     jd_raw.write_text(jd_text.rstrip() + "\n")
 
+    # keep the dedup index current (one transaction per folder)
+    rf_jobs_index.record_app(_url_index(root), root, app_dir)
+
     return ("CREATED", app_dir, "ok")
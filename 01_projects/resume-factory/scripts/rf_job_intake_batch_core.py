@@ -1,12 +1,14 @@
 import pathlib
 import sys
 import re
-from typing import Optional, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Dict, Iterator, List, Tuple
+from urllib.parse import urlsplit
 
-import requests
-from bs4 import BeautifulSoup
-
-from rf_job_ai_parse_openai import ai_parse_job_openai
+# Page fetching, HTML parsing, headless rendering and the OpenAI parser (requests,
+# lxml/bs4, asyncio, openai) are imported where they are used: importing this
+# module for argument parsing, --help and URL validation stays cheap.
 
 def die(msg, code=2):
     print(f"ERROR: {msg}", file=sys.stderr)
@@ -31,47 +33,66 @@ def read_urls_file(path: str):
         die("No valid URLs found in file.")
     return urls
 
-def fetch_html(url: str, timeout: int = 30, verify_ssl: bool = True) -> str:
+def fetch_html(url: str, timeout: int = 30, verify_ssl: bool = True, use_cache: bool = True) -> str:
     if not valid_url(url):
         die(f"Invalid URL: {url}")
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    }
-    r = requests.get(url, headers=headers, timeout=timeout, verify=verify_ssl)
-    r.raise_for_status()
-    # requests will guess encoding; keep forgiving decode
-    r.encoding = r.encoding or "utf-8"
-    return r.text
+    from rf_http_cache import cached_get_text
+    # pooled keep-alive session + on-disk cache with ETag/Last-Modified revalidation
+    return cached_get_text(url, timeout=timeout, verify_ssl=verify_ssl, use_cache=use_cache)
 
 def html_to_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    text = soup.get_text("\n")
-    lines = [ln.strip() for ln in text.splitlines()]
-    lines = [ln for ln in lines if ln]
-    return "\n".join(lines)
+    from rf_html_extract import extract_page
+    return extract_page(html)["text"]
 
+def extract_title_from_html(html: str) -> str | None:
+    from rf_html_extract import extract_page
+    return extract_page(html)["title"]
 
+RENDER_MODES = ("auto", "never", "always")
 
-def extract_title_from_html(html: str) -> str | None:
-    soup = BeautifulSoup(html, "html.parser")
-    if soup.title and soup.title.string:
-        return soup.title.string.strip()
-    return None
-
-def scrape_job_page(url: str, verify_ssl: bool = True, ai_parse: bool = False) -> Dict[str, Optional[str]]:
-    html = fetch_html(url, verify_ssl=verify_ssl)
-    page_title = extract_title_from_html(html)
-    text = html_to_text(html)
+def _needs_render(page: Dict) -> bool:
+    # JS shells: no visible text at all, or only a "please enable JavaScript" stub
+    text = (page.get("text") or "").strip()
+    if not text:
+        return True
+    return page.get("job_posting") is None and len(text) < 200 and "javascript" in text.lower()
+
+def scrape_job_page(url: str, verify_ssl: bool = True, ai_parse: bool = False, use_cache: bool = True,
+                    render: str = "auto", on_stage: Optional[Callable[[str, str], None]] = None) -> Dict[str, Optional[str]]:
+    """
+    render: "auto"   -> headless-browser fallback only when the static HTML has no usable text
+            "never"  -> static HTML only
+            "always" -> skip the static fetch and render every page
+    on_stage(url, "fetched") is called once the page HTML is in hand (intake journal).
+    """
+    from rf_browser_render import available as browser_available, render_html
+    from rf_html_extract import extract_page, job_posting_fields
+
+    if render == "always":
+        page = extract_page(render_html(url, verify_ssl=verify_ssl))
+    else:
+        html = fetch_html(url, verify_ssl=verify_ssl, use_cache=use_cache)
+        # one parse: title + text + JSON-LD JobPosting
+        page = extract_page(html)
+        if render == "auto" and _needs_render(page):
+            if not browser_available():
+                raise RuntimeError(
+                    "Extracted text is empty (likely JS-rendered page); install Playwright to enable rendering."
+                )
+            page = extract_page(render_html(url, verify_ssl=verify_ssl))
+    if on_stage is not None:
+        on_stage(url, "fetched")
+    page_title = page["title"]
+    text = page["text"]
     if not text.strip():
-        die("Extracted text is empty (likely JS-rendered page).")
+        # raise (not die) so one JS-rendered page doesn't abort a whole batch
+        raise RuntimeError("Extracted text is empty (likely JS-rendered page).")
 
     ai_err = None
 
     if ai_parse:
         try:
+            from rf_job_ai_parse_openai import ai_parse_job_openai
             parsed = ai_parse_job_openai(
                 page_title=page_title,
                 page_text=text,
@@ -92,18 +113,79 @@ def scrape_job_page(url: str, verify_ssl: bool = True, ai_parse: bool = False) -
 
     provisional_company, provisional_role = derive_from_title(page_title)
 
+    # Structured JobPosting data (when the board publishes it) beats title heuristics.
+    jp = job_posting_fields(page["job_posting"])
+
     return {
         "ai_parsed": False,
         "ai_parse_error": ai_err,
-        "company": provisional_company,
+        "company": jp["company"] or provisional_company,
         "page_title": page_title,
-        "role_title": provisional_role,
+        "role_title": jp["role_title"] or provisional_role,
         "description": text,
-        "location": None,
+        "location": jp["location"],
         "source": url,
     }
 
 
+def _host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+def scrape_many(
+    urls: List[str],
+    verify_ssl: bool = True,
+    ai_parse: bool = False,
+    workers: int = 1,
+    per_host: int = 2,
+    use_cache: bool = True,
+    render: str = "auto",
+    on_stage: Optional[Callable[[str, str], None]] = None,
+) -> Iterator[Tuple[int, str, Optional[Dict[str, Optional[str]]], Optional[str]]]:
+    """
+    Scrape many URLs, optionally concurrently.
+    Yields (i, url, data, error) in INPUT order (i is 1-based), so callers can
+    write folders and count CREATED/SKIPPED/FAILED exactly as in sequential mode.
+
+    - workers:  global cap on in-flight fetch/parse jobs (1 = sequential, no threads)
+    - per_host: cap on in-flight jobs per hostname (be polite to one ATS)
+    - use_cache: serve/revalidate pages through the on-disk HTTP cache (rf_http_cache)
+    - render:   JS-rendering policy (see scrape_job_page); rendered pages share one
+                pooled headless browser (rf_browser_render)
+    - on_stage: progress callback passed to scrape_job_page (called from worker threads)
+    """
+    if workers <= 1:
+        for i, u in enumerate(urls, start=1):
+            try:
+                yield i, u, scrape_job_page(u, verify_ssl=verify_ssl, ai_parse=ai_parse, use_cache=use_cache, render=render, on_stage=on_stage), None
+            except Exception as e:
+                yield i, u, None, str(e)
+        return
+
+    per_host = max(1, per_host)
+    host_locks: Dict[str, threading.BoundedSemaphore] = {}
+    guard = threading.Lock()
+
+    def host_sem(u: str) -> threading.BoundedSemaphore:
+        h = _host_of(u)
+        with guard:
+            if h not in host_locks:
+                host_locks[h] = threading.BoundedSemaphore(per_host)
+            return host_locks[h]
+
+    def work(u: str):
+        with host_sem(u):
+            try:
+                return scrape_job_page(u, verify_ssl=verify_ssl, ai_parse=ai_parse, use_cache=use_cache, render=render, on_stage=on_stage), None
+            except Exception as e:
+                return None, str(e)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(work, u) for u in urls]
+        for i, (u, fut) in enumerate(zip(urls, futures), start=1):
+            data, err = fut.result()
+            yield i, u, data, err
+
+
 def slugify_snake(text: str) -> str:
     text = text.lower()
     text = re.sub(r"[^a-z0-9]+", "_", text)
@@ -0,0 +1,466 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rf_jobs_index import SCHEMA_VERSION, jobs_root
+
+# -----------------------------------------------------------------------------
+# Warm jobs query daemon (optional; Unix socket next to the jobs index)
+# -----------------------------------------------------------------------------
+#
+# `jobs-daemon start` loads the jobs index (apps + JD full text) into an
+# in-memory SQLite copy once and answers the find_apps() / unapplied() queries
+# of jobs-find, jobs-list-unapplied and jobs-open-unapplied over
+# 01_projects/jobs/.jobs-daemon.sock. The tools then skip the index open and
+# the refresh (a stat walk of every app folder) on every invocation.
+#
+# The copy is kept current with inotify (through ctypes, no extra dependency):
+# the family, company and app folders and each app's tracking/ and jd/ are
+# watched, and the folders events name are re-read with refresh_apps(). Pending
+# events are drained before a query is answered. The kernel queues an event
+# when the write happens, so a query never misses a write that finished before
+# it was sent.
+#
+# Without inotify the daemon runs a full refresh() before each query instead.
+# That happens when the OS is not Linux or when fs.inotify.max_user_watches is
+# below about three watches per app. JD files are only looked at for --text
+# queries. This still saves interpreter startup and the index open, but not
+# the stat walk.
+#
+# Clients (query()) return None whenever the daemon is not usable: no socket,
+# no answer, another index schema, another root, or a failed query. The tools
+# then query the index themselves, so a stale or stopped daemon can only cost
+# time, never change results. RF_JOBS_DAEMON=off skips it.
+#
+# Env:
+#   RF_JOBS_DAEMON          on (default) | off -> clients never use the daemon
+#   RF_JOBS_DAEMON_TIMEOUT  client socket timeout in seconds (default 10)
+
+SOCKET_NAME = ".jobs-daemon.sock"
+LOG_NAME = ".jobs-daemon.log"
+
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    v = os.environ.get(name)
+    return v if (v is not None and v != "") else default
+
+def enabled() -> bool:
+    return (_env("RF_JOBS_DAEMON", "on") or "on").strip().lower() not in ("off", "0", "false", "no")
+
+def default_root() -> Path:
+    return Path.home() / "secondbrain"
+
+def socket_path(root: Path) -> str:
+    """Socket next to the jobs index; under the temp dir when that path is too long for AF_UNIX."""
+    p = str(jobs_root(root) / SOCKET_NAME)
+    if len(os.fsencode(p)) < 100:
+        return p
+    import hashlib
+    import tempfile
+    h = hashlib.sha1(str(Path(root)).encode()).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"rf-jobs-daemon-{os.getuid()}-{h}.sock")
+
+
+# --- client ----------------------------------------------------------------------
+
+def _call(root: Path, req: Dict[str, Any], timeout: Optional[float] = None) -> Optional[dict]:
+    p = socket_path(root)
+    if not os.path.exists(p):
+        return None
+    if timeout is None:
+        timeout = float(_env("RF_JOBS_DAEMON_TIMEOUT", "10"))
+    req = dict(req, schema=SCHEMA_VERSION, root=str(Path(root)))
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(timeout)
+            s.connect(p)
+            s.sendall(json.dumps(req).encode("utf-8") + b"\n")
+            chunks = []
+            while True:
+                b = s.recv(1 << 16)
+                if not b:
+                    break
+                chunks.append(b)
+        resp = json.loads(b"".join(chunks))
+    except (OSError, ValueError):
+        return None
+    return resp if isinstance(resp, dict) else None
+
+def query(root: Path, op: str, **args) -> Optional[List[Dict[str, Any]]]:
+    """
+    rf_jobs_index.<op>(conn, root, **args) answered by a running daemon (op:
+    "find_apps" | "unapplied"); same dicts, "app" as a Path. None = no usable
+    daemon (callers query the index themselves).
+    """
+    if not enabled():
+        return None
+    resp = _call(root, {"op": op, "args": args})
+    if not resp or not resp.get("ok"):
+        return None
+    rows = resp.get("rows")
+    if not isinstance(rows, list):
+        return None
+    for r in rows:
+        r["app"] = Path(r["app"])
+    return rows
+
+def ping(root: Path, timeout: float = 2.0) -> Optional[dict]:
+    """The daemon's status dict (pid, mode, apps, watches, since), or None."""
+    resp = _call(root, {"op": "ping"}, timeout=timeout)
+    return resp if resp and resp.get("ok") else None
+
+
+# --- inotify (ctypes) ------------------------------------------------------------
+
+IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x40, 0x80, 0x100, 0x200
+IN_DELETE_SELF, IN_MOVE_SELF = 0x400, 0x800
+IN_Q_OVERFLOW, IN_IGNORED, IN_ONLYDIR, IN_ISDIR = 0x4000, 0x8000, 0x1000000, 0x40000000
+_WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+               | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+
+class _Inotify:
+    """Non-blocking inotify fd. Raises OSError when inotify is unavailable."""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        import struct
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify needs Linux")
+        self._ctypes, self._event = ctypes, struct.Struct("iIII")
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        except OSError as e:
+            raise OSError(f"libc: {e}") from e
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add(self, path: str) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self) -> list:
+        """[(wd, mask, name)] of every queued event (empty when none)."""
+        out = []
+        while True:
+            try:
+                buf = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return out
+            pos, size = 0, self._event.size
+            while pos + size <= len(buf):
+                wd, mask, _cookie, n = self._event.unpack_from(buf, pos)
+                name = buf[pos + size:pos + size + n].split(b"\0", 1)[0]
+                out.append((wd, mask, os.fsdecode(name)))
+                pos += size + n
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+# --- server ----------------------------------------------------------------------
+
+def _log(msg: str) -> None:
+    print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} jobs-daemon: {msg}", file=sys.stderr, flush=True)
+
+def _subdirs(d: str) -> List[str]:
+    try:
+        with os.scandir(d) as it:
+            return sorted(e.name for e in it if e.is_dir() and not e.name.startswith("."))
+    except OSError:
+        return []
+
+
+class JobsDaemon:
+    """The in-memory index plus what keeps it current; serve() answers clients."""
+
+    def __init__(self, root: Path):
+        import sqlite3
+        import rf_jobs_index
+        self.idx = rf_jobs_index
+        self.root = Path(root)
+        self.jobs = str(jobs_root(root))
+        self.since = time.time()
+        self.jd_text = True
+        disk = rf_jobs_index.open_index(self.root)
+        try:
+            try:
+                rf_jobs_index.refresh(disk, self.root, jd_text=True)
+            except sqlite3.OperationalError as e:  # no FTS5: metadata queries only
+                _log(f"JD full text unavailable ({e})")
+                self.jd_text = False
+                rf_jobs_index.refresh(disk, self.root)
+            self.conn = sqlite3.connect(":memory:")
+            disk.backup(self.conn)
+        finally:
+            disk.close()
+        self.ino: Optional[_Inotify] = None
+        self.wd_rel: Dict[int, str] = {}
+        self.rel_wd: Dict[str, int] = {}
+        try:
+            self.ino = _Inotify()
+            self._watch_tree("")
+        except OSError as e:
+            self._to_polling(e)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self.ino else "poll"
+
+    def _to_polling(self, why) -> None:
+        _log(f"inotify unavailable ({why}); refreshing before each query instead")
+        if self.ino:
+            self.ino.close()
+        self.ino = None
+        self.wd_rel.clear()
+        self.rel_wd.clear()
+
+    # watches: rel "" = jobs root, then <family>, <family>/<company>, the app, and the app's tracking/ + jd/
+    def _watch(self, rel: str) -> bool:
+        try:
+            wd = self.ino.add(f"{self.jobs}/{rel}" if rel else self.jobs)
+        except (FileNotFoundError, NotADirectoryError):  # gone again / not a folder
+            return False
+        self.wd_rel[wd] = rel
+        self.rel_wd[rel] = wd
+        return True
+
+    def _watch_tree(self, rel: str) -> List[str]:
+        """Watch rel and every folder below it that matters; returns the app rels found."""
+        if not self._watch(rel):
+            return []
+        depth = rel.count("/") + 1 if rel else 0
+        if depth == 3:
+            for sub in ("tracking", "jd"):
+                self._watch(f"{rel}/{sub}")
+            return [rel]
+        apps = []
+        for name in _subdirs(f"{self.jobs}/{rel}" if rel else self.jobs):
+            apps += self._watch_tree(f"{rel}/{name}" if rel else name)
+        return apps
+
+    def _unwatch(self, rel: str) -> None:
+        for r in [r for r in self.rel_wd if r == rel or r.startswith(rel + "/")]:
+            wd = self.rel_wd.pop(r)
+            self.wd_rel.pop(wd, None)
+            self.ino.rm(wd)
+
+    def _indexed_under(self, rel: str) -> List[str]:
+        q = "SELECT rel FROM apps WHERE rel = ? OR substr(rel, 1, ?) = ?"
+        return [r for (r,) in self.conn.execute(q, (rel, len(rel) + 1, rel + "/"))]
+
+    def _full_refresh(self, jd_text: bool = True) -> None:
+        self.idx.refresh(self.conn, self.root, jd_text=jd_text and self.jd_text)
+
+    def sync(self, jd_text: bool = True) -> None:
+        """
+        Apply everything that changed on disk so far. Polling only looks at the
+        JD files when jd_text is set (a --text query): the refresh after is
+        by mtime + size, so skipping it in between loses nothing.
+        """
+        if self.ino is None:
+            self._full_refresh(jd_text)
+            return
+        dirty, overflow = set(), False
+        try:
+            for wd, mask, name in self.ino.read():
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                if mask & IN_IGNORED:
+                    rel = self.wd_rel.pop(wd, None)
+                    if rel is not None and self.rel_wd.get(rel) == wd:
+                        del self.rel_wd[rel]
+                    continue
+                base = self.wd_rel.get(wd)
+                if base is None:
+                    continue
+                depth = base.count("/") + 1 if base else 0
+                if depth >= 3:
+                    # anything inside an app folder: re-read that app
+                    dirty.add("/".join(base.split("/")[:3]))
+                    if depth == 3 and mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and name in ("tracking", "jd"):
+                        self._watch(f"{base}/{name}")
+                    continue
+                # above the apps only folders matter (index files, .DS_Store ... do not)
+                if not mask & IN_ISDIR or not name or name.startswith("."):
+                    continue
+                rel = f"{base}/{name}" if base else name
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    dirty.update(self._watch_tree(rel))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._unwatch(rel)
+                    dirty.update(self._indexed_under(rel))
+            if overflow:
+                _log("inotify queue overflow; full refresh")
+                self._watch_tree("")
+        except OSError as e:  # ENOSPC: the tree outgrew max_user_watches
+            self._to_polling(e)
+            overflow = True
+        if overflow:
+            self._full_refresh()
+        elif dirty:
+            self.idx.refresh_apps(self.conn, self.root, sorted(dirty), jd_text=self.jd_text)
+
+    def status(self) -> Dict[str, Any]:
+        n = self.conn.execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+        return {"ok": True, "pid": os.getpid(), "mode": self.mode, "apps": n,
+                "watches": len(self.rel_wd), "since": self.since, "root": str(self.root)}
+
+    def handle(self, req: dict) -> dict:
+        import sqlite3
+        if req.get("schema") != SCHEMA_VERSION:
+            return {"ok": False, "error": f"schema {req.get('schema')} != {SCHEMA_VERSION}"}
+        if req.get("root") != str(self.root):
+            return {"ok": False, "error": f"serving {self.root}"}
+        op = req.get("op")
+        if op in ("ping", "stop"):
+            return self.status()
+        fn = {"find_apps": self.idx.find_apps, "unapplied": self.idx.unapplied}.get(op)
+        if fn is None:
+            return {"ok": False, "error": f"unknown op {op!r}"}
+        args = req.get("args") or {}
+        self.sync(jd_text=args.get("text") is not None)
+        try:
+            rows = fn(self.conn, self.root, **args)
+        except (TypeError, ValueError, sqlite3.Error) as e:  # ValueError covers rf_jd_query.QueryError
+            return {"ok": False, "error": str(e)}
+        for r in rows:
+            r["app"] = str(r["app"])
+        return {"ok": True, "rows": rows}
+
+    def serve(self, path: str) -> None:
+        import selectors
+        import signal
+        if ping(self.root) is not None:
+            raise SystemExit(f"ERROR: already running: {path}")
+        if os.path.exists(path):
+            os.unlink(path)  # stale socket of a daemon that died
+        srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            srv.bind(path)
+        finally:
+            os.umask(old_umask)
+        srv.listen(16)
+        signal.signal(signal.SIGTERM, lambda *_a: sys.exit(0))
+        sel = selectors.DefaultSelector()
+        sel.register(srv, selectors.EVENT_READ, "client")
+        if self.ino:
+            sel.register(self.ino.fd, selectors.EVENT_READ, "inotify")
+        st = self.status()
+        _log(f"serving {st['apps']} apps on {path} (pid {st['pid']}, {st['mode']}, {st['watches']} watches)")
+        try:
+            while True:
+                for key, _ev in sel.select():
+                    if key.data == "inotify":
+                        self.sync()
+                        if self.ino is None:
+                            sel.unregister(key.fileobj)
+                    elif self._answer(srv) == "stop":
+                        _log("stopped")
+                        return
+        finally:
+            sel.close()
+            srv.close()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _answer(self, srv: socket.socket) -> Optional[str]:
+        conn, _addr = srv.accept()
+        op = None
+        with conn:
+            try:
+                conn.settimeout(5)
+                f = conn.makefile("rb")
+                req = json.loads(f.readline() or b"{}")
+                op = req.get("op") if isinstance(req, dict) else None
+                resp = self.handle(req) if isinstance(req, dict) else {"ok": False, "error": "bad request"}
+                conn.sendall(json.dumps(resp).encode("utf-8") + b"\n")
+            except (OSError, ValueError) as e:
+                _log(f"client: {e}")
+                return None
+        return op if op == "stop" else None
+
+
+# --- command line ----------------------------------------------------------------
+
+def main(argv=None):
+    import argparse
+    import subprocess
+    ap = argparse.ArgumentParser(prog="jobs-daemon", description="Warm jobs query daemon for jobs-find / jobs-list-unapplied.")
+    ap.add_argument("cmd", choices=["start", "stop", "status", "run"],
+                    help="start in the background | stop | status | run in the foreground")
+    ap.add_argument("--root", default=None, help="secondbrain root (default ~/secondbrain)")
+    args = ap.parse_args(argv)
+
+    root = Path(args.root).expanduser() if args.root else default_root()
+    path = socket_path(root)
+    if not jobs_root(root).is_dir():
+        print(f"ERROR: jobs root not found: {jobs_root(root)}", file=sys.stderr)
+        return 1
+
+    st = ping(root)
+    if args.cmd == "status":
+        if st is None:
+            print("NOT RUNNING")
+            return 1
+        up = time.time() - st["since"]
+        print(f"RUNNING: pid {st['pid']}  {st['mode']}  apps {st['apps']}  watches {st['watches']}  up {up:.0f}s  {path}")
+        return 0
+    if args.cmd == "stop":
+        if st is None:
+            print("NOT RUNNING")
+            return 0
+        _call(root, {"op": "stop"}, timeout=10)
+        for _ in range(100):
+            if not os.path.exists(path):
+                break
+            time.sleep(0.05)
+        print(f"STOPPED: pid {st['pid']}")
+        return 0
+    if st is not None:
+        print(f"RUNNING: pid {st['pid']} ({path})")
+        return 0
+    if args.cmd == "run":
+        JobsDaemon(root).serve(path)
+        return 0
+
+    log = jobs_root(root) / LOG_NAME
+    with open(log, "ab") as lf:
+        proc = subprocess.Popen([sys.executable, str(Path(__file__).resolve()), "run", "--root", str(root)],
+                                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=lf,
+                                start_new_session=True)
+    deadline = time.time() + 300  # the first load refreshes the on-disk index (JD text included)
+    while time.time() < deadline:
+        st = ping(root, timeout=1.0)
+        if st is not None:
+            print(f"STARTED: pid {st['pid']}  {st['mode']}  apps {st['apps']}  watches {st['watches']}  {path}")
+            return 0
+        if proc.poll() is not None:
+            break
+        time.sleep(0.1)
+    tail = log.read_text(errors="replace").strip().splitlines()[-3:]
+    print("ERROR: daemon did not start" + "".join(f"\n  {l}" for l in tail), file=sys.stderr)
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
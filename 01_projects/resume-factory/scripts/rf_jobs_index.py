@@ -0,0 +1,472 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# -----------------------------------------------------------------------------
+# Jobs index (SQLite sidecar under 01_projects/jobs)
+# -----------------------------------------------------------------------------
+#
+# One row per application folder (<family>/<company>/<date>_<role>), keyed by its
+# path relative to the jobs root. Rows carry the mtimes of the files they were
+# parsed from, so refresh() only re-reads folders whose files changed: keeping
+# the index current costs two stats per app folder, not a JSON parse.
+#
+# Besides the URL-dedup columns (source, post_url) a row holds the job-meta.json
+# fields the jobs-* listing tools filter and sort on, both as written ("company",
+# "status", "date_found" ...; what they print) and as match keys (lowercased /
+# stripped, date_found as ISO date), so filters and ORDER BY ... LIMIT run as
+# SQL over indexed columns (find_apps(), unapplied()).
+#
+# JD full text (jobs-find --text) lives in an FTS5 table (jd_fts, rowid =
+# jd_docs.docid) maintained the same way, by jd/jd-raw.txt mtime + size. It is
+# only refreshed when asked for (refresh(..., jd_text=True)), so plain listing
+# queries never pay for it; queries come from rf_jd_query and are ranked by BM25.
+#
+# refresh_apps() re-reads named folders without a walk, for callers that know
+# what changed (rf_jobs_daemon keeps an in-memory copy current that way).
+#
+# The index is a cache: deleting the file is always safe (it is rebuilt on the
+# next refresh). open_scratch() gives an in-memory copy for dry runs that must
+# not touch it. The tools keep a --no-index path that scans the tree directly.
+
+INDEX_NAME = ".jobs-index.sqlite"
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS apps (
+    rel         TEXT PRIMARY KEY,   -- <family>/<company>/<date>_<role>
+    family      TEXT NOT NULL,
+    meta_mtime  INTEGER,            -- tracking/job-meta.json st_mtime_ns (NULL = missing)
+    url_mtime   INTEGER,            -- jd/job-post-url.txt st_mtime_ns (NULL = missing)
+    source      TEXT,               -- job-meta.json "source" (stripped)
+    post_url    TEXT,               -- jd/job-post-url.txt
+    meta_ok     INTEGER NOT NULL DEFAULT 0,  -- job-meta.json parsed to an object
+    company     TEXT,               -- job-meta.json fields as written (NULL = absent / not a string)
+    role_title  TEXT,
+    role_family TEXT,
+    status      TEXT,
+    date_found  TEXT,
+    company_lc  TEXT NOT NULL DEFAULT '',  -- match / sort keys: stripped + lowercased
+    role_lc     TEXT NOT NULL DEFAULT '',
+    family_lc   TEXT NOT NULL DEFAULT '',
+    status_key  TEXT NOT NULL DEFAULT '',
+    source_lc   TEXT NOT NULL DEFAULT '',
+    found_key   TEXT NOT NULL DEFAULT ''   -- date_found as YYYY-MM-DD ('' = missing / unparseable)
+);
+CREATE INDEX IF NOT EXISTS apps_source ON apps(source);
+CREATE INDEX IF NOT EXISTS apps_post_url ON apps(post_url);
+CREATE INDEX IF NOT EXISTS apps_status ON apps(status_key, found_key);
+CREATE INDEX IF NOT EXISTS apps_found ON apps(found_key);
+CREATE INDEX IF NOT EXISTS apps_company ON apps(company_lc);
+CREATE INDEX IF NOT EXISTS apps_family ON apps(family_lc);
+CREATE TABLE IF NOT EXISTS jd_docs (
+    docid       INTEGER PRIMARY KEY,  -- jd_fts rowid
+    rel         TEXT NOT NULL UNIQUE,
+    jd_mtime    INTEGER NOT NULL,     -- jd/jd-raw.txt st_mtime_ns
+    jd_size     INTEGER NOT NULL
+);
+"""
+
+_COLUMNS = ("rel", "family", "meta_mtime", "url_mtime", "source", "post_url", "meta_ok",
+            "company", "role_title", "role_family", "status", "date_found",
+            "company_lc", "role_lc", "family_lc", "status_key", "source_lc", "found_key")
+_UPSERT = f"INSERT OR REPLACE INTO apps({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+def jobs_root(root: Path) -> Path:
+    return Path(root) / "01_projects" / "jobs"
+
+def index_path(root: Path) -> Path:
+    return jobs_root(root) / INDEX_NAME
+
+
+def open_index(root: Path) -> sqlite3.Connection:
+    """
+    Open (creating if needed) the jobs index for a secondbrain root.
+    A schema version mismatch drops and recreates the tables.
+    """
+    p = index_path(root)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(p))
+    ver = conn.execute("PRAGMA user_version").fetchone()[0]
+    if ver != SCHEMA_VERSION:
+        with conn:
+            for t in ("apps", "jd_docs", "jd_fts"):
+                conn.execute(f"DROP TABLE IF EXISTS {t}")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def open_scratch(root: Path) -> sqlite3.Connection:
+    """
+    In-memory copy of the jobs index that never writes to disk: starts from the
+    on-disk index when it exists (opened read-only, current schema) and is empty
+    otherwise. refresh() brings it up to date in memory. For dry runs.
+    """
+    conn = sqlite3.connect(":memory:")
+    p = index_path(root)
+    if p.exists():
+        try:
+            disk = sqlite3.connect(f"{p.resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                if disk.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                    disk.backup(conn)
+            finally:
+                disk.close()
+        except sqlite3.Error:
+            pass
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        with conn:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def _mtime_ns(p) -> Optional[int]:
+    try:
+        return os.stat(p).st_mtime_ns
+    except OSError:
+        return None
+
+def _iter_app_paths(jobs: str):
+    """iter_app_dirs() with the folder as a plain string (no Path per app: refresh's hot loop)."""
+    def subdirs(d: str):
+        try:
+            with os.scandir(d) as it:
+                return sorted(e.name for e in it if e.is_dir() and not e.name.startswith("."))
+        except OSError:
+            return []
+
+    for fam in subdirs(jobs):
+        fam_d = f"{jobs}/{fam}"
+        for comp in subdirs(fam_d):
+            comp_d = f"{fam_d}/{comp}"
+            for app in subdirs(comp_d):
+                yield f"{fam}/{comp}/{app}", fam, f"{comp_d}/{app}"
+
+def iter_app_dirs(jobs: Path):
+    """
+    Yield (rel, family, app_dir) for every <family>/<company>/<app> folder.
+    Hidden entries (index files, .DS_Store, ...) are ignored.
+    """
+    jobs = Path(jobs)
+    for rel, fam, _d in _iter_app_paths(str(jobs)):
+        yield rel, fam, jobs / rel
+
+
+def _read_meta(meta_p: Path) -> Optional[dict]:
+    try:
+        d = json.loads(meta_p.read_text())
+    except Exception:
+        return None
+    return d if isinstance(d, dict) else None
+
+def _read_post_url(url_p: Path) -> Optional[str]:
+    try:
+        return url_p.read_text().strip() or None
+    except Exception:
+        return None
+
+def _text(v) -> Optional[str]:
+    return v if isinstance(v, str) else None
+
+def found_key(s) -> str:
+    """date_found as YYYY-MM-DD; '' when missing or not a Y-M-D date (lenient, as jobs-find)."""
+    try:
+        y, m, d = (s or "").strip().split("-")
+        return date(int(y), int(m), int(d)).isoformat()
+    except Exception:
+        return ""
+
+def _row(rel: str, fam: str, app: Path) -> tuple:
+    meta_p = app / "tracking" / "job-meta.json"
+    url_p = app / "jd" / "job-post-url.txt"
+    mm, um = _mtime_ns(meta_p), _mtime_ns(url_p)
+    d = _read_meta(meta_p) if mm is not None else None
+    m = d or {}
+    company, role, family = _text(m.get("company")), _text(m.get("role_title")), _text(m.get("role_family"))
+    status, found, source = _text(m.get("status")), _text(m.get("date_found")), _text(m.get("source"))
+    source = (source or "").strip() or None
+
+    def key(v):
+        return (v or "").strip().lower()
+
+    return (rel, fam, mm, um, source,
+            _read_post_url(url_p) if um is not None else None,
+            int(d is not None), company, role, family, status, found,
+            key(company), key(role), key(family), key(status), key(source), found_key(found))
+
+
+def _ensure_fts(conn: sqlite3.Connection) -> None:
+    """Create jd_fts on first use. Raises sqlite3.OperationalError when SQLite lacks FTS5."""
+    from rf_jd_query import TOKENIZE
+    conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS jd_fts USING fts5(body, tokenize=\"{TOKENIZE}\")")
+
+def _jd_stat(p: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(p)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def _drop_jd(conn: sqlite3.Connection, docid: int) -> None:
+    conn.execute("DELETE FROM jd_fts WHERE rowid = ?", (docid,))
+    conn.execute("DELETE FROM jd_docs WHERE docid = ?", (docid,))
+
+def _sync_jd(conn: sqlite3.Connection, rel: str, d: str, old: Optional[Tuple[int, int, int]]) -> bool:
+    """Re-index one folder's jd-raw.txt if its mtime/size differ from old (docid, mtime, size). True = (re)inserted."""
+    st = _jd_stat(d + "/jd/jd-raw.txt")
+    if old is not None and old[1:] == st:
+        return False
+    if old is not None:
+        _drop_jd(conn, old[0])
+    if st is None:
+        return False
+    try:
+        body = Path(d, "jd", "jd-raw.txt").read_text(errors="ignore")
+    except OSError:
+        return False
+    cur = conn.execute("INSERT INTO jd_docs(rel, jd_mtime, jd_size) VALUES (?,?,?)", (rel, *st))
+    conn.execute("INSERT INTO jd_fts(rowid, body) VALUES (?,?)", (cur.lastrowid, body))
+    return True
+
+def refresh(conn: sqlite3.Connection, root: Path, jd_text: bool = False) -> Dict[str, int]:
+    """
+    Bring the index in line with the tree. Only folders whose job-meta.json or
+    job-post-url.txt mtime changed are re-parsed; vanished folders are dropped.
+    jd_text=True also brings the JD full-text table up to date (by jd-raw.txt
+    mtime + size). Returns {"scanned": n, "updated": n, "removed": n} (+ "jd_updated").
+    """
+    jobs = jobs_root(root)
+    known: Dict[str, Tuple[Optional[int], Optional[int]]] = {
+        rel: (mm, um) for rel, mm, um in conn.execute("SELECT rel, meta_mtime, url_mtime FROM apps")
+    }
+    jd_known: Dict[str, Tuple[int, int, int]] = {}
+    if jd_text:
+        _ensure_fts(conn)
+        jd_known = {rel: (docid, mt, sz) for docid, rel, mt, sz in
+                    conn.execute("SELECT docid, rel, jd_mtime, jd_size FROM jd_docs")}
+    scanned = updated = jd_updated = 0
+    seen = set()
+    with conn:
+        # plain strings: the stats per folder are the whole no-change cost
+        for rel, fam, d in _iter_app_paths(str(jobs)):
+            scanned += 1
+            seen.add(rel)
+            mm = _mtime_ns(d + "/tracking/job-meta.json")
+            um = _mtime_ns(d + "/jd/job-post-url.txt")
+            if known.get(rel) != (mm, um):
+                conn.execute(_UPSERT, _row(rel, fam, Path(d)))
+                updated += 1
+            if jd_text and _sync_jd(conn, rel, d, jd_known.get(rel)):
+                jd_updated += 1
+        gone = [rel for rel in known if rel not in seen]
+        conn.executemany("DELETE FROM apps WHERE rel = ?", [(rel,) for rel in gone])
+        for rel, (docid, _mt, _sz) in jd_known.items():
+            if rel not in seen:
+                _drop_jd(conn, docid)
+    out = {"scanned": scanned, "updated": updated, "removed": len(gone)}
+    if jd_text:
+        out["jd_updated"] = jd_updated
+    return out
+
+
+def refresh_apps(conn: sqlite3.Connection, root: Path, rels, jd_text: bool = False) -> Dict[str, int]:
+    """
+    refresh() for specific folders (rel = <family>/<company>/<app>), without a
+    tree walk: each one is re-parsed unconditionally, or dropped when it is no
+    longer an app folder. For callers that know what changed (rf_jobs_daemon's
+    inotify events). Returns {"updated": n, "removed": n}.
+    """
+    jobs = str(jobs_root(root))
+    if jd_text:
+        _ensure_fts(conn)
+    updated = removed = 0
+    with conn:
+        for rel in rels:
+            parts = rel.split("/")
+            d = f"{jobs}/{rel}"
+            old = None
+            if jd_text:
+                old = conn.execute("SELECT docid, jd_mtime, jd_size FROM jd_docs WHERE rel = ?", (rel,)).fetchone()
+            if len(parts) == 3 and not any(x.startswith(".") for x in parts) and os.path.isdir(d):
+                conn.execute(_UPSERT, _row(rel, parts[0], Path(d)))
+                if jd_text:
+                    _sync_jd(conn, rel, d, old)
+                updated += 1
+                continue
+            if conn.execute("DELETE FROM apps WHERE rel = ?", (rel,)).rowcount:
+                removed += 1
+            if old is not None:
+                _drop_jd(conn, old[0])
+    return {"updated": updated, "removed": removed}
+
+
+def lookup_url(conn: sqlite3.Connection, root: Path, url: str) -> List[Path]:
+    """
+    App folders (all families) whose job-meta source or job-post-url.txt equals url.
+    """
+    url = (url or "").strip()
+    if not url:
+        return []
+    rows = conn.execute(
+        "SELECT rel FROM apps WHERE source = ? UNION SELECT rel FROM apps WHERE post_url = ? ORDER BY 1",
+        (url, url),
+    ).fetchall()
+    jobs = jobs_root(root)
+    return [jobs / rel for (rel,) in rows]
+
+
+def record_app(conn: sqlite3.Connection, root: Path, app_dir: Path) -> None:
+    """
+    (Re)index a single app folder right after it was written.
+    """
+    app_dir = Path(app_dir)
+    rel = app_dir.relative_to(jobs_root(root)).as_posix()
+    with conn:
+        conn.execute(_UPSERT, _row(rel, rel.split("/", 1)[0], app_dir))
+
+
+def fresh_rows(conn: sqlite3.Connection, root: Path, app_dirs) -> Dict[str, Dict[str, Any]]:
+    """
+    Indexed job-meta fields for specific app folders, without a tree refresh:
+    {app_dir (as given): {"company", "role_title", "role_family", "status",
+    "date_found", "source"}} for the folders whose job-meta.json still has the
+    mtime it was indexed with (one stat each). Folders outside the jobs root,
+    not indexed, changed since, or without a parsable job-meta.json are left out.
+    """
+    jobs = jobs_root(root)
+    by_rel: Dict[str, str] = {}
+    for a in app_dirs:
+        try:
+            rel = Path(a).relative_to(jobs).as_posix()
+        except ValueError:
+            continue
+        by_rel.setdefault(rel, a)
+    out: Dict[str, Dict[str, Any]] = {}
+    rels = list(by_rel)
+    for i in range(0, len(rels), 500):
+        chunk = rels[i:i + 500]
+        q = (f"SELECT rel, meta_mtime, company, role_title, role_family, status, date_found, source FROM apps "
+             f"WHERE meta_ok = 1 AND rel IN ({', '.join('?' * len(chunk))})")
+        for rel, mm, c, r, f, s, d, u in conn.execute(q, chunk):
+            a = by_rel[rel]
+            if _mtime_ns(f"{a}/tracking/job-meta.json") == mm:
+                out[a] = {"company": c, "role_title": r, "role_family": f, "status": s,
+                          "date_found": d, "source": u}
+    return out
+
+
+def open_refreshed(root: Path, jd_text: bool = False) -> sqlite3.Connection:
+    """open_index() + refresh(): the index as of now, for one-shot CLI queries."""
+    conn = open_index(root)
+    try:
+        refresh(conn, root, jd_text=jd_text)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+# jobs-find --sort -> ORDER BY (same keys as its in-memory sort; rel breaks exact
+# ties). "rank" = BM25 relevance of --text (best first).
+SORTS = {
+    "found_desc": "found_key DESC, company_lc DESC, role_lc DESC, apps.rel",
+    "found_asc": "found_key, company_lc, role_lc, apps.rel",
+    "company": "company_lc, found_key, role_lc, apps.rel",
+    "role": "role_lc, found_key, company_lc, apps.rel",
+    "rank": "score, apps.rel",
+}
+
+def find_apps(conn: sqlite3.Connection, root: Path, *, status: Optional[str] = None,
+              company: Optional[str] = None, role: Optional[str] = None, family: Optional[str] = None,
+              found: Optional[str] = None, found_since: Optional[str] = None, found_until: Optional[str] = None,
+              url: Optional[str] = None, path: Optional[str] = None, text: Optional[str] = None,
+              sort: str = "found_desc", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    jobs-find's filters as one query. status / family are exact, company / role /
+    url / path case-insensitive substrings, found* compare date_found as a date
+    (a filter value that is not a date is ignored; apps without one never match
+    a date filter). text is an rf_jd_query query over the JD full text (refresh
+    with jd_text=True first; raises rf_jd_query.QueryError when malformed).
+    Returns dicts with the job-meta fields as written plus "app" and "score"
+    (BM25, lower = more relevant; None without a positive text query).
+    """
+    def want(v):
+        return (v or "").strip().lower()
+
+    where, params = ["meta_ok = 1"], []
+
+    def add(clause: str, *values) -> None:
+        where.append(clause)
+        params.extend(values)
+
+    if want(status):
+        add("status_key = ?", want(status))
+    if want(family):
+        add("family_lc = ?", want(family))
+    for col, v in (("company_lc", company), ("role_lc", role), ("source_lc", url)):
+        if want(v):
+            add(f"instr({col}, ?) > 0", want(v))
+    for op, v in (("=", found), (">=", found_since), ("<=", found_until)):
+        k = found_key(v) if v else ""
+        if k:
+            add(f"found_key != '' AND found_key {op} ?", k)
+    jobs = jobs_root(root)
+    if want(path):
+        # substring of the absolute app path, lowercased as Python does
+        conn.create_function("py_lower", 1, lambda s: s.lower() if isinstance(s, str) else s, deterministic=True)
+        add("instr(py_lower(? || apps.rel), ?) > 0", f"{jobs}/", want(path))
+
+    tables, score = "apps", "NULL"
+    if text is not None:
+        from rf_jd_query import fts_parts, parse
+        match, exclude = fts_parts(parse(text))
+        if match is not None:
+            tables = "jd_fts JOIN jd_docs ON jd_docs.docid = jd_fts.rowid JOIN apps ON apps.rel = jd_docs.rel"
+            score = "bm25(jd_fts)"
+            add("jd_fts MATCH ?", match)
+        else:
+            add("apps.rel IN (SELECT rel FROM jd_docs)")
+        for ex in exclude:
+            add("apps.rel NOT IN (SELECT jd_docs.rel FROM jd_fts JOIN jd_docs ON jd_docs.docid = jd_fts.rowid "
+                "WHERE jd_fts MATCH ?)", ex)
+    order = SORTS["found_desc"] if sort == "rank" and score == "NULL" else SORTS[sort]
+    sql = (f"SELECT apps.rel, company, role_title, role_family, status, date_found, source, {score} AS score "
+           f"FROM {tables} WHERE {' AND '.join(where)} ORDER BY {order}")
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(max(0, limit))
+    return [{"app": jobs / rel, "company": c, "role_title": r, "role_family": f, "status": s,
+             "date_found": d, "source": u, "score": sc}
+            for rel, c, r, f, s, d, u, sc in conn.execute(sql, params)]
+
+
+def unapplied(conn: sqlite3.Connection, root: Path, date_found: Optional[str] = None,
+              http_only: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Apps whose job-meta status is exactly "not_applied" (optionally date_found ==
+    date_found, exactly), newest first by (date_found, company, role_title) as
+    written. "url" prefers jd/job-post-url.txt over the job-meta source;
+    http_only keeps only apps whose url starts with "http".
+    """
+    where, params = ["meta_ok = 1", "status_key = 'not_applied'", "status = 'not_applied'"], []
+    if date_found:
+        where.append("date_found = ?")
+        params.append(date_found)
+    if http_only:
+        where.append("substr(COALESCE(post_url, source, ''), 1, 4) = 'http'")
+    sql = (f"SELECT rel, company, role_title, date_found, COALESCE(post_url, source, '') FROM apps "
+           f"WHERE {' AND '.join(where)} "
+           f"ORDER BY COALESCE(date_found, '') DESC, COALESCE(company, '') DESC, COALESCE(role_title, '') DESC, rel")
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(max(0, limit))
+    jobs = jobs_root(root)
+    return [{"app": jobs / rel, "company": c, "role_title": r, "date_found": d, "url": u}
+            for rel, c, r, d, u in conn.execute(sql, params)]
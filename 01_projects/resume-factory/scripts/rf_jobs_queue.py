@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import rf_jobs_index
+
+# -----------------------------------------------------------------------------
+# Queue files (jobs-open-unapplied --queue, jobs-queue-show, jobs-queue-prune)
+# -----------------------------------------------------------------------------
+#
+# A queue file is one application folder per line. The queue tools read the
+# whole file, check the folders, and load every job-meta.json they need in one
+# go (load_metas): fields come from the jobs index where its row is still
+# current (one stat), otherwise from the file itself.
+
+def read_queue(path: Path) -> List[str]:
+    """Lines of the queue file, as written (only the newline is removed)."""
+    lines = Path(path).read_text(encoding="utf-8", errors="surrogateescape").split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    return lines
+
+def is_blank(line: str) -> bool:
+    """Blank as the shell tools had it: nothing but spaces."""
+    return not line.replace(" ", "")
+
+def meta_path(app: str) -> str:
+    return os.path.join(app, "tracking", "job-meta.json")
+
+
+def _read_meta(app: str) -> Optional[dict]:
+    try:
+        with open(meta_path(app), encoding="utf-8") as f:
+            d = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return d if isinstance(d, dict) else None
+
+def load_metas(apps: Sequence[str], fields: Sequence[str], root: Optional[Path] = None) -> Dict[str, Optional[dict]]:
+    """
+    {app: job-meta dict | None (unreadable / not a JSON object)} for folders whose
+    job-meta.json exists. An index row is used only when every requested field
+    is a string there (absent and null keys need the file to tell apart); such
+    dicts carry just the indexed fields.
+    """
+    root = Path(root) if root else Path.home() / "secondbrain"
+    rows: Dict[str, dict] = {}
+    if apps and rf_jobs_index.index_path(root).exists():
+        try:
+            conn = rf_jobs_index.open_index(root)
+            try:
+                rows = rf_jobs_index.fresh_rows(conn, root, apps)
+            finally:
+                conn.close()
+        except (OSError, sqlite3.Error):
+            rows = {}
+    out: Dict[str, Optional[dict]] = {}
+    for a in apps:
+        r = rows.get(a)
+        if r is not None and all(isinstance(r.get(k), str) for k in fields):
+            out[a] = r
+        else:
+            out[a] = _read_meta(a)
+    return out
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Synthetic jobs tree for benchmarks: <root>/01_projects/jobs/<family>/<company>/<date>_<role>
+folders laid out the way job-intake-init / rf_job_folder_writer write them.
+
+  python3 rf_jobs_synth.py /tmp/sb --apps 10000          # <root> = /tmp/sb (a secondbrain root)
+  python3 rf_jobs_synth.py /tmp/sb --apps 100000 --no-jd
+
+Every app gets tracking/job-meta.json, tracking/application-record.json,
+tracking/status-history.md, jd/job-post-url.txt and (unless --no-jd) jd/jd-raw.txt,
+plus the empty notes/ and resume_refs/ folders. Status records are consistent:
+applied / interviewing / rejected / offer apps carry date_applied and the matching
+status_history entries and status-history.md blocks.
+
+The mix follows a real tree rather than a uniform one: a few role families with
+one dominant, companies drawn with a long tail (staffing agencies post a lot),
+dates over a year, about half not_applied, and some noise the tools must cope
+with -- the same posting captured twice (duplicate URL), no job-post-url.txt,
+"unknown" metadata, http:// URLs. JD texts come from rf_bench_jd_terms'
+generator (a pool, each prefixed with the posting's own header).
+
+Output is deterministic for a given --apps / --seed.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from rf_bench_jd_terms import synthetic_jds
+
+FAMILIES = [("qa_automation_engineer", 70), ("sdet", 15), ("qa_engineer", 10), ("performance_test_engineer", 5)]
+STATUSES = [("not_applied", 48), ("applied", 34), ("rejected", 10), ("interviewing", 5), ("offer", 1), ("unknown", 2)]
+
+_SYL = ["ac", "bri", "cor", "dyn", "ex", "for", "gal", "hel", "in", "jun", "kap", "lum", "mer", "nov",
+        "or", "pel", "quan", "ro", "sap", "tek", "ul", "ver", "wave", "xo", "zen"]
+_SUFFIX = ["", "", "_llc", "_inc", "_solutions", "_group", "_technologies", "_consulting", "_labs", "_software"]
+_TITLES = ["QA Automation Engineer", "Senior QA Automation Engineer", "SDET", "Senior SDET",
+           "Software Development Engineer in Test", "QA Engineer", "Lead QA Engineer", "Test Automation Lead",
+           "Quality Engineer", "Senior Quality Engineer", "Performance Test Engineer", "QA Analyst",
+           "Automation Test Engineer", "Consulting QA Test Engineer", "Staff Quality Engineer",
+           "Mobile QA Automation Engineer", "API Test Engineer", "Playwright Automation Engineer"]
+_SENIORITY = ["unknown", "unknown", "mid", "senior", "senior", "lead", "staff"]
+_LOCATION = ["unknown", "remote", "remote", "hybrid", "phoenix_az", "austin_tx", "new_york_ny", "denver_co"]
+_EMPLOYMENT = ["unknown", "full_time", "full_time", "contract", "contract_to_hire"]
+_PRIORITY = ["unknown", "unknown", "low", "medium", "high"]
+_BOARDS = ["https://www.dice.com/job-detail/{u}", "https://www.linkedin.com/jobs/view/{n}",
+           "https://boards.greenhouse.io/{c}/jobs/{n}", "https://jobs.lever.co/{c}/{u}",
+           "https://{c}.wd1.myworkdayjobs.com/en-US/careers/job/{n}", "http://careers.{c}.com/jobs/{n}"]
+
+DUP_URL_RATE = 0.01     # posting captured twice (another folder, same URL)
+NO_POST_URL_RATE = 0.05  # jd/job-post-url.txt never written
+
+
+def _weighted(rnd: random.Random, pairs):
+    return rnd.choices([v for v, _w in pairs], weights=[w for _v, w in pairs])[0]
+
+def _slug(title: str) -> str:
+    return "-".join(title.lower().replace("/", " ").split())
+
+def _company_names(rnd: random.Random, n: int) -> list:
+    out, seen = [], set()
+    while len(out) < n:
+        base = "".join(rnd.choice(_SYL) for _ in range(rnd.randint(2, 3)))
+        name = base + rnd.choice(_SUFFIX)
+        if name in seen:
+            name = f"{name}_{len(out)}"
+        seen.add(name)
+        out.append(name)
+    return out
+
+def _uuid(rnd: random.Random) -> str:
+    h = f"{rnd.getrandbits(128):032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _write(p: str, text: str) -> None:
+    with open(p, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def _status_history(found: str, status: str, applied: str, later: str):
+    """(application-record status_history, status-history.md) for an app's status."""
+    hist = []
+    md = f"# Status History\n\n## {found}\n- Job identified\n- JD captured (pending paste)\n- Application not yet submitted\n"
+    if applied:
+        hist.append({"date": applied, "status": "applied", "note": "Application submitted"})
+        md += f"\n## {applied}\n- Application submitted\n"
+    if later:
+        note = {"interviewing": "Recruiter screen scheduled", "rejected": "Rejection email", "offer": "Offer received"}[status]
+        hist.append({"date": later, "status": status, "note": note})
+        md += f"\n## {later}\n- {note}\n"
+    return hist, md
+
+
+def generate(root: Path, n_apps: int, seed: int = 7, jd: bool = True, end: str = "2026-06-30",
+             span_days: int = 365, jd_pool: int = 400) -> int:
+    """
+    Write n_apps synthetic application folders under root/01_projects/jobs
+    (root = a secondbrain root). Returns the number of folders written.
+    """
+    rnd = random.Random(seed)
+    jobs = Path(root) / "01_projects" / "jobs"
+    last = date.fromisoformat(end)
+    companies = _company_names(rnd, max(1, n_apps // 4))
+    pool = synthetic_jds(min(jd_pool, n_apps), seed=seed) if jd else []
+    urls: list = []
+    used = set()
+    written = 0
+
+    for i in range(n_apps):
+        family = _weighted(rnd, FAMILIES)
+        # long tail: a few companies post most of the jobs
+        company = companies[int(len(companies) * rnd.random() ** 3)]
+        title = rnd.choice(_TITLES)
+        found_d = last - timedelta(days=int(span_days * rnd.random() ** 1.5))
+        found = found_d.isoformat()
+        role = _slug(title)
+        name, k = f"{found}_{role}", 2
+        while f"{family}/{company}/{name}" in used:
+            name, k = f"{found}_{role}-{k}", k + 1
+        rel = f"{family}/{company}/{name}"
+        used.add(rel)
+
+        if urls and rnd.random() < DUP_URL_RATE:
+            url = rnd.choice(urls)
+        else:
+            url = rnd.choice(_BOARDS).format(u=_uuid(rnd), n=rnd.randint(10 ** 6, 10 ** 9), c=company.replace("_", ""))
+            urls.append(url)
+
+        status = _weighted(rnd, STATUSES)
+        applied = later = ""
+        if status in ("applied", "interviewing", "rejected", "offer"):
+            applied = (found_d + timedelta(days=rnd.randint(0, 3))).isoformat()
+        if status in ("interviewing", "rejected", "offer"):
+            later = (date.fromisoformat(applied) + timedelta(days=rnd.randint(3, 30))).isoformat()
+        hist, md = _status_history(found, status, applied, later)
+
+        app = f"{jobs}/{rel}"
+        for sub in ("jd", "tracking", "resume_refs", "notes"):
+            os.makedirs(f"{app}/{sub}", exist_ok=True)
+        meta = {
+            "company": company,
+            "role_family": family,
+            "role_title": title,
+            "seniority": rnd.choice(_SENIORITY),
+            "location": rnd.choice(_LOCATION),
+            "employment_type": rnd.choice(_EMPLOYMENT),
+            "source": url,
+            "date_found": found,
+            "date_applied": applied or None,
+            "status": status,
+            "priority": rnd.choice(_PRIORITY),
+        }
+        record = {
+            "application_id": f"{company}_{name}",
+            "current_status": status,
+            "status_history": hist,
+            "resume_used": None,
+            "cover_letter_used": None,
+            "notes": "",
+        }
+        _write(f"{app}/tracking/job-meta.json", json.dumps(meta, indent=2) + "\n")
+        _write(f"{app}/tracking/application-record.json", json.dumps(record, indent=2) + "\n")
+        _write(f"{app}/tracking/status-history.md", md)
+        if rnd.random() >= NO_POST_URL_RATE:
+            _write(f"{app}/jd/job-post-url.txt", url + "\n")
+        if jd:
+            head = f"{title}\n{company.replace('_', ' ').title()}\nLocation: {meta['location']}\n\n"
+            _write(f"{app}/jd/jd-raw.txt", head + pool[i % len(pool)] + "\n")
+        written += 1
+    return written
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="rf_jobs_synth.py", description="Generate a synthetic jobs tree.")
+    ap.add_argument("root", help="secondbrain root to write into (apps go under <root>/01_projects/jobs)")
+    ap.add_argument("--apps", type=int, default=1000, help="Application folders (default 1000)")
+    ap.add_argument("--seed", type=int, default=7, help="Random seed (default 7)")
+    ap.add_argument("--no-jd", action="store_true", help="Skip jd/jd-raw.txt")
+    args = ap.parse_args(argv)
+
+    root = Path(args.root).expanduser()
+    jobs = root / "01_projects" / "jobs"
+    if jobs.exists() and any(jobs.iterdir()):
+        print(f"ERROR: not empty: {jobs}", file=sys.stderr)
+        return 2
+    t0 = time.perf_counter()
+    n = generate(root, args.apps, seed=args.seed, jd=not args.no_jd)
+    print(f"WROTE: {n} apps under {jobs} ({time.perf_counter() - t0:.1f} s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
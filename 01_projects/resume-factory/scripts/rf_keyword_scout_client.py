@@ -3,11 +3,13 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
-from openai import OpenAI
 from openai import RateLimitError, AuthenticationError
 
+from rf_llm_cache import offline as _llm_offline, response_text, response_text_async
+from rf_openai_pool import get_async_client, get_client
+
 def _keyword_scout_json_schema() -> dict:
     return {
         "name": "keyword_scout",
@@ -74,17 +76,16 @@ def _require(name: str) -> str:
         raise RuntimeError(f"missing required env var: {name}")
     return v
 
-def keyword_scout_openai(
+def _keyword_scout_request(
     *,
     jd_raw: str,
-    baseline_text: str = "",
-    baseline_covered_terms: Optional[list] = None,
-    model: Optional[str] = None,
-    timeout_s: int = 90,
-    extra_instructions: str = "",
+    baseline_text: str,
+    baseline_covered_terms: Optional[list],
+    model: Optional[str],
+    extra_instructions: str,
+    jd_terms: Optional[list] = None,
 ) -> Dict[str, Any]:
-    _require("OPENAI_API_KEY")
-    client = OpenAI(timeout=timeout_s)
+    """responses.create() kwargs for one keyword-scout call (shared by sync/async paths)."""
     model = model or _env("RF_KEYWORD_SCOUT_MODEL", "gpt-4o-mini")
 
     system_prompt = """You are Resume Factory - Keyword Scout.
@@ -123,10 +124,14 @@ JSON CONTRACT:
     if baseline_covered_terms is None:
         baseline_covered_terms = []
     covered_terms = ", ".join([str(x) for x in baseline_covered_terms[:120]]) if baseline_covered_terms else "(none)"
+    distinctive = ", ".join(str(x) for x in jd_terms) if jd_terms else "(none)"
 
     user_prompt = f"""JOB DESCRIPTION (source of truth):
 {jd_raw}
 
+DISTINCTIVE JD TERMS (deterministic hint; most specific to this posting vs. our other postings first):
+{distinctive}
+
 BASELINE RESUME CONTEXT (already covered in the selected template):
 {baseline_block}
 
@@ -138,87 +143,74 @@ Return the JSON contract. Pick the best 10–20 keywords/tools and 3–7 implied
 
 EXTRA INSTRUCTIONS:
 {extra_instructions}"""
-    # If the model returns almost-JSON with a tiny syntax slip, do ONE deterministic repair pass.
-    # This does not change content; it only fixes JSON validity.
-    def _repair_json_once(bad_text: str) -> str:
-        repair_system = """You are a JSON repair bot.
+
+    return {
+        "model": model,
+        "input": [
+            {"role": "system", "content": system_prompt.strip()},
+            {"role": "user", "content": user_prompt.strip()},
+        ],
+    }
+
+# If the model returns almost-JSON with a tiny syntax slip, do ONE deterministic repair pass.
+# This does not change content; it only fixes JSON validity.
+def _repair_request(model: str, bad_text: str) -> Dict[str, Any]:
+    repair_system = """You are a JSON repair bot.
 RULES:
 - Output STRICT JSON ONLY.
 - Do NOT add new items or remove items.
 - Do NOT change meaning.
 - Only fix JSON syntax/escaping/commas/quotes to make it valid JSON that matches the contract.
 """
-        repair_user = f"""JSON_REPAIR_TASK:
+    repair_user = f"""JSON_REPAIR_TASK:
 Fix this into valid JSON (same structure/content; syntax repair only):
 
 {bad_text}
 """
-        r = client.responses.create(
-            model=model,
-            input=[
-                {"role": "system", "content": repair_system.strip()},
-                {"role": "user", "content": repair_user.strip()},
-            ],
-        )
-        out = ""
-        for o in r.output:
-            for c in o.content:
-                if c.type == "output_text":
-                    out += c.text
-        out = (out or "").strip()
-        m = re.match(r"^```(?:json)?\s*(.*?)\s*```\s*$", out, flags=re.DOTALL | re.IGNORECASE)
-        if m:
-            out = m.group(1).strip()
-        return out
+    return {
+        "model": model,
+        "input": [
+            {"role": "system", "content": repair_system.strip()},
+            {"role": "user", "content": repair_user.strip()},
+        ],
+    }
 
-    try:
-        resp = client.responses.create(
-            model=model,
-            input=[
-                {"role": "system", "content": system_prompt.strip()},
-                {"role": "user", "content": user_prompt.strip()},
-            ],
-        )
-    except AuthenticationError as e:
-        raise RuntimeError("OpenAI auth failed (invalid API key).") from e
-    except RateLimitError as e:
-        msg = str(e)
-        if "insufficient_quota" in msg or "check your plan and billing details" in msg:
-            raise RuntimeError("OpenAI quota/billing blocked this request (insufficient_quota).") from e
-        raise
-
-    text = ""
-    for out in resp.output:
-        for c in out.content:
-            if c.type == "output_text":
-                text += c.text
+def _strip_fences(text: str) -> str:
+    t = (text or "").strip()
+    m = re.match(r"^```(?:json)?\s*(.*?)\s*```\s*$", t, flags=re.DOTALL | re.IGNORECASE)
+    return m.group(1).strip() if m else t
+
+def _parse_or_none(text: str) -> Optional[Any]:
     t = (text or "").strip()
     if not t:
         raise RuntimeError("OpenAI returned empty response")
-
     # Strip occasional fenced JSON
-    m = re.match(r"^```(?:json)?\s*(.*?)\s*```\s*$", t, flags=re.DOTALL | re.IGNORECASE)
-    if m:
-        t = m.group(1).strip()
-
     try:
-        data = json.loads(t)
+        return json.loads(_strip_fences(t))
     except json.JSONDecodeError:
-        # one-shot repair
-        fixed = _repair_json_once(text)
-        try:
-            data = json.loads(fixed)
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"OpenAI response was not valid JSON (even after repair):\n{text}") from e
+        return None
+
+def _parse_repaired(fixed: str, original: str) -> Any:
+    try:
+        return json.loads(_strip_fences(fixed))
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"OpenAI response was not valid JSON (even after repair):\n{original}") from e
+
+def _raise_api_error(e: Exception) -> None:
+    if isinstance(e, AuthenticationError):
+        raise RuntimeError("OpenAI auth failed (invalid API key).") from e
+    msg = str(e)
+    if "insufficient_quota" in msg or "check your plan and billing details" in msg:
+        raise RuntimeError("OpenAI quota/billing blocked this request (insufficient_quota).") from e
+    raise e
 
+def _finish(data: Any) -> Dict[str, Any]:
     if not isinstance(data, dict):
         raise RuntimeError("Invalid response: top-level must be an object")
     # Normalize model type drift deterministically.
     # The contract allows only: "keyword" or "tool".
-    def _normalize_keyword_scout_types(obj: dict) -> None:
-        items = obj.get("keywords_tools_ranked")
-        if not isinstance(items, list):
-            return
+    items = data.get("keywords_tools_ranked")
+    if isinstance(items, list):
         for it in items:
             if not isinstance(it, dict):
                 continue
@@ -228,7 +220,94 @@ Fix this into valid JSON (same structure/content; syntax repair only):
             else:
                 # anything else becomes keyword (protocol, language, etc.)
                 it["type"] = "keyword"
+    return data
 
-    _normalize_keyword_scout_types(data)
 
-    return data
+def _cacheable(accept: Optional[Callable[[Dict[str, Any]], bool]]) -> Callable[[str], bool]:
+    """LLM-cache gate: only responses that parse (and pass the caller's schema check) are cached."""
+    def ok(text: str) -> bool:
+        data = _parse_or_none(text)
+        return data is not None and (accept is None or bool(accept(_finish(data))))
+    return ok
+
+
+def keyword_scout_openai(
+    *,
+    jd_raw: str,
+    baseline_text: str = "",
+    baseline_covered_terms: Optional[list] = None,
+    model: Optional[str] = None,
+    timeout_s: int = 90,
+    extra_instructions: str = "",
+    jd_terms: Optional[list] = None,
+    accept: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Dict[str, Any]:
+    if not _llm_offline():
+        _require("OPENAI_API_KEY")
+
+    def _client():
+        return get_client(timeout_s)
+
+    req = _keyword_scout_request(
+        jd_raw=jd_raw,
+        baseline_text=baseline_text,
+        baseline_covered_terms=baseline_covered_terms,
+        model=model,
+        extra_instructions=extra_instructions,
+        jd_terms=jd_terms,
+    )
+    try:
+        text = response_text(_client, label="keyword_scout", validate=_cacheable(accept), **req)
+    except (AuthenticationError, RateLimitError) as e:
+        _raise_api_error(e)
+
+    data = _parse_or_none(text)
+    if data is None:
+        # one-shot repair
+        fixed = response_text(
+            _client, label="keyword_scout.repair", validate=_cacheable(accept), **_repair_request(req["model"], text)
+        )
+        data = _parse_repaired(fixed, text)
+    return _finish(data)
+
+
+async def keyword_scout_openai_async(
+    *,
+    jd_raw: str,
+    baseline_text: str = "",
+    baseline_covered_terms: Optional[list] = None,
+    model: Optional[str] = None,
+    timeout_s: int = 90,
+    extra_instructions: str = "",
+    jd_terms: Optional[list] = None,
+    accept: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Dict[str, Any]:
+    """
+    keyword_scout_openai() on the pooled AsyncOpenAI client (for asyncio.gather fan-out).
+    """
+    if not _llm_offline():
+        _require("OPENAI_API_KEY")
+
+    def _client():
+        return get_async_client(timeout_s)
+
+    req = _keyword_scout_request(
+        jd_raw=jd_raw,
+        baseline_text=baseline_text,
+        baseline_covered_terms=baseline_covered_terms,
+        model=model,
+        extra_instructions=extra_instructions,
+        jd_terms=jd_terms,
+    )
+    try:
+        text = await response_text_async(_client, label="keyword_scout", validate=_cacheable(accept), **req)
+    except (AuthenticationError, RateLimitError) as e:
+        _raise_api_error(e)
+
+    data = _parse_or_none(text)
+    if data is None:
+        fixed = await response_text_async(
+            _client, label="keyword_scout.repair", validate=_cacheable(accept), **_repair_request(req["model"], text)
+        )
+        data = _parse_repaired(fixed, text)
+    return _finish(data)
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# -----------------------------------------------------------------------------
+# Content-addressed LLM response cache (shared by every rf_*_client)
+# -----------------------------------------------------------------------------
+#
+# Key = sha256 over the exact responses.create() arguments (model, temperature,
+# top_p, system + user messages, any schema / text format), so a byte-identical
+# prompt never pays for a second call. Layout: <cache_dir>/<key[:2]>/<key>.json:
+#   { key, v, label, model, created_at, text }
+#
+# RF_LLM_CACHE modes:
+#   on (default) -> read + write
+#   refresh      -> always call the API, overwrite the entry
+#   replay       -> offline: serve hits only, a miss is an error (no API key needed)
+#   off          -> bypass entirely
+#
+# Callers pass validate=<text -> bool> (their JSON / schema check): a response is only
+# written once it passes, and a cached entry that no longer passes is dropped and
+# treated as a miss, so a bad response is never replayed.
+#
+# Other env:
+#   RF_LLM_CACHE_DIR     default ~/secondbrain/07_system/cache/llm
+#   RF_LLM_CACHE_MAX_MB  LRU size cap (mtime = last use), default 100
+#   RF_LLM_CACHE_STATS   1 -> print this process's hit/miss line to stderr at exit
+#
+# Cumulative hit/miss counters are kept in <cache_dir>/stats.json
+# (python3 rf_llm_cache.py stats).
+
+KEY_VERSION = 1
+MODES = ("on", "refresh", "replay", "off")
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    v = os.environ.get(name)
+    return v if (v is not None and v != "") else default
+
+def mode() -> str:
+    m = (_env("RF_LLM_CACHE", "on") or "on").strip().lower()
+    if m in ("0", "false", "no"):
+        return "off"
+    return m if m in MODES else "on"
+
+def offline() -> bool:
+    return mode() == "replay"
+
+def cache_dir() -> Path:
+    return Path(_env("RF_LLM_CACHE_DIR", os.path.expanduser("~/secondbrain/07_system/cache/llm")))
+
+def _max_bytes() -> int:
+    return int(float(_env("RF_LLM_CACHE_MAX_MB", "100")) * 1024 * 1024)
+
+
+class CacheMiss(RuntimeError):
+    """Raised in replay mode when a prompt has no cached response."""
+
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "writes": 0}
+_pruned = False
+_atexit_registered = False
+
+def stats() -> Dict[str, int]:
+    """This process's counters: {"hits", "misses", "writes"}."""
+    with _lock:
+        return dict(_stats)
+
+
+def cache_key(create_kwargs: Dict[str, Any]) -> str:
+    payload = json.dumps({"v": KEY_VERSION, "req": create_kwargs}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _entry_path(key: str) -> Path:
+    return cache_dir() / key[:2] / f"{key}.json"
+
+def _read(key: str) -> Optional[str]:
+    p = _entry_path(key)
+    try:
+        d = json.loads(p.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(d, dict) or d.get("key") != key or not isinstance(d.get("text"), str):
+        return None
+    try:
+        os.utime(p)  # LRU: mtime = last use
+    except OSError:
+        pass
+    return d["text"]
+
+def _write(key: str, label: str, model: Any, text: str) -> None:
+    p = _entry_path(key)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps({
+        "key": key,
+        "v": KEY_VERSION,
+        "label": label,
+        "model": model,
+        "created_at": time.time(),
+        "text": text,
+    }, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, p)
+
+
+def prune(max_bytes: Optional[int] = None) -> Dict[str, int]:
+    """
+    LRU-evict entries until the cache fits max_bytes. Returns {"kept", "evicted", "bytes"}.
+    """
+    d = cache_dir()
+    if not d.is_dir():
+        return {"kept": 0, "evicted": 0, "bytes": 0}
+    max_bytes = _max_bytes() if max_bytes is None else max_bytes
+    live = []
+    for p in d.glob("??/*.json"):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        live.append((st.st_mtime, st.st_size, p))
+    total = sum(sz for _, sz, _ in live)
+    live.sort()  # least recently used first
+    evicted = 0
+    while live and total > max_bytes:
+        _, sz, p = live.pop(0)
+        p.unlink(missing_ok=True)
+        total -= sz
+        evicted += 1
+    return {"kept": len(live), "evicted": evicted, "bytes": total}
+
+def _housekeeping_once() -> None:
+    global _pruned, _atexit_registered
+    with _lock:
+        if _pruned:
+            return
+        _pruned = True
+        if not _atexit_registered:
+            atexit.register(_flush_stats)
+            _atexit_registered = True
+    try:
+        prune()
+    except Exception:
+        # never fail a pipeline step on cache housekeeping
+        pass
+
+
+def _flush_stats() -> None:
+    s = stats()
+    if not any(s.values()):
+        return
+    if _env("RF_LLM_CACHE_STATS") == "1":
+        print(f"LLM_CACHE: mode={mode()} hits={s['hits']} misses={s['misses']} writes={s['writes']}", file=sys.stderr)
+    p = cache_dir() / "stats.json"
+    try:
+        total = json.loads(p.read_text(encoding="utf-8")) if p.exists() else {}
+        for k, v in s.items():
+            total[k] = int(total.get(k, 0)) + v
+        total["updated_at"] = time.time()
+        tmp = p.with_name(f".stats.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(total, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, p)
+    except Exception:
+        pass
+
+
+def _output_text(resp: Any) -> str:
+    text = ""
+    for out in resp.output:
+        for c in out.content:
+            if c.type == "output_text":
+                text += c.text
+    return text
+
+def _accepted(validate: Optional[Callable[[str], bool]], text: str) -> bool:
+    if validate is None:
+        return True
+    try:
+        return bool(validate(text))
+    except Exception:
+        return False
+
+def _lookup(m: str, key: str, label: str, validate: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+    """Cache read for modes that read; counts hits/misses. Raises CacheMiss in replay."""
+    if m in ("on", "replay"):
+        _housekeeping_once()
+        text = _read(key)
+        if text is not None and not _accepted(validate, text):
+            # written before the caller validated, or the check got stricter
+            _entry_path(key).unlink(missing_ok=True)
+            text = None
+        if text is not None:
+            with _lock:
+                _stats["hits"] += 1
+            return text
+        with _lock:
+            _stats["misses"] += 1
+        if m == "replay":
+            raise CacheMiss(
+                f"LLM cache miss in replay mode ({label or 'request'}, key {key[:12]}); "
+                "re-run with RF_LLM_CACHE=on to call the API"
+            )
+    elif m == "refresh":
+        _housekeeping_once()
+        with _lock:
+            _stats["misses"] += 1
+    return None
+
+def _store(m: str, key: str, label: str, create_kwargs: Dict[str, Any], text: str,
+           validate: Optional[Callable[[str], bool]] = None) -> None:
+    # empty or rejected output is never cached (callers treat it as an error and may retry)
+    if m != "off" and text.strip() and _accepted(validate, text):
+        _write(key, label, create_kwargs.get("model"), text)
+        with _lock:
+            _stats["writes"] += 1
+
+
+def response_text(make_client: Callable[[], Any], *, label: str = "",
+                  validate: Optional[Callable[[str], bool]] = None, **create_kwargs: Any) -> str:
+    """
+    Cached equivalent of:
+        resp = make_client().responses.create(**create_kwargs)
+        "".join(output_text parts)
+    make_client is only called on a miss, so replay mode never needs credentials.
+    API errors (auth, rate limit) propagate unchanged; callers keep their handling.
+    validate(text) -> bool gates the write (False / raising = returned but not cached);
+    callers still parse and raise their own errors on the returned text.
+    """
+    m = mode()
+    key = cache_key(create_kwargs) if m != "off" else ""
+    text = _lookup(m, key, label, validate)
+    if text is not None:
+        return text
+    text = _output_text(make_client().responses.create(**create_kwargs))
+    _store(m, key, label, create_kwargs, text, validate)
+    return text
+
+async def response_text_async(make_client: Callable[[], Any], *, label: str = "",
+                              validate: Optional[Callable[[str], bool]] = None, **create_kwargs: Any) -> str:
+    """
+    response_text() for AsyncOpenAI clients; same keys, so sync and async calls share entries.
+    """
+    m = mode()
+    key = cache_key(create_kwargs) if m != "off" else ""
+    text = _lookup(m, key, label, validate)
+    if text is not None:
+        return text
+    text = _output_text(await make_client().responses.create(**create_kwargs))
+    _store(m, key, label, create_kwargs, text, validate)
+    return text
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="rf_llm_cache", description="Inspect / maintain the LLM response cache.")
+    ap.add_argument("cmd", choices=["stats", "prune", "clear"])
+    ap.add_argument("--max-mb", type=float, default=None, help="prune: size cap (default RF_LLM_CACHE_MAX_MB)")
+    args = ap.parse_args(argv)
+
+    d = cache_dir()
+    if args.cmd == "stats":
+        files = list(d.glob("??/*.json")) if d.is_dir() else []
+        size = sum(p.stat().st_size for p in files)
+        total = {}
+        try:
+            total = json.loads((d / "stats.json").read_text(encoding="utf-8"))
+        except Exception:
+            pass
+        hits, misses = int(total.get("hits", 0)), int(total.get("misses", 0))
+        rate = (100.0 * hits / (hits + misses)) if (hits + misses) else 0.0
+        print(f"DIR: {d}")
+        print(f"MODE: {mode()}")
+        print(f"ENTRIES: {len(files)}  BYTES: {size}")
+        print(f"HITS: {hits}  MISSES: {misses}  WRITES: {int(total.get('writes', 0))}  HIT_RATE: {rate:.1f}%")
+    elif args.cmd == "prune":
+        mb = args.max_mb
+        print(json.dumps(prune(None if mb is None else int(mb * 1024 * 1024))))
+    else:
+        n = 0
+        for p in d.glob("??/*.json") if d.is_dir() else []:
+            p.unlink(missing_ok=True)
+            n += 1
+        print(f"CLEARED: {n}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+from typing import List, Optional
+
+from docx.opc.oxml import serialize_part_xml
+from docx.oxml.parser import parse_xml
+from docx.parts.styles import StylesPart
+from docx.styles.styles import Styles
+from docx.text.paragraph import Paragraph
+
+# -----------------------------------------------------------------------------
+# Lightweight DOCX patcher (resume-approve-edits and any tool that edits a template)
+# -----------------------------------------------------------------------------
+#
+# docx.Document() loads every package part (styles, numbering, theme, headers,
+# settings, fonts ...) into an object graph just so a few paragraphs can change,
+# and save() re-serializes all of it. DocxPatch parses ONLY the main document
+# part (word/document.xml) with python-docx's own oxml classes, so the same
+# Paragraph / Run API (runs, bold, font, paragraph_format, addnext) keeps working
+# and run properties are untouched unless an edit changes them. save() writes
+# the patched document.xml and copies every other zip member unchanged (same
+# bytes, names, order, timestamps and compression).
+#
+# Body text for diffs comes from the already-parsed tree (text_lines()), and
+# docx_text() reads another file's text the same cheap way.
+#
+# paragraph.style / run.style resolve against the styles part, read from the zip
+# on first use (style definitions are read-only here; assigning a style only
+# writes the style id into document.xml). Not supported through this path:
+# anything needing other parts (images, hyperlinks, headers) -- accessing those
+# raises AttributeError. Use docx.Document for them.
+
+def _rel_re(rel_type: str) -> re.Pattern:
+    return re.compile(
+        rb'<Relationship[^>]*Type="[^"]*/' + rel_type.encode() + rb'"[^>]*Target="([^"]+)"'
+        rb'|<Relationship[^>]*Target="([^"]+)"[^>]*Type="[^"]*/' + rel_type.encode() + rb'"'
+    )
+
+_MAIN_REL = _rel_re("officeDocument")
+_STYLES_REL = _rel_re("styles")
+
+def _main_part_name(zf: zipfile.ZipFile) -> str:
+    try:
+        m = _MAIN_REL.search(zf.read("_rels/.rels"))
+    except KeyError:
+        m = None
+    if m:
+        return (m.group(1) or m.group(2)).decode("utf-8").lstrip("/")
+    return "word/document.xml"
+
+def _styles_part_name(zf: zipfile.ZipFile, main: str) -> Optional[str]:
+    """styles.xml named by the main part's rels (targets are relative to its folder)."""
+    folder, _, name = main.rpartition("/")
+    try:
+        m = _STYLES_REL.search(zf.read(f"{folder}/_rels/{name}.rels" if folder else f"_rels/{name}.rels"))
+    except KeyError:
+        return None
+    if not m:
+        return None
+    target = (m.group(1) or m.group(2)).decode("utf-8")
+    return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(folder, target))
+
+
+class _StylesOnlyPart:
+    """
+    Stand-in for python-docx's DocumentPart as Paragraph / Run see it (`.part`):
+    style lookups work, everything else (images, hyperlink rels ...) is an AttributeError.
+    """
+
+    def __init__(self, styles: Styles):
+        self.styles = styles
+
+    def get_style(self, style_id, style_type):
+        return self.styles.get_by_id(style_id, style_type)
+
+    def get_style_id(self, style_or_name, style_type):
+        return self.styles.get_style_id(style_or_name, style_type)
+
+    def __getattr__(self, name):
+        raise AttributeError(f"DocxPatch exposes only styles, not part.{name} (images, hyperlinks, headers); "
+                             "use docx.Document")
+
+
+class _Body:
+    """Minimal parent for Paragraph objects (python-docx only needs `.part` for styles)."""
+
+    def __init__(self, element, owner: "DocxPatch"):
+        self._element = element
+        self._parent = owner
+
+    @property
+    def part(self) -> _StylesOnlyPart:
+        return self._parent.styles_part()
+
+
+class DocxPatch:
+    """
+    Document-like object over one .docx: .paragraphs (body-level, as
+    docx.Document().paragraphs), .element, text_lines(), save().
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with zipfile.ZipFile(self.path) as zf:
+            self.part_name = _main_part_name(zf)
+            self.element = parse_xml(zf.read(self.part_name))
+        self._body = _Body(self.element.body, self)
+        self._styles_part: Optional[_StylesOnlyPart] = None
+
+    def styles_part(self) -> _StylesOnlyPart:
+        """Styles for paragraph/run .style, parsed on first use (python-docx defaults if the package has none)."""
+        if self._styles_part is None:
+            with zipfile.ZipFile(self.path) as zf:
+                name = _styles_part_name(zf, self.part_name)
+                try:
+                    xml = zf.read(name) if name else None
+                except KeyError:
+                    xml = None
+            self._styles_part = _StylesOnlyPart(Styles(parse_xml(xml or StylesPart._default_styles_xml())))
+        return self._styles_part
+
+    @property
+    def body(self):
+        return self.element.body
+
+    @property
+    def paragraphs(self) -> List[Paragraph]:
+        return [Paragraph(p, self._body) for p in self.element.body.p_lst]
+
+    def text_lines(self) -> List[str]:
+        return [(p.text or "").rstrip() for p in self.paragraphs]
+
+    def text(self) -> str:
+        """Same shape as resume-approve-edits' diff text: paragraph lines, stripped, trailing newline."""
+        return "\n".join(self.text_lines()).strip() + "\n"
+
+    def document_xml(self) -> bytes:
+        return serialize_part_xml(self.element)
+
+    def save(self, out_path: Path) -> Path:
+        """Write the patched document.xml + every other member copied as-is (atomic replace)."""
+        out_path = Path(out_path)
+        tmp = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+        with zipfile.ZipFile(self.path) as src, zipfile.ZipFile(tmp, "w") as dst:
+            for info in src.infolist():
+                data = self.document_xml() if info.filename == self.part_name else src.read(info)
+                dst.writestr(info, data, compress_type=info.compress_type)
+        os.replace(tmp, out_path)
+        return out_path
+
+
+def open_docx(path: Path) -> DocxPatch:
+    return DocxPatch(path)
+
+def docx_text(path: Path) -> str:
+    """Paragraph text of a .docx (body-level paragraphs), without loading the package."""
+    return DocxPatch(path).text()
@@ -4,9 +4,11 @@ import json
 import os
 from typing import Any, Dict, List, Optional
 
-from openai import OpenAI
 from openai import RateLimitError, AuthenticationError
 
+from rf_llm_cache import offline as _llm_offline, response_text
+from rf_openai_pool import get_client
+
 def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     v = os.environ.get(name)
     return v if (v is not None and v != "") else default
@@ -17,6 +19,31 @@ def _require(name: str) -> str:
         raise RuntimeError(f"missing required env var: {name}")
     return v
 
+def _parse_edits(text: str) -> Dict[str, Any]:
+    text = (text or "").strip()
+    if not text:
+        raise RuntimeError("OpenAI returned empty response")
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"OpenAI response was not valid JSON:\n{text}") from e
+
+    if not isinstance(data, dict) or "proposals" not in data:
+        raise RuntimeError(f"Invalid response shape: {data}")
+
+    narrative = data.get("narrative", None)
+    if narrative is not None and not isinstance(narrative, str):
+        raise RuntimeError(f"Invalid narrative type: {type(narrative)}")
+
+    if not isinstance(data["proposals"], list):
+        raise RuntimeError("Invalid proposals type: proposals must be a list")
+
+    return {
+        "narrative": narrative,
+        "proposals": data["proposals"],
+    }
+
 def propose_edits_openai(
     *,
     jd_raw: str,
@@ -27,9 +54,12 @@ def propose_edits_openai(
     max_proposals: int = 12,
     timeout_s: int = 60,
 ) -> Dict[str, Any]:
-    _require("OPENAI_API_KEY")
+    if not _llm_offline():
+        _require("OPENAI_API_KEY")
+
+    def _client():
+        return get_client(timeout_s)
 
-    client = OpenAI(timeout=timeout_s)
     model = model or _env("RF_OPENAI_MODEL", "gpt-4o-mini")
 
     jd_terms = [t.strip() for t in (jd_terms or []) if isinstance(t, str) and t.strip()]
@@ -134,7 +164,10 @@ Propose JD-aligned edits. Anchor each proposal to an existing numbered resume li
 """
 
     try:
-        resp = client.responses.create(
+        text = response_text(
+            _client,
+            label="propose_edits",
+            validate=_parse_edits,
             model=model,
             input=[
                 {"role": "system", "content": system_prompt.strip()},
@@ -154,33 +187,4 @@ Propose JD-aligned edits. Anchor each proposal to an existing numbered resume li
             ) from e
         raise
 
-    text = ""
-    for out in resp.output:
-        for c in out.content:
-            if c.type == "output_text":
-                text += c.text
-
-    text = text.strip()
-    if not text:
-        raise RuntimeError("OpenAI returned empty response")
-
-    try:
-        data = json.loads(text)
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"OpenAI response was not valid JSON:\n{text}") from e
-
-    if not isinstance(data, dict) or "proposals" not in data:
-        raise RuntimeError(f"Invalid response shape: {data}")
-
-    narrative = data.get("narrative", None)
-    if narrative is not None and not isinstance(narrative, str):
-        raise RuntimeError(f"Invalid narrative type: {type(narrative)}")
-
-    if not isinstance(data["proposals"], list):
-        raise RuntimeError("Invalid proposals type: proposals must be a list")
-
-    return {
-        "narrative": narrative,
-        "proposals": data["proposals"],
-    }
-
+    return _parse_edits(text)
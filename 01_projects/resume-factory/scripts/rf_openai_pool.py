@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from typing import Optional
+
+from openai import AsyncOpenAI, OpenAI
+
+# -----------------------------------------------------------------------------
+# Shared OpenAI clients (connection pooling)
+# -----------------------------------------------------------------------------
+#
+# An OpenAI client owns an HTTP connection pool; building one per call (as the
+# rf_*_client modules used to) pays a fresh TCP + TLS handshake every request.
+# These factories hand out ONE client per process and per-call timeouts via
+# with_options(), which returns a view sharing the same pool.
+#
+# Async clients are bound to the event loop they first ran on, so the async
+# factory keeps one client per loop.
+
+_lock = threading.Lock()
+_client: Optional[OpenAI] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+def get_client(timeout_s: Optional[float] = None) -> OpenAI:
+    """
+    Process-wide sync client (thread-safe). timeout_s applies to calls made through
+    the returned handle only.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = OpenAI()
+        c = _client
+    return c.with_options(timeout=timeout_s) if timeout_s else c
+
+def get_async_client(timeout_s: Optional[float] = None) -> AsyncOpenAI:
+    """
+    Async client for the running event loop (call from inside a coroutine).
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        c = _async_clients.get(loop)
+        if c is None:
+            c = AsyncOpenAI()
+            _async_clients[loop] = c
+    return c.with_options(timeout=timeout_s) if timeout_s else c
+
+async def aclose_async_client() -> None:
+    """
+    Close this loop's async client (call before asyncio.run() returns to avoid
+    'Event loop is closed' warnings from pooled connections).
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        c = _async_clients.pop(loop, None)
+    if c is not None:
+        await c.close()
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import io
+import os
+import shutil
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# -----------------------------------------------------------------------------
+# DAG runner for resume pipeline steps (resume-generate-one / resume-generate-batch)
+# -----------------------------------------------------------------------------
+#
+# Steps are the 07_system/bin CLIs. In "inprocess" mode each tool script is loaded
+# once as a module and its main(argv) is called in a worker thread, so docx/openai
+# and the rf_* helpers are imported once and shared (pooled OpenAI client, LLM
+# cache). stdout/stderr are captured per thread into the same per-step log files
+# the subprocess mode writes. "subprocess" mode runs each step as before
+# (separate interpreter), which is easier to debug.
+#
+# A step starts once all of its deps have succeeded; independent steps run in
+# parallel (up to `jobs`). After the first failure nothing new is started, the
+# in-flight steps finish, and the failure is reported. An optional skip(step)
+# hook, called on the main thread when a step becomes ready, can mark it up to
+# date instead of running it (see rf_step_state).
+#
+# Many apps at once (resume-generate-batch): each app gets its own run_dag() call,
+# and all of them submit into one StepPools. LLM steps (network-bound) run in-process
+# on a thread pool whose size is the global LLM concurrency limit; local steps
+# (template selection, DOCX patching) go to a process pool so CPU work is not
+# serialized behind the GIL and never waits for an LLM slot.
+
+MODES = ("inprocess", "subprocess")
+
+# steps whose time is spent waiting on the OpenAI API
+LLM_STEPS = frozenset({"resume-keyword-scout", "resume-ideal-profile", "resume-map-ideal-edits"})
+
+@dataclass(frozen=True)
+class Step:
+    n: int                      # 1-based position in the printed plan (log prefix, --from/--to-step)
+    name: str                   # tool name, e.g. "resume-select"
+    cmd: List[str]              # argv, cmd[0] == name
+    deps: Tuple[str, ...] = ()  # names of steps that must succeed first
+
+
+@dataclass
+class StepResult:
+    step: Step
+    returncode: int
+    stdout_path: Path
+    stderr_path: Path
+    elapsed_s: float
+    error: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def record(self) -> Dict[str, Any]:
+        rec = {
+            "n": self.step.n,
+            "cmd": self.step.cmd,
+            "returncode": int(self.returncode),
+            "stdout_path": str(self.stdout_path),
+            "stderr_path": str(self.stderr_path),
+            "elapsed_s": round(self.elapsed_s, 3),
+        }
+        if self.error:
+            rec["error"] = self.error
+        rec.update(self.extra)
+        return rec
+
+
+# --- per-thread stdout/stderr ------------------------------------------------
+
+class _ThreadLocalStream(io.TextIOBase):
+    """
+    Stand-in for sys.stdout / sys.stderr: writes from a thread that registered a
+    buffer go there, everything else goes to the real stream.
+    """
+
+    def __init__(self, real):
+        self._real = real
+        self._local = threading.local()
+
+    def set_target(self, buf: Optional[io.StringIO]) -> None:
+        self._local.buf = buf
+
+    def _target(self):
+        return getattr(self._local, "buf", None) or self._real
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def flush(self):
+        return self._target().flush()
+
+    def isatty(self):
+        return False
+
+    @property
+    def encoding(self):
+        return getattr(self._real, "encoding", "utf-8")
+
+_install_lock = threading.Lock()
+
+def _install_streams() -> Tuple[_ThreadLocalStream, _ThreadLocalStream]:
+    with _install_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStream):
+            sys.stdout = _ThreadLocalStream(sys.stdout)
+        if not isinstance(sys.stderr, _ThreadLocalStream):
+            sys.stderr = _ThreadLocalStream(sys.stderr)
+        return sys.stdout, sys.stderr
+
+
+# --- tool loading --------------------------------------------------------------
+
+_tools: Dict[str, Any] = {}
+_tools_lock = threading.Lock()
+
+def _bin_dir() -> Path:
+    return Path.home() / "secondbrain" / "07_system" / "bin"
+
+def tool_path(name: str) -> Optional[Path]:
+    p = shutil.which(name)
+    if p:
+        return Path(p)
+    cand = _bin_dir() / name
+    return cand if cand.is_file() else None
+
+def load_tool(name: str):
+    """
+    Import a hyphen-named CLI script (no .py) as a module, once per process.
+    Raises FileNotFoundError when the tool is not on PATH / in 07_system/bin.
+    """
+    with _tools_lock:
+        mod = _tools.get(name)
+        if mod is not None:
+            return mod
+        p = tool_path(name)
+        if p is None:
+            raise FileNotFoundError(f"command not found: {name}")
+        mod_name = "rf_tool_" + name.replace("-", "_")
+        loader = SourceFileLoader(mod_name, str(p))
+        mod = module_from_spec(spec_from_loader(mod_name, loader))
+        loader.exec_module(mod)
+        if not callable(getattr(mod, "main", None)):
+            raise RuntimeError(f"{name} has no main(argv) entry point")
+        _tools[name] = mod
+        return mod
+
+
+# --- step execution ------------------------------------------------------------
+
+def _exit_code(e: SystemExit) -> int:
+    code = e.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # SystemExit("message") prints the message and exits 1
+    print(code, file=sys.stderr)
+    return 1
+
+def run_inprocess(step: Step, out_p: Path, err_p: Path) -> StepResult:
+    out_s, err_s = _install_streams()
+    out_buf, err_buf = io.StringIO(), io.StringIO()
+    t0 = time.perf_counter()
+    rc, error = 0, None
+    out_s.set_target(out_buf)
+    err_s.set_target(err_buf)
+    try:
+        try:
+            load_tool(step.name).main(step.cmd[1:])
+        except SystemExit as e:
+            rc = _exit_code(e)
+        except FileNotFoundError as e:
+            rc, error = 127, str(e)
+            print(error, file=sys.stderr)
+        except Exception:
+            rc = 1
+            traceback.print_exc()
+    finally:
+        out_s.set_target(None)
+        err_s.set_target(None)
+    out_p.write_text(out_buf.getvalue(), encoding="utf-8")
+    err_p.write_text(err_buf.getvalue(), encoding="utf-8")
+    return StepResult(step, rc, out_p, err_p, time.perf_counter() - t0, error)
+
+def run_subprocess(step: Step, out_p: Path, err_p: Path) -> StepResult:
+    import subprocess
+    t0 = time.perf_counter()
+    try:
+        r = subprocess.run(step.cmd, text=True, capture_output=True, env=os.environ.copy())
+    except FileNotFoundError:
+        msg = f"command not found: {step.cmd[0] if step.cmd else ''}"
+        out_p.write_text("", encoding="utf-8")
+        err_p.write_text(msg + "\n", encoding="utf-8")
+        return StepResult(step, 127, out_p, err_p, time.perf_counter() - t0, msg)
+    out_p.write_text(r.stdout or "", encoding="utf-8")
+    err_p.write_text(r.stderr or "", encoding="utf-8")
+    return StepResult(step, int(r.returncode), out_p, err_p, time.perf_counter() - t0)
+
+
+def run_dag(
+    steps: List[Step],
+    selected: Set[int],
+    logs_dir: Path,
+    mode: str = "inprocess",
+    jobs: int = 2,
+    on_result: Optional[Callable[[StepResult], None]] = None,
+    skip: Optional[Callable[[Step], bool]] = None,
+    submit: Optional[Callable[[Step, Path, Path], Future]] = None,
+) -> List[StepResult]:
+    """
+    Run the steps whose n is in `selected`. Unselected steps count as already
+    satisfied (that is what --from-step/--to-step mean). When skip(step) returns
+    True the step is recorded as skipped (rc 0, extra["skipped"]) without running.
+    submit(step, stdout_path, stderr_path) -> Future[StepResult] replaces the
+    private `jobs`-sized pool (e.g. StepPools.submit; mode/jobs are then unused).
+    Returns results in completion order; the caller checks returncodes.
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown mode: {mode}")
+    runner = run_inprocess if mode == "inprocess" else run_subprocess
+    by_name = {s.name: s for s in steps}
+    for s in steps:
+        for d in s.deps:
+            if d not in by_name:
+                raise ValueError(f"step {s.name} depends on unknown step {d}")
+
+    if mode == "inprocess" and submit is None:
+        # import every tool up front (main thread): module import is not something
+        # to race, and a missing tool should fail before anything runs
+        for s in steps:
+            if s.n in selected:
+                try:
+                    load_tool(s.name)
+                except FileNotFoundError:
+                    pass  # reported as rc=127 when the step runs
+
+    done: Set[str] = {s.name for s in steps if s.n not in selected}
+    pending = [s for s in steps if s.n in selected]
+    results: List[StepResult] = []
+    failed = False
+
+    def _finish(res: StepResult) -> None:
+        nonlocal failed
+        results.append(res)
+        if on_result is not None:
+            on_result(res)
+        if res.returncode == 0:
+            done.add(res.step.name)
+        else:
+            failed = True
+
+    own_pool = ThreadPoolExecutor(max_workers=max(1, jobs)) if submit is None else nullcontext()
+    with own_pool as pool:
+        if submit is None:
+            submit = partial(pool.submit, runner)
+        running = {}
+        while pending or running:
+            progressed = True
+            while progressed and not failed:
+                # skipped steps complete immediately and may unblock others
+                progressed = False
+                for s in [s for s in pending if all(d in done for d in s.deps)]:
+                    pending.remove(s)
+                    prefix = f"{s.n:02d}_{s.name}"
+                    out_p, err_p = logs_dir / f"{prefix}.stdout.log", logs_dir / f"{prefix}.stderr.log"
+                    if skip is not None and skip(s):
+                        _finish(StepResult(s, 0, out_p, err_p, 0.0, extra={"skipped": True}))
+                        progressed = True
+                    else:
+                        running[submit(s, out_p, err_p)] = (s, out_p, err_p)
+            if not running:
+                break  # failure upstream (or a dependency cycle): nothing more can start
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in finished:
+                s, out_p, err_p = running.pop(fut)
+                try:
+                    res = fut.result()
+                except Exception as e:  # worker died (e.g. BrokenProcessPool)
+                    res = StepResult(s, 1, out_p, err_p, 0.0, f"{type(e).__name__}: {e}")
+                _finish(res)
+    if pending and not failed:
+        raise ValueError("dependency cycle among steps: " + ", ".join(s.name for s in pending))
+    return results
+
+
+class StepPools:
+    """
+    Executors shared by many run_dag() calls. LLM_STEPS run in-process on `llm_jobs`
+    threads (shared OpenAI client / LLM cache; the pool size IS the global LLM
+    concurrency limit). Other steps run in-process inside `cpu_jobs` worker
+    processes (each imports the tools once); cpu_jobs=0 runs them on a thread pool
+    of the same process instead.
+    """
+
+    def __init__(self, llm_jobs: int = 4, cpu_jobs: int = 2):
+        self.llm = ThreadPoolExecutor(max_workers=max(1, llm_jobs), thread_name_prefix="rf-llm")
+        if cpu_jobs > 0:
+            # process pool machinery (multiprocessing) only when worker processes are used
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import get_context
+            # spawn, not fork: the parent already runs threads (fork could copy held locks)
+            self.cpu = ProcessPoolExecutor(max_workers=cpu_jobs, mp_context=get_context("spawn"))
+        else:
+            self.cpu = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rf-local")
+
+    def submit(self, step: Step, out_p: Path, err_p: Path) -> Future:
+        pool = self.llm if step.name in LLM_STEPS else self.cpu
+        return pool.submit(run_inprocess, step, out_p, err_p)
+
+    def shutdown(self) -> None:
+        self.llm.shutdown(wait=True)
+        self.cpu.shutdown(wait=True)
+
+    def __enter__(self) -> "StepPools":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
@@ -3,11 +3,14 @@ from __future__ import annotations
 import json
 import re
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from openai import OpenAI
 from openai import RateLimitError, AuthenticationError
 
+from rf_llm_cache import offline as _llm_offline, response_text
+from rf_openai_pool import get_client
+from rf_skill_taxonomy import detect_primary_stack
+
 
 def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     v = os.environ.get(name)
@@ -45,39 +48,38 @@ def _detect_primary_stack(jd_text: str) -> Dict[str, str]:
     """
     Deterministic, lightweight detection of the JD's primary automation stack.
     This is a hint to the model to avoid mixed-stack incoherence.
+    Tools/languages, their aliases and priority order come from the skill taxonomy.
     """
-    t = (jd_text or "").lower()
-
-    # Primary tool/framework (pick strongest signal)
-    tool = ""
-    if re.search(r"\bcypress\b", t):
-        tool = "cypress"
-    elif re.search(r"\bplaywright\b", t):
-        tool = "playwright"
-    elif re.search(r"\bselenium\b", t):
-        tool = "selenium"
-    elif re.search(r"\bwebdriverio\b", t):
-        tool = "webdriverio"
-    elif re.search(r"\bpuppeteer\b", t):
-        tool = "puppeteer"
-
-    # Primary language (pick strongest signal)
-    lang = ""
-    if re.search(r"\btypescript\b", t):
-        lang = "typescript"
-    elif re.search(r"\bjavascript\b", t):
-        lang = "javascript"
-    elif re.search(r"\bjava\b", t):
-        lang = "java"
-    elif re.search(r"\bc#\b|\bc sharp\b", t):
-        lang = "c#"
-    elif re.search(r"\bpython\b", t):
-        lang = "python"
-
-    return {"tool": tool, "language": lang}
+    return detect_primary_stack(jd_text)
+
 
 
 
+def _parse_packet(text: str) -> Dict[str, Any]:
+    text = (text or "").strip()
+    if not text:
+        raise RuntimeError("OpenAI returned empty response")
+
+    # Some models occasionally wrap JSON in markdown fences. Strip them deterministically.
+    t = text.strip()
+    m = re.match(r"^```(?:json)?\s*(.*?)\s*```\s*$", t, flags=re.DOTALL | re.IGNORECASE)
+    if m:
+        t = m.group(1).strip()
+
+    try:
+        data = json.loads(t)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"OpenAI response was not valid JSON:\n{text}") from e
+
+    if not isinstance(data, dict):
+        raise RuntimeError("Invalid response shape: top-level must be an object")
+
+    for k in ("selected_template", "rewrite_packet"):
+        if k not in data:
+            raise RuntimeError(f"Invalid response contract: missing key {k!r}")
+
+    return data
+
 
 def generate_rewrite_packet_openai(
     *,
@@ -90,10 +92,14 @@ def generate_rewrite_packet_openai(
     timeout_s: int = 90,
     temperature: Optional[float] = None,
     top_p: Optional[float] = None,
+    jd_terms: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
-    _require("OPENAI_API_KEY")
+    if not _llm_offline():
+        _require("OPENAI_API_KEY")
+
+    def _client():
+        return get_client(timeout_s)
 
-    client = OpenAI(timeout=timeout_s)
     model = model or _env("RF_OPENAI_MODEL", "gpt-4o-mini")
 
     # Determinism controls (env-overridable)
@@ -154,6 +160,9 @@ LIMITS:
 - tool: {primary_stack.get("tool","")}
 - language: {primary_stack.get("language","")}
 
+DISTINCTIVE JD TERMS (deterministic; most specific to this posting first — favor these in edits):
+{", ".join(jd_terms) if jd_terms else "(none)"}
+
 TEMPLATE FOLDER (MUST ECHO IN selected_template):
 {selected_template}
 
@@ -171,7 +180,10 @@ Generate a rewrite packet only (v0 contract). Do not generate proposals; the CLI
 """
 
     try:
-        resp = client.responses.create(
+        text = response_text(
+            _client,
+            label="rewrite_packet",
+            validate=_parse_packet,
             model=model,
             temperature=temperature,
             top_p=top_p,
@@ -193,32 +205,4 @@ Generate a rewrite packet only (v0 contract). Do not generate proposals; the CLI
             ) from e
         raise
 
-    text = ""
-    for out in resp.output:
-        for c in out.content:
-            if c.type == "output_text":
-                text += c.text
-
-    text = text.strip()
-    if not text:
-        raise RuntimeError("OpenAI returned empty response")
-
-    # Some models occasionally wrap JSON in markdown fences. Strip them deterministically.
-    t = text.strip()
-    m = re.match(r"^```(?:json)?\s*(.*?)\s*```\s*$", t, flags=re.DOTALL | re.IGNORECASE)
-    if m:
-        t = m.group(1).strip()
-
-    try:
-        data = json.loads(t)
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"OpenAI response was not valid JSON:\n{text}") from e
-
-    if not isinstance(data, dict):
-        raise RuntimeError("Invalid response shape: top-level must be an object")
-
-    for k in ("selected_template", "rewrite_packet"):
-        if k not in data:
-            raise RuntimeError(f"Invalid response contract: missing key {k!r}")
-
-    return data
+    return _parse_packet(text)
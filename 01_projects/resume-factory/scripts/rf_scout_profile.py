@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from rf_ideal_profile_client import ideal_profile_openai_async
+from rf_ideal_profile_schema import validate_ideal_profile
+from rf_jd_idf import distinctive_terms
+from rf_keyword_scout_client import keyword_scout_openai_async
+from rf_keyword_scout_schema import validate_keyword_scout
+from rf_openai_pool import aclose_async_client
+from rf_template_ir import load_template
+
+# -----------------------------------------------------------------------------
+# Keyword scout + ideal profile for one application (library side of the CLIs)
+# -----------------------------------------------------------------------------
+#
+# resume-keyword-scout / resume-ideal-profile are thin wrappers over this module.
+# Both steps depend only on the JD (the keyword scout is an optional hint for the
+# ideal profile), so scout_and_profile() runs them concurrently on one pooled
+# AsyncOpenAI client: wall-clock ~= the slower of the two calls.
+
+KS_RETRY_INSTRUCTIONS = (
+    "Return 18–20 keywords/tools and 6–7 implied responsibilities/flows. Prefer specific tool names "
+    "exactly as written in the JD when available. Do not include baseline terms unless truly critical."
+)
+
+def _timeout_s() -> int:
+    return int(os.environ.get("RF_OPENAI_TIMEOUT_S", "90"))
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _load_json(p: Path) -> Any:
+    return json.loads(p.read_text())
+
+
+def extract_baseline_covered_terms(text: str, limit: int = 120):
+    """
+    Heuristic, deterministic "already covered" term harvest from baseline resume text.
+    Not a ruleset; just a compact hint list to nudge the model toward differentiators.
+    """
+    t = (text or "")
+    # Pull likely tech tokens: letters/digits plus . + # - / (keeps e.g., C#, CI/CD, JUnit, REST, SFTP)
+    tokens = re.findall(r"[A-Za-z0-9][A-Za-z0-9\.\+#/\-]{1,}", t)
+    # Deduplicate case-insensitively but keep first-seen casing
+    seen = set()
+    out = []
+    for tok in tokens:
+        key = tok.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        # drop ultra-generic short tokens
+        if len(tok) <= 2 and tok.lower() not in {"c#", "ci"}:
+            continue
+        out.append(tok)
+        if len(out) >= limit:
+            break
+    return out
+
+def mentioned_in_jd(terms, jd_raw: str):
+    """The baseline terms the JD also mentions (the rest cannot compete for a keyword slot)."""
+    jd = " ".join((jd_raw or "").lower().split())
+    return [t for t in terms if str(t).lower() in jd]
+
+def dedupe_keywords_tools_ranked(items):
+    """Deterministically remove duplicate terms (case-insensitive). Keep first occurrence."""
+    if not isinstance(items, list):
+        return items
+    seen = set()
+    out = []
+    for it in items:
+        if not isinstance(it, dict):
+            continue
+        term = str(it.get("term", "")).strip()
+        if not term:
+            continue
+        key = re.sub(r"\s+", " ", term).strip().lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(it)
+    return out
+
+
+def load_baseline(app: Path) -> Tuple[str, List[str]]:
+    """
+    Baseline coverage hint from the selected template (tracking/selected-template.json),
+    or ("", []) when resume-select has not run. Raises RuntimeError on unreadable inputs.
+    """
+    sel_p = app / "tracking" / "selected-template.json"
+    if not sel_p.exists():
+        return "", []
+    try:
+        sel = _load_json(sel_p)
+        docx_p = Path(sel.get("resume_master_docx", "")).expanduser()
+        if not docx_p.exists():
+            return "", []
+        header, summary, skills, exp = load_template(docx_p).sections()
+        baseline_text = "\n".join([*summary, "", *skills]).strip()
+        return baseline_text, extract_baseline_covered_terms(baseline_text, limit=120)
+    except Exception as e:
+        raise RuntimeError(f"failed reading baseline from selected-template.json: {e}") from e
+
+def load_keyword_scout_hint(app: Path) -> Optional[Dict[str, Any]]:
+    ks_p = app / "notes" / "keyword-scout.json"
+    if not ks_p.exists():
+        return None
+    try:
+        return _load_json(ks_p).get("keyword_scout")
+    except Exception:
+        return None
+
+
+# the same schema checks gate the LLM cache, so a response that fails them is never replayed
+def _scout_schema_ok(data: Dict[str, Any]) -> bool:
+    d = dict(data)
+    d["keywords_tools_ranked"] = dedupe_keywords_tools_ranked(d.get("keywords_tools_ranked", []))
+    return validate_keyword_scout(d)[0]
+
+def _profile_schema_ok(data: Dict[str, Any]) -> bool:
+    return validate_ideal_profile(data)[0]
+
+
+async def keyword_scout_async(app: Path, jd_raw: str) -> Dict[str, Any]:
+    """
+    Keyword scout with the CLI's policy: one retry when the list comes back thin, then
+    dedupe + schema validation. Returns the keyword-scout.json payload.
+    Invalid output is written to notes/keyword-scout.invalid.json and raises ValueError.
+    """
+    baseline_text, baseline_covered_terms = load_baseline(app)
+    # fewer, higher-signal hint terms: JD terms ranked against the JD corpus (rf_jd_idf),
+    # and only the covered terms this JD actually mentions
+    baseline_covered_terms = mentioned_in_jd(baseline_covered_terms, jd_raw)
+    jd_terms = distinctive_terms(jd_raw, max_terms=20)
+    data = await keyword_scout_openai_async(
+        jd_raw=jd_raw,
+        baseline_text=baseline_text,
+        baseline_covered_terms=baseline_covered_terms,
+        model=None,
+        timeout_s=_timeout_s(),
+        jd_terms=jd_terms,
+        accept=_scout_schema_ok,
+    )
+
+    # If the model returns the minimum (10), retry once to get a fuller list.
+    try:
+        kw = data.get("keywords_tools_ranked", []) if isinstance(data, dict) else []
+        flows = data.get("implied_responsibilities_flows", []) if isinstance(data, dict) else []
+    except Exception:
+        kw, flows = [], []
+
+    if len(kw) < 16 or len(flows) < 5:
+        data = await keyword_scout_openai_async(
+            jd_raw=jd_raw,
+            baseline_text=baseline_text,
+            baseline_covered_terms=baseline_covered_terms,
+            model=None,
+            timeout_s=_timeout_s(),
+            extra_instructions=KS_RETRY_INSTRUCTIONS,
+            jd_terms=jd_terms,
+            accept=_scout_schema_ok,
+        )
+
+    data["keywords_tools_ranked"] = dedupe_keywords_tools_ranked(data.get("keywords_tools_ranked", []))
+    ok, msg = validate_keyword_scout(data)
+    if not ok:
+        # Debug artifact: write the invalid payload for inspection (do not silently mutate)
+        dbg_p = app / "notes" / "keyword-scout.invalid.json"
+        dbg_p.parent.mkdir(parents=True, exist_ok=True)
+        dbg_p.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        raise ValueError(f"keyword-scout schema invalid: {msg} (wrote {dbg_p})")
+
+    return {
+        "generated_at_utc": _utc_now_iso(),
+        "app": str(app),
+        "job_meta": _load_json(app / "tracking" / "job-meta.json"),
+        "keyword_scout": data,
+    }
+
+async def ideal_profile_async(app: Path, jd_raw: str, keyword_scout: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Ideal profile + schema validation. Returns the ideal-profile.json payload.
+    Invalid output is written to notes/ideal-profile.invalid.json and raises ValueError.
+    """
+    data = await ideal_profile_openai_async(
+        jd_raw=jd_raw,
+        keyword_scout=keyword_scout,
+        model=None,
+        timeout_s=_timeout_s(),
+        accept=_profile_schema_ok,
+    )
+
+    ok, msg = validate_ideal_profile(data)
+    if not ok:
+        dbg_p = app / "notes" / "ideal-profile.invalid.json"
+        dbg_p.parent.mkdir(parents=True, exist_ok=True)
+        dbg_p.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        raise ValueError(f"ideal-profile schema invalid: {msg} (wrote {dbg_p})")
+
+    profile = data.get("ideal_profile") if isinstance(data, dict) else None
+    notes = data.get("notes", "") if isinstance(data, dict) else ""
+    return {
+        "generated_at_utc": _utc_now_iso(),
+        "app": str(app),
+        "job_meta": _load_json(app / "tracking" / "job-meta.json"),
+        "ideal_profile": profile if profile is not None else data,
+        "notes": notes,
+    }
+
+
+def write_payload(p: Path, payload: Dict[str, Any]) -> Path:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    # atomic: a concurrently running step never reads a half-written file
+    tmp = p.with_name(f".{p.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, p)
+    return p
+
+def keyword_scout_path(app: Path) -> Path:
+    return app / "notes" / "keyword-scout.json"
+
+def ideal_profile_path(app: Path) -> Path:
+    return app / "notes" / "ideal-profile.json"
+
+
+async def _with_client_cleanup(coro):
+    try:
+        return await coro
+    finally:
+        await aclose_async_client()
+
+def run_keyword_scout(app: Path, jd_raw: str) -> Dict[str, Any]:
+    return asyncio.run(_with_client_cleanup(keyword_scout_async(app, jd_raw)))
+
+def run_ideal_profile(app: Path, jd_raw: str, keyword_scout: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return asyncio.run(_with_client_cleanup(ideal_profile_async(app, jd_raw, keyword_scout)))
+
+
+def scout_and_profile(app: Path, jd_raw: str, want_scout: bool = True, want_profile: bool = True
+                      ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Run the requested steps concurrently and write notes/keyword-scout.json and
+    notes/ideal-profile.json. Returns (keyword_scout_payload, ideal_profile_payload);
+    a step not requested is None.
+
+    When both run, the ideal profile gets the keyword-scout hint already on disk (if any)
+    rather than waiting for the fresh one; that is what makes them independent.
+    Neither file is written unless both steps succeed.
+    """
+    async def _both():
+        jobs = []
+        if want_scout:
+            jobs.append(keyword_scout_async(app, jd_raw))
+        if want_profile:
+            jobs.append(ideal_profile_async(app, jd_raw, load_keyword_scout_hint(app)))
+        return await asyncio.gather(*jobs)
+
+    results = list(asyncio.run(_with_client_cleanup(_both())))
+    ks = results.pop(0) if want_scout else None
+    ip = results.pop(0) if want_profile else None
+    if ks is not None:
+        write_payload(keyword_scout_path(app), ks)
+    if ip is not None:
+        write_payload(ideal_profile_path(app), ip)
+    return ks, ip
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rf_trie import trie_regex
+
+# -----------------------------------------------------------------------------
+# Skill taxonomy (03_assets/taxonomy/skills.json)
+# -----------------------------------------------------------------------------
+#
+# The skills JD term extraction and stack detection know about, as data: each
+# skill has a canonical form (the term emitted), aliases that map to it ("hp alm",
+# "micro focus alm" -> "alm"; "k8s" -> "kubernetes") and a category. solo=false
+# means the canonical alone is too ambiguous to count ("alm", "go"); only its
+# aliases do. promote=true places the skill ahead of the frequency ranking in
+# JD term extraction (for aliases that resolve an ambiguous token: "hp alm").
+#
+# Aliases that are one JD token (RE_TOKEN, as rf_jd_terms tokenizes) resolve by a
+# dict lookup per token. The others (multi-word, leading ".") are compiled into
+# one trie-factored regex with word boundaries, so one scan finds them all,
+# leftmost-longest and non-overlapping. Neither cost grows with the number of
+# skills, so the taxonomy can be extended freely.
+#
+# File format:
+#   {"schema": "rf_skill_taxonomy_v1",
+#    "stack": {"tool_priority": [...], "language_priority": [...]},
+#    "skills": [{"canonical": "kubernetes", "aliases": ["k8s"], "category": "container"},
+#               {"canonical": "alm", "aliases": ["hp alm", ...], "solo": false, "promote": true}, ...]}
+
+SCHEMA = "rf_skill_taxonomy_v1"
+
+# one JD token (shared with rf_jd_terms)
+RE_TOKEN = re.compile(r"[a-z0-9][a-z0-9\+#\.\-/]{0,38}")
+
+Match = Tuple[int, int, str, str]  # (start, end, alias, canonical)
+
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    v = os.environ.get(name)
+    return v if (v is not None and v != "") else default
+
+def taxonomy_path() -> Path:
+    return Path(_env("RF_SKILL_TAXONOMY", os.path.expanduser("~/secondbrain/03_assets/taxonomy/skills.json")))
+
+def _key(s) -> str:
+    return " ".join(s.lower().split()) if isinstance(s, str) else ""
+
+def is_token(alias: str) -> bool:
+    """True when the alias is exactly one JD token (resolved by lookup, not the phrase scan)."""
+    return RE_TOKEN.fullmatch(alias) is not None and alias.strip(" .,-/") == alias
+
+
+class Taxonomy:
+    """Alias -> canonical maps plus the compiled phrase matcher."""
+
+    def __init__(self, skills: Iterable[dict], stack: Optional[dict] = None):
+        self.canonical: Dict[str, str] = {}  # alias (incl. solo canonicals) -> canonical
+        self.category: Dict[str, str] = {}   # canonical -> category
+        self.promote: Set[str] = set()       # canonicals ranked ahead of other JD terms
+        for sk in skills:
+            canon = _key(sk.get("canonical"))
+            if not canon:
+                raise ValueError(f"skill without canonical: {sk!r}")
+            self.category[canon] = sk.get("category") or ""
+            if sk.get("promote"):
+                self.promote.add(canon)
+            names = [canon] if sk.get("solo", True) else []
+            names += [_key(a) for a in sk.get("aliases") or []]
+            for a in names:
+                if not a:
+                    continue
+                prev = self.canonical.setdefault(a, canon)
+                if prev != canon:
+                    raise ValueError(f"alias {a!r} maps to both {prev!r} and {canon!r}")
+
+        stack = stack or {}
+        self.tool_priority: List[str] = [_key(x) for x in stack.get("tool_priority") or []]
+        self.language_priority: List[str] = [_key(x) for x in stack.get("language_priority") or []]
+
+        # single-token aliases: the allowlist tokens are checked against
+        self.words: Dict[str, str] = {a: c for a, c in self.canonical.items() if is_token(a)}
+        self.phrases: Dict[str, str] = {a: c for a, c in self.canonical.items() if a not in self.words}
+        self._phrase_re = self._compile(self.phrases)
+        self._all_re = None  # compiled on first find()
+
+    @staticmethod
+    def _compile(aliases) -> Optional[re.Pattern]:
+        if not aliases:
+            return None
+        # not preceded by a letter, digit or "." ("js" must not match inside "alpine.js")
+        return re.compile(r"(?<![a-z0-9.])(" + trie_regex(sorted(aliases)) + r")(?![a-z0-9])")
+
+    @staticmethod
+    def _matches(rx: Optional[re.Pattern], table: Dict[str, str], low: str) -> List[Match]:
+        if rx is None:
+            return []
+        return [(m.start(), m.end(), m.group(1), table[m.group(1)]) for m in rx.finditer(low)]
+
+    def scan(self, low: str) -> List[Match]:
+        """Multi-token / dotted alias matches in normalized lowercase text, in text order."""
+        return self._matches(self._phrase_re, self.phrases, low)
+
+    def find(self, low: str) -> Counter:
+        """canonical -> occurrences, over every alias (leftmost-longest, word boundaries)."""
+        if self._all_re is None:
+            self._all_re = self._compile(self.canonical)
+        return Counter(c for _s, _e, _a, c in self._matches(self._all_re, self.canonical, low))
+
+    def detect_primary_stack(self, text: str) -> Dict[str, str]:
+        """{"tool", "language"}: the first of each priority list the text mentions ("" if none)."""
+        found = self.find(" ".join((text or "").lower().split()))
+        tool = next((t for t in self.tool_priority if t in found), "")
+        lang = next((t for t in self.language_priority if t in found), "")
+        return {"tool": tool, "language": lang}
+
+
+def from_dict(doc: dict) -> Taxonomy:
+    if not isinstance(doc, dict) or doc.get("schema") != SCHEMA:
+        raise ValueError(f"not a {SCHEMA} document")
+    skills = doc.get("skills")
+    if not isinstance(skills, list):
+        raise ValueError("taxonomy 'skills' must be a list")
+    return Taxonomy(skills, doc.get("stack"))
+
+
+_LOADED: Dict[str, Tuple[int, Taxonomy]] = {}
+
+def load_taxonomy(path: Optional[Path] = None) -> Taxonomy:
+    """
+    Compiled taxonomy (memoized per path; reloaded when the file's mtime changes).
+    Raises FileNotFoundError when missing, ValueError on invalid JSON / schema.
+    """
+    p = Path(path) if path else taxonomy_path()
+    mtime = os.stat(p).st_mtime_ns
+    hit = _LOADED.get(str(p))
+    if hit and hit[0] == mtime:
+        return hit[1]
+    try:
+        doc = json.loads(p.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON: {p} ({e})")
+    tax = from_dict(doc)
+    _LOADED[str(p)] = (mtime, tax)
+    return tax
+
+def detect_primary_stack(text: str) -> Dict[str, str]:
+    return load_taxonomy().detect_primary_stack(text)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# -----------------------------------------------------------------------------
+# Input/output fingerprints for make-style "skip if up to date" pipeline steps
+# -----------------------------------------------------------------------------
+#
+# A step's inputs are named things whose content decides its output: files (JD,
+# template docx, signals.json, AGENT_PROMPT.md, upstream artifacts, the tool and
+# prompt-building code), file sets, and literal values (argv, model env vars).
+# Each is reduced to a short digest. After a successful run the input and output
+# digests are stored per step (generate-one.run.json "state"); next time the step
+# is skipped when every input digest matches and its outputs still exist.
+# Upstream steps that re-ran but produced identical artifacts (e.g. LLM cache
+# hits) therefore do not invalidate anything downstream.
+#
+# Input spec values:
+#   Path            -> sha256 of the file ("missing" if absent); for *.json artifacts
+#                      the top-level run timestamps (generated_at, generated_at_utc)
+#                      are ignored, so a re-run with the same content digests equal
+#   list[Path]      -> sha256 over (name, file digest) pairs, order-independent
+#   str / other     -> the value itself (e.g. "env:RF_OPENAI_MODEL" -> "gpt-4o-mini")
+
+MISSING = "missing"
+VOLATILE_JSON_KEYS = ("generated_at", "generated_at_utc")
+
+InputValue = Union[Path, List[Path], str, None]
+
+def _json_digest(p: Path) -> Optional[str]:
+    try:
+        d = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if isinstance(d, dict):
+        d = {k: v for k, v in d.items() if k not in VOLATILE_JSON_KEYS}
+    blob = json.dumps(d, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+def file_digest(p: Path) -> str:
+    if p.suffix == ".json":
+        jd = _json_digest(p)
+        if jd is not None:
+            return jd
+    try:
+        h = hashlib.sha256()
+        with open(p, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return MISSING
+    return h.hexdigest()[:16]
+
+def files_digest(paths: Iterable[Path]) -> str:
+    h = hashlib.sha256()
+    for p in sorted(str(x) for x in paths):
+        h.update(f"{p}\0{file_digest(Path(p))}\n".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def value_digest(v: Any) -> str:
+    if v is None:
+        return MISSING
+    if isinstance(v, Path):
+        return file_digest(v)
+    if isinstance(v, (list, tuple)):
+        return files_digest(v)
+    s = v if isinstance(v, str) else json.dumps(v, sort_keys=True, default=str)
+    # short literals stay readable in run.json / --explain; long ones are hashed
+    return s if len(s) <= 64 else hashlib.sha256(s.encode("utf-8")).hexdigest()[:16]
+
+def digest_inputs(spec: Dict[str, InputValue]) -> Dict[str, str]:
+    return {k: value_digest(v) for k, v in spec.items()}
+
+def digest_outputs(paths: Dict[str, Path]) -> Dict[str, str]:
+    return {k: file_digest(p) for k, p in paths.items()}
+
+def env_value(name: str, default: str = "") -> str:
+    v = os.environ.get(name)
+    return v if (v is not None and v != "") else default
+
+
+def stale_reasons(prev: Optional[Dict[str, Any]], inputs: Dict[str, str], outputs: Dict[str, str]) -> List[str]:
+    """
+    Why a step must run, given its last recorded state and the current digests.
+    [] means up to date.
+    """
+    if not prev:
+        return ["no previous successful run"]
+    reasons = []
+    old_in = prev.get("inputs") or {}
+    for k, v in inputs.items():
+        if k not in old_in:
+            reasons.append(f"new input: {k}")
+        elif old_in[k] != v:
+            reasons.append(f"changed: {k}" + (" (now missing)" if v == MISSING else ""))
+    for k in old_in:
+        if k not in inputs:
+            reasons.append(f"input dropped: {k}")
+    # A hand-edited output is kept (like make, an existing target is not rebuilt
+    # just because it changed); downstream steps see it as a changed input.
+    for k, v in outputs.items():
+        if v == MISSING:
+            reasons.append(f"output missing: {k}")
+    return reasons
+
+
+def load_state(run_p: Path) -> Dict[str, Dict[str, Any]]:
+    """Per-step state from a previous generate-one.run.json ({} if none/unreadable)."""
+    try:
+        d = json.loads(run_p.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    st = d.get("state") if isinstance(d, dict) else None
+    return st if isinstance(st, dict) else {}
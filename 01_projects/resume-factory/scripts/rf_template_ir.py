@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# -----------------------------------------------------------------------------
+# Compiled resume template IR (shared by every resume-* tool)
+# -----------------------------------------------------------------------------
+#
+# Opening resume-master.docx through python-docx costs far more than everything
+# the tools do with it afterwards. A template is compiled ONCE into a compact
+# JSON intermediate representation and stored keyed by the docx content hash plus
+# a hash of the extractor code (this file and rf_docx_extract.py):
+#
+#   <ir_dir>/<sha256>-<code[:16]>.json = {
+#     v, docx_sha256, code, source,
+#     paragraphs: [{text, style, bullet, runs: [{text, b, i, u, font, size}]}],
+#     lines:      read_docx_lines() output (blank runs collapsed),
+#     sections:   {header, summary, skills, experience} (locate_sections()),
+#     refs:       H/S/K/E ref -> {section, text[, subsection, subsection_occurrence]}
+#                 (format_numbered_blocks_for_prompt() over the full experience)
+#   }
+#
+# A changed docx hashes differently, and so does a changed extractor, so the IR is
+# rebuilt transparently (no version to remember to bump); stale entries are simply
+# never looked up again. Loads are memoized per process.
+#
+# Env:
+#   RF_TEMPLATE_IR=off   bypass (always parse the docx; nothing written)
+#   RF_TEMPLATE_IR_DIR   default ~/secondbrain/07_system/cache/template-ir
+
+IR_VERSION = 1
+CODE_FILES = ("rf_template_ir.py", "rf_docx_extract.py")  # what the compiled IR depends on
+
+def _env(name: str, default: Optional[str] = None) -> Optional[str]:
+    v = os.environ.get(name)
+    return v if (v is not None and v != "") else default
+
+def enabled() -> bool:
+    return (_env("RF_TEMPLATE_IR", "on") or "on").strip().lower() not in ("off", "0", "false", "no")
+
+def ir_dir() -> Path:
+    return Path(_env("RF_TEMPLATE_IR_DIR", os.path.expanduser("~/secondbrain/07_system/cache/template-ir")))
+
+
+class TemplateIR:
+    """Read-only view over a compiled template."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    @property
+    def docx_sha256(self) -> str:
+        return self.data["docx_sha256"]
+
+    @property
+    def paragraphs(self) -> List[Dict[str, Any]]:
+        return self.data["paragraphs"]
+
+    @property
+    def lines(self) -> List[str]:
+        return list(self.data["lines"])
+
+    @property
+    def refs(self) -> Dict[str, Dict[str, str]]:
+        return self.data["refs"]
+
+    def sections(self) -> Tuple[List[str], List[str], List[str], List[str]]:
+        s = self.data["sections"]
+        return list(s["header"]), list(s["summary"]), list(s["skills"]), list(s["experience"])
+
+    def numbered_blocks(self, max_exp_lines: int = 80) -> Tuple[str, Dict[str, Dict[str, str]]]:
+        from rf_docx_extract import format_numbered_blocks_for_prompt
+        return format_numbered_blocks_for_prompt(*self.sections(), max_exp_lines=max_exp_lines)
+
+
+def _sha256(p: Path) -> str:
+    return hashlib.sha256(p.read_bytes()).hexdigest()
+
+_code_fp: Optional[str] = None
+
+def code_fingerprint() -> str:
+    """sha256 over IR_VERSION and the extractor source (CODE_FILES), once per process."""
+    global _code_fp
+    if _code_fp is None:
+        h = hashlib.sha256(f"{IR_VERSION}\n".encode())
+        here = Path(__file__).resolve().parent
+        for name in CODE_FILES:
+            h.update(name.encode() + b"\0")
+            h.update((here / name).read_bytes())
+        _code_fp = h.hexdigest()
+    return _code_fp
+
+def _entry_path(digest: str) -> Path:
+    return ir_dir() / f"{digest}-{code_fingerprint()[:16]}.json"
+
+def _run_fmt(r) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"text": r.text or ""}
+    if r.bold is not None:
+        out["b"] = bool(r.bold)
+    if r.italic is not None:
+        out["i"] = bool(r.italic)
+    if r.underline is not None:
+        out["u"] = bool(r.underline)
+    if r.font is not None:
+        if r.font.name:
+            out["font"] = r.font.name
+        if r.font.size is not None:
+            out["size"] = r.font.size.pt
+    return out
+
+def compile_docx(docx_path: Path, digest: Optional[str] = None) -> Dict[str, Any]:
+    """Parse the docx (python-docx) into the IR dict. No caching here."""
+    from docx import Document
+    from rf_docx_extract import collapse_blank_lines, format_numbered_blocks_for_prompt, locate_sections
+
+    doc = Document(str(docx_path))
+    paragraphs = []
+    raw_lines = []
+    for p in doc.paragraphs:
+        text = p.text or ""
+        style = (p.style.name if p.style else "") or ""
+        bullet = ("List" in style) or bool(p._p.pPr is not None and p._p.pPr.numPr is not None)
+        paragraphs.append({"text": text, "style": style, "bullet": bullet, "runs": [_run_fmt(r) for r in p.runs]})
+        t = text.rstrip()
+        raw_lines.append(t if t.strip() else "")
+
+    lines = collapse_blank_lines(raw_lines)
+    header, summary, skills, exp = locate_sections(lines)
+    _txt, refs = format_numbered_blocks_for_prompt(header, summary, skills, exp, max_exp_lines=max(len(exp), 1))
+    return {
+        "v": IR_VERSION,
+        "docx_sha256": digest or _sha256(docx_path),
+        "code": code_fingerprint(),
+        "source": str(docx_path),
+        "paragraphs": paragraphs,
+        "lines": lines,
+        "sections": {"header": header, "summary": summary, "skills": skills, "experience": exp},
+        "refs": refs,
+    }
+
+
+_memo: Dict[str, TemplateIR] = {}
+_lock = threading.Lock()
+
+def load_template(docx_path: Path) -> TemplateIR:
+    """
+    IR for docx_path: memo -> on-disk entry for its content hash -> compile + store.
+    Raises FileNotFoundError when the docx is missing.
+    """
+    docx_path = Path(docx_path)
+    if not docx_path.exists():
+        raise FileNotFoundError(f"missing resume-master.docx: {docx_path}")
+    digest = _sha256(docx_path)
+    if not enabled():
+        return TemplateIR(compile_docx(docx_path, digest))
+
+    with _lock:
+        ir = _memo.get(digest)
+    if ir is not None:
+        return ir
+
+    p = _entry_path(digest)
+    data = None
+    try:
+        data = json.loads(p.read_text(encoding="utf-8"))
+        if data.get("v") != IR_VERSION or data.get("docx_sha256") != digest or data.get("code") != code_fingerprint():
+            data = None
+    except (OSError, ValueError):
+        data = None
+
+    if data is None:
+        data = compile_docx(docx_path, digest)
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, p)
+        except OSError:
+            pass  # read-only cache dir: still correct, just not cached
+
+    ir = TemplateIR(data)
+    with _lock:
+        _memo[digest] = ir
+    return ir
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="rf_template_ir", description="Compile / inspect resume template IR.")
+    ap.add_argument("docx", nargs="+", help="resume-master.docx path(s)")
+    ap.add_argument("--dump", action="store_true", help="Print the IR JSON")
+    args = ap.parse_args(argv)
+
+    for d in args.docx:
+        ir = load_template(Path(d).expanduser())
+        if args.dump:
+            print(json.dumps(ir.data, indent=2, ensure_ascii=False))
+        else:
+            h, s, k, e = ir.sections()
+            print(f"{d}: sha={ir.docx_sha256[:12]} paragraphs={len(ir.paragraphs)} lines={len(ir.lines)} "
+                  f"H={len(h)} S={len(s)} K={len(k)} E={len(e)} refs={len(ir.refs)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
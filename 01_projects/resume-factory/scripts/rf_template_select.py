@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from rf_jobs_index import iter_app_dirs
+from rf_trie import trie_regex
+
+# -----------------------------------------------------------------------------
+# Template selection engine (resume-select and everything that needs its pick)
+# -----------------------------------------------------------------------------
+#
+# Every template's preferred / neutral / anti keywords plus the stack cues are
+# compiled ONCE per family into a single regex. One scan of a JD yields the set
+# of keywords it contains, and each template's score is then set lookups, so
+# scoring N jobs x T templates costs N scans instead of N*T*K substring tests.
+# Signals are loaded once per process (memoized per family root, re-read when a
+# signals.json mtime changes).
+#
+# Semantics are exactly resume-select's: norm()-ed JD text, case-insensitive
+# SUBSTRING hits (no word boundaries), same weights, same ordering. Overlapping
+# keywords are handled: the pattern is a lookahead over a trie of all keywords
+# (greedy, so each position reports its longest keyword), and every shorter
+# keyword starting there is a prefix of it (precomputed).
+#
+# Row shape (kept from resume-select):
+#   (score, template_id, slug, folder, hits_pref, hits_neut, hits_anti, lang, tool, sig)
+
+DEFAULT_FAMILY = "qa_automation_engineer"
+
+W_PREF, W_NEUT, W_ANTI, W_LANG, W_TOOL, W_CYPRESS_04 = 10, 2, -12, 6, 8, 10
+
+Row = Tuple[int, str, str, Path, List[str], List[str], List[str], str, str, dict]
+
+
+def norm(s: str) -> str:
+    s = (s or "").lower()
+    s = s.replace("\u2019", "'")
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+def _kw(k) -> str:
+    return (k or "").strip().lower() if isinstance(k, str) else ""
+
+def templates_root(family: str = DEFAULT_FAMILY, home: Optional[Path] = None) -> Path:
+    return Path(home or Path.home()) / "secondbrain/03_assets/templates/resumes" / family
+
+
+class _Template:
+    __slots__ = ("sig", "folder", "tid", "slug", "pref", "neut", "anti", "lang", "tool")
+
+    def __init__(self, sig_p: Path, sig: dict):
+        self.sig = sig
+        self.folder = sig_p.parent
+        self.tid = sig.get("template_id", "??")
+        self.slug = sig.get("template_slug", sig_p.parent.name)
+        # (as written, matcher key) pairs; hit lists report keywords as written
+        self.pref = [(k, _kw(k)) for k in sig.get("preferred_keywords", []) if isinstance(k, str)]
+        self.neut = [(k, _kw(k)) for k in sig.get("neutral_keywords", []) if isinstance(k, str)]
+        self.anti = [(k, _kw(k)) for k in sig.get("anti_signals", []) if isinstance(k, str)]
+        ps = sig.get("primary_stack", {}) or {}
+        self.lang = (ps.get("language") or "").lower()
+        self.tool = (ps.get("automation_tool") or "").lower()
+
+
+class TemplateSet:
+    """All templates of one family plus the compiled keyword matcher."""
+
+    def __init__(self, root: Path, signals: List[Tuple[Path, dict]]):
+        self.root = Path(root)
+        self.templates = [_Template(p, s) for p, s in signals]
+
+        vocab = {"cypress"}
+        for t in self.templates:
+            vocab.update(kw for _k, kw in t.pref + t.neut + t.anti)
+            vocab.update(x.strip() for x in (t.lang, t.tool))
+        vocab.discard("")
+        words = sorted(vocab)
+        self._pattern = re.compile("(?=(" + trie_regex(words) + "))") if words else None
+        # every keyword that is a prefix of w (w included): what a match of w implies
+        self._implied: Dict[str, Tuple[str, ...]] = {w: tuple(v for v in words if w.startswith(v)) for w in words}
+
+    def hits(self, text: str) -> set:
+        """Keywords (stripped, lowercased) occurring in already norm()-ed text."""
+        found: set = set()
+        if self._pattern is None:
+            return found
+        seen = set()
+        for m in self._pattern.finditer(text):
+            w = m.group(1)
+            if w not in seen:
+                seen.add(w)
+                found.update(self._implied[w])
+        return found
+
+    def score_hits(self, t: _Template, found: set) -> Row:
+        hp = [k for k, kw in t.pref if kw in found]
+        hn = [k for k, kw in t.neut if kw in found]
+        ha = [k for k, kw in t.anti if kw in found]
+        sc = W_PREF * len(hp) + W_NEUT * len(hn) + W_ANTI * len(ha)
+        if t.lang and t.lang.strip() in found: sc += W_LANG
+        if t.tool and t.tool.strip() in found: sc += W_TOOL
+        # explicit mapping: Cypress roles map best to TS/JS modern browser automation
+        if "cypress" in found and t.sig.get("template_id") == "04":
+            sc += W_CYPRESS_04
+        return (sc, t.tid, t.slug, t.folder, hp, hn, ha, t.lang, t.tool, t.sig)
+
+    def rank(self, text: str) -> List[Row]:
+        """All templates for one norm()-ed JD, best first (stable on ties, as resume-select)."""
+        found = self.hits(text)
+        rows = [self.score_hits(t, found) for t in self.templates]
+        rows.sort(key=lambda r: r[0], reverse=True)
+        return rows
+
+    def matrix(self, texts: List[str]) -> List[List[int]]:
+        """Job x template score matrix (template order = self.templates)."""
+        out = []
+        for text in texts:
+            found = self.hits(text)
+            out.append([self.score_hits(t, found)[0] for t in self.templates])
+        return out
+
+
+_SETS: Dict[str, Tuple[tuple, TemplateSet]] = {}
+
+def load_family(family: str = DEFAULT_FAMILY, root: Optional[Path] = None) -> TemplateSet:
+    """
+    Compiled TemplateSet for a family (memoized; rebuilt if any signals.json changed).
+    Raises FileNotFoundError if the root or its signals.json files are missing,
+    ValueError on invalid JSON.
+    """
+    root = Path(root) if root else templates_root(family)
+    if not root.is_dir():
+        raise FileNotFoundError(f"template root missing: {root}")
+    paths = list(root.rglob("signals.json"))
+    if not paths:
+        raise FileNotFoundError(f"no signals.json found under: {root}")
+    stamp = tuple((str(p), os.stat(p).st_mtime_ns) for p in paths)
+    key = str(root)
+    hit = _SETS.get(key)
+    if hit and hit[0] == stamp:
+        return hit[1]
+    signals = []
+    for p in paths:
+        try:
+            signals.append((p, json.loads(p.read_text())))
+        except Exception as e:
+            raise ValueError(f"invalid JSON: {p} ({e})")
+    ts = TemplateSet(root, signals)
+    _SETS[key] = (stamp, ts)
+    return ts
+
+
+def read_jd_text(app: Path) -> str:
+    """norm()-ed jd/jd-raw.txt; raises FileNotFoundError / ValueError like resume-select dies."""
+    jd_p = Path(app) / "jd" / "jd-raw.txt"
+    if not jd_p.exists():
+        raise FileNotFoundError(f"missing: {jd_p}")
+    if jd_p.stat().st_size == 0:
+        raise ValueError(f"jd-raw.txt empty: {jd_p}")
+    return norm(jd_p.read_text(errors="ignore"))
+
+def rank_app(app: Path, family: str = DEFAULT_FAMILY, root: Optional[Path] = None) -> List[Row]:
+    return load_family(family, root).rank(read_jd_text(app))
+
+def select_for_app(app: Path, family: str = DEFAULT_FAMILY, root: Optional[Path] = None) -> Row:
+    """Best template row for one app folder (no files written)."""
+    return rank_app(app, family, root)[0]
+
+
+def selection_record(family: str, best_row: Row) -> dict:
+    folder = best_row[3]
+    sig = best_row[9] or {}
+    return {
+        "family": family,
+        "template_id": sig.get("template_id"),
+        "template_slug": sig.get("template_slug", folder.name),
+        "template_folder_name": folder.name,
+        "template_path": str(folder),
+        "resume_master_docx": str(folder / "resume-master.docx"),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+def write_selected_template(app: Path, family: str, best_row: Row) -> Path:
+    """Persist the pick as tracking/selected-template.json (atomic replace)."""
+    p = Path(app) / "tracking" / "selected-template.json"
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(f".{p.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(selection_record(family, best_row), indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, p)
+    return p
+
+
+def iter_apps(jobs: Path, family: str = DEFAULT_FAMILY,
+              status: Optional[str] = "not_applied") -> Iterator[Tuple[Path, dict]]:
+    """(app_dir, job_meta) for every app of one family under the jobs root, filtered by status."""
+    for _rel, fam, app in iter_app_dirs(Path(jobs)):
+        if fam != family:
+            continue
+        try:
+            meta = json.loads((app / "tracking" / "job-meta.json").read_text())
+        except Exception:
+            continue
+        if not isinstance(meta, dict):
+            continue
+        if status and meta.get("status") != status:
+            continue
+        yield app, meta
+
+def select_all(jobs: Path, family: str = DEFAULT_FAMILY, root: Optional[Path] = None,
+               status: Optional[str] = "not_applied", write: bool = True) -> List[dict]:
+    """
+    Score every matching app against every template in one pass; optionally write
+    each app's selected-template.json. Returns one dict per app:
+    {"app", "meta", "best" (row) | None, "scores" (per template) | None, "wrote", "error"}.
+    """
+    ts = load_family(family, root)
+    out = []
+    for app, meta in iter_apps(jobs, family, status):
+        rec = {"app": app, "meta": meta, "best": None, "scores": None, "wrote": None, "error": None}
+        try:
+            rows = ts.rank(read_jd_text(app))
+        except (OSError, ValueError) as e:
+            rec["error"] = str(e)
+            out.append(rec)
+            continue
+        rec["best"] = rows[0]
+        rec["scores"] = {r[2]: r[0] for r in rows}
+        if write:
+            try:
+                rec["wrote"] = write_selected_template(app, family, rows[0])
+            except OSError as e:
+                rec["error"] = f"failed to write selected-template.json: {e}"
+        out.append(rec)
+    return out
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+# -----------------------------------------------------------------------------
+# Trie-factored regex alternations (multi-pattern matching with Python's re)
+# -----------------------------------------------------------------------------
+#
+# "a|ab|abc|b" as one pattern makes the engine try every branch at every text
+# position. Factoring the words by common prefix ("(?:a(?:b(?:c)?)?|b)") means a
+# position only walks the branch of its next character, so the cost per position
+# stays flat as the word list grows. Optional groups are greedy: at a position
+# the LONGEST word matches first and shorter ones are tried on backtrack (e.g.
+# when a boundary assertion after the match fails).
+
+def trie_regex(words: Iterable[str]) -> str:
+    """Alternation of the (literal) words, factored by common prefixes; '' if empty."""
+    trie: dict = {}
+    for w in words:
+        if not w:
+            continue
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        alts = [re.escape(ch) + build(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)